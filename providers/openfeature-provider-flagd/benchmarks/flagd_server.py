@@ -0,0 +1,168 @@
+"""
+In-process stand-in for flagd, used by the benchmarks
+
+It serves the evaluation service with a fixed set of flags, one per flag
+type, and the sync service with the matching flag configuration. Every
+evaluation waits for a configurable latency, optionally with jitter drawn
+from a seeded random generator so runs are reproducible.
+"""
+
+import contextlib
+import json
+import random
+import threading
+import time
+import typing
+from concurrent import futures
+
+import grpc
+from google.protobuf.struct_pb2 import Struct
+
+from openfeature.contrib.provider.flagd.proto.flagd.sync.v1 import (
+    sync_pb2,
+    sync_pb2_grpc,
+)
+from openfeature.contrib.provider.flagd.proto.schema.v1 import (
+    schema_pb2,
+    schema_pb2_grpc,
+)
+
+# flag key -> (value, variant) served by the evaluation service
+FLAGS: typing.Dict[str, typing.Tuple[typing.Any, str]] = {
+    "boolean-flag": (True, "on"),
+    "string-flag": ("blue", "blue"),
+    "float-flag": (0.5, "half"),
+    "integer-flag": (3, "three"),
+    "object-flag": ({"color": "blue", "size": 3}, "blue"),
+}
+
+# the same flags for the sync service, targeted on the "plan" attribute so
+# the in-process resolver evaluates a rule for every resolution
+FLAG_CONFIGURATION = json.dumps(
+    {
+        "flags": {
+            key: {
+                "state": "ENABLED",
+                "variants": {variant: value, "default": value},
+                "defaultVariant": "default",
+                "targeting": {
+                    "if": [{"==": [{"var": "plan"}, "pro"]}, variant, "default"]
+                },
+            }
+            for key, (value, variant) in FLAGS.items()
+        }
+    }
+)
+
+
+class Latency:
+    """Thread-safe source of simulated server latencies"""
+
+    def __init__(self, latency: float, jitter: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)  # noqa: S311
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        delay = self.latency
+        if self.jitter:
+            with self._lock:
+                delay += self._random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class BenchmarkServicer(schema_pb2_grpc.ServiceServicer):
+    def __init__(self, latency: Latency):
+        self.latency = latency
+        self.responses: typing.Dict[str, typing.Any] = {}
+        for key, (value, variant) in FLAGS.items():
+            if isinstance(value, dict):
+                struct = Struct()
+                struct.update(value)
+                value = struct
+            self.responses[key] = (value, variant)
+
+    def _resolve(
+        self, request: typing.Any, context: typing.Any, response_type: typing.Any
+    ) -> typing.Any:
+        self.latency.wait()
+        if request.flag_key not in self.responses:
+            context.abort(grpc.StatusCode.NOT_FOUND, "flag not found")
+        value, variant = self.responses[request.flag_key]
+        return response_type(value=value, reason="TARGETING_MATCH", variant=variant)
+
+    def ResolveAll(self, request: typing.Any, context: typing.Any) -> typing.Any:  # noqa: N802
+        self.latency.wait()
+        response = schema_pb2.ResolveAllResponse()
+        for key, (value, variant) in self.responses.items():
+            flag = response.flags[key]
+            flag.reason, flag.variant = "TARGETING_MATCH", variant
+            if isinstance(value, bool):
+                flag.bool_value = value
+            elif isinstance(value, str):
+                flag.string_value = value
+            elif isinstance(value, (int, float)):
+                flag.double_value = value
+            else:
+                flag.object_value.CopyFrom(value)
+        return response
+
+    def ResolveBoolean(self, request: typing.Any, context: typing.Any) -> typing.Any:  # noqa: N802
+        return self._resolve(request, context, schema_pb2.ResolveBooleanResponse)
+
+    def ResolveString(self, request: typing.Any, context: typing.Any) -> typing.Any:  # noqa: N802
+        return self._resolve(request, context, schema_pb2.ResolveStringResponse)
+
+    def ResolveFloat(self, request: typing.Any, context: typing.Any) -> typing.Any:  # noqa: N802
+        return self._resolve(request, context, schema_pb2.ResolveFloatResponse)
+
+    def ResolveInt(self, request: typing.Any, context: typing.Any) -> typing.Any:  # noqa: N802
+        return self._resolve(request, context, schema_pb2.ResolveIntResponse)
+
+    def ResolveObject(self, request: typing.Any, context: typing.Any) -> typing.Any:  # noqa: N802
+        return self._resolve(request, context, schema_pb2.ResolveObjectResponse)
+
+    def EventStream(  # noqa: N802
+        self, request: typing.Any, context: typing.Any
+    ) -> typing.Iterator[typing.Any]:
+        yield schema_pb2.EventStreamResponse(type="provider_ready")
+        while context.is_active():
+            time.sleep(0.1)
+
+
+class BenchmarkSyncServicer(sync_pb2_grpc.FlagSyncServiceServicer):
+    def SyncFlags(  # noqa: N802
+        self, request: typing.Any, context: typing.Any
+    ) -> typing.Iterator[typing.Any]:
+        yield sync_pb2.SyncFlagsResponse(flag_configuration=FLAG_CONFIGURATION)
+        while context.is_active():
+            time.sleep(0.1)
+
+
+@contextlib.contextmanager
+def serve(
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    seed: int = 0,
+    workers: int = 64,
+    socket_path: typing.Optional[str] = None,
+) -> typing.Iterator[int]:
+    """
+    Runs the stand-in server on a free local port, which is yielded, and on
+    the unix domain socket at socket_path if given
+    """
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=workers))
+    schema_pb2_grpc.add_ServiceServicer_to_server(
+        BenchmarkServicer(Latency(latency, jitter, seed)), server
+    )
+    sync_pb2_grpc.add_FlagSyncServiceServicer_to_server(BenchmarkSyncServicer(), server)
+    port = server.add_insecure_port("localhost:0")
+    if socket_path is not None:
+        server.add_insecure_port(f"unix:{socket_path}")
+    server.start()
+    try:
+        yield port
+    finally:
+        server.stop(grace=None)
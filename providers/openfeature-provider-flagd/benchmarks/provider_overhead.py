@@ -0,0 +1,110 @@
+"""
+Measures the Python overhead of FlagdProvider per flag resolution
+
+The provider talks to a stubbed channel which answers every call with a
+canned response, so the timings exclude network and server time and only
+cover the provider, context serialization and protobuf decoding.
+
+Run with ``python benchmarks/provider_overhead.py``.
+"""
+
+import argparse
+import timeit
+import typing
+
+from google.protobuf.struct_pb2 import Struct
+
+from openfeature.contrib.provider.flagd import FlagdProvider
+from openfeature.contrib.provider.flagd.proto.schema.v1 import schema_pb2
+from openfeature.contrib.provider.flagd.resolvers import GrpcResolver
+from openfeature.evaluation_context import EvaluationContext
+
+
+def object_value() -> Struct:
+    value = Struct()
+    value.update({"color": "blue", "size": 3})
+    return value
+
+
+RESPONSES = {
+    "ResolveBoolean": schema_pb2.ResolveBooleanResponse(
+        value=True, reason="STATIC", variant="on"
+    ),
+    "ResolveString": schema_pb2.ResolveStringResponse(
+        value="blue", reason="STATIC", variant="blue"
+    ),
+    "ResolveFloat": schema_pb2.ResolveFloatResponse(
+        value=0.5, reason="STATIC", variant="half"
+    ),
+    "ResolveInt": schema_pb2.ResolveIntResponse(
+        value=3, reason="STATIC", variant="three"
+    ),
+    "ResolveObject": schema_pb2.ResolveObjectResponse(
+        value=object_value(), reason="STATIC", variant="blue"
+    ),
+}
+
+
+class StubChannel:
+    """Answers unary calls with a canned response, without any I/O"""
+
+    def unary_unary(
+        self,
+        method: str,
+        request_serializer: typing.Optional[typing.Callable[[typing.Any], bytes]],
+        response_deserializer: typing.Callable[[bytes], typing.Any],
+    ) -> typing.Callable[..., typing.Any]:
+        name = method.rsplit("/", 1)[-1]
+        data = RESPONSES[name].SerializeToString() if name in RESPONSES else b""
+        serialize = request_serializer
+
+        def call(
+            request: typing.Any, timeout: typing.Optional[float] = None
+        ) -> typing.Any:
+            if serialize is not None:
+                serialize(request)
+            return response_deserializer(data)
+
+        return call
+
+    def unary_stream(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+def context_of_size(attributes: int) -> EvaluationContext:
+    return EvaluationContext(
+        "user-1234", {f"attribute-{i}": f"value-{i}" for i in range(attributes)}
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--attributes", type=int, default=10)
+    args = parser.parse_args()
+
+    provider = FlagdProvider()
+    provider.resolver = GrpcResolver(
+        provider.config,
+        channel=StubChannel(),
+    )
+    context = context_of_size(args.attributes)
+    resolutions: typing.Dict[str, typing.Callable[[], typing.Any]] = {
+        "boolean": lambda: provider.resolve_boolean_details("flag", False, context),
+        "string": lambda: provider.resolve_string_details("flag", "red", context),
+        "float": lambda: provider.resolve_float_details("flag", 0.0, context),
+        "integer": lambda: provider.resolve_integer_details("flag", 0, context),
+        "object": lambda: provider.resolve_object_details("flag", {}, context),
+    }
+
+    print(f"{'flag type':<10} {'us/call':>8}")
+    for name, resolve in resolutions.items():
+        seconds = min(timeit.repeat(resolve, number=args.number, repeat=5))
+        print(f"{name:<10} {seconds / args.number * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Measures throughput, latency percentiles and allocations of FlagdProvider
+
+Every scenario resolves one flag type, with evaluation contexts of a given
+number of attributes, from a number of threads against the in-process
+stand-in server of flagd_server.py, which adds the configured latency and
+jitter to each evaluation. The server listens both on TCP and on a unix
+domain socket, so ``--transports tcp,unix`` compares the two.
+
+Run with ``python benchmarks/provider_throughput.py``; ``--help`` lists the
+options. ``--json`` writes the results to a file for comparing runs.
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import typing
+
+from flagd_server import serve
+
+from openfeature.contrib.provider.flagd import FlagdProvider, ResolverType
+from openfeature.evaluation_context import EvaluationContext
+
+# flag type -> (flag key, provider method, default value)
+FLAG_TYPES: typing.Dict[str, typing.Tuple[str, str, typing.Any]] = {
+    "boolean": ("boolean-flag", "resolve_boolean_details", False),
+    "string": ("string-flag", "resolve_string_details", "red"),
+    "float": ("float-flag", "resolve_float_details", 0.0),
+    "integer": ("integer-flag", "resolve_integer_details", 0),
+    "object": ("object-flag", "resolve_object_details", {}),
+}
+
+
+@dataclasses.dataclass
+class Scenario:
+    # "tcp" or "unix"
+    transport: str
+    resolver: str
+    flag_type: str
+    attributes: int
+    threads: int
+
+
+@dataclasses.dataclass
+class Result(Scenario):
+    requests: int
+    throughput: float
+    p50_ms: float
+    p99_ms: float
+    # peak memory traced while resolving, above what was allocated before
+    peak_kib: float
+    # memory still allocated after resolving, per resolution
+    retained_bytes: float
+
+
+def context_of_size(attributes: int) -> EvaluationContext:
+    return EvaluationContext(
+        "user-1234", {f"attribute-{i}": f"value-{i}" for i in range(attributes)}
+    )
+
+
+def percentile(latencies: typing.List[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted latencies"""
+    index = max(0, min(len(latencies) - 1, round(fraction * len(latencies)) - 1))
+    return latencies[index]
+
+
+def measure_latencies(
+    resolve: typing.Callable[[], typing.Any], threads: int, requests: int
+) -> typing.Tuple[float, typing.List[float]]:
+    per_thread = max(1, requests // threads)
+    latencies: typing.List[typing.List[float]] = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(samples: typing.List[float]) -> None:
+        barrier.wait()
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            resolve()
+            samples.append(time.perf_counter() - start)
+
+    workers = [
+        threading.Thread(target=worker, args=(samples,)) for samples in latencies
+    ]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted(sample for samples in latencies for sample in samples)
+
+
+def measure_allocations(
+    resolve: typing.Callable[[], typing.Any], requests: int
+) -> typing.Tuple[float, float]:
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for _ in range(requests):
+        resolve()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (peak - baseline) / 1024, (current - baseline) / requests
+
+
+def run_scenario(
+    provider: FlagdProvider, scenario: Scenario, requests: int, allocation_requests: int
+) -> Result:
+    flag_key, method, default_value = FLAG_TYPES[scenario.flag_type]
+    context = context_of_size(scenario.attributes)
+    resolve_details = getattr(provider, method)
+
+    def resolve() -> typing.Any:
+        return resolve_details(flag_key, default_value, context)
+
+    details = resolve()
+    if details.error_code is not None:
+        raise RuntimeError(f"{flag_key} could not be resolved: {details}")
+
+    elapsed, latencies = measure_latencies(resolve, scenario.threads, requests)
+    peak_kib, retained_bytes = measure_allocations(resolve, allocation_requests)
+    return Result(
+        **dataclasses.asdict(scenario),
+        requests=len(latencies),
+        throughput=len(latencies) / elapsed,
+        p50_ms=percentile(latencies, 0.5) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        peak_kib=peak_kib,
+        retained_bytes=retained_bytes,
+    )
+
+
+def create_provider(
+    resolver: str, port: int, socket_path: typing.Optional[str], channel_pool_size: int
+) -> FlagdProvider:
+    provider = FlagdProvider(
+        port=port,
+        socket_path=socket_path,
+        resolver_type=ResolverType(resolver),
+        channel_pool_size=channel_pool_size,
+    )
+    provider.initialize(EvaluationContext())
+    return provider
+
+
+def format_result(result: Result) -> str:
+    return (
+        f"{result.transport:<9} {result.resolver:<11} {result.flag_type:<8} "
+        f"{result.attributes:>5} {result.threads:>7} {result.throughput:>9.0f} "
+        f"{result.p50_ms:>7.3f} {result.p99_ms:>7.3f} {result.peak_kib:>9.1f} "
+        f"{result.retained_bytes:>10.1f}"
+    )
+
+
+def parse_list(value: str) -> typing.List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transports", type=parse_list, default=["tcp"])
+    parser.add_argument(
+        "--resolvers", type=parse_list, default=[ResolverType.GRPC.value]
+    )
+    parser.add_argument("--types", type=parse_list, default=list(FLAG_TYPES))
+    parser.add_argument("--attributes", type=parse_list, default=["0", "10", "100"])
+    parser.add_argument("--threads", type=parse_list, default=["1", "8"])
+    parser.add_argument("--channel-pool-size", type=int, default=1)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--allocation-requests", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="write the results to this file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = []
+    print(
+        f"{'transport':<9} {'resolver':<11} {'type':<8} {'attrs':>5} {'threads':>7} "
+        f"{'req/s':>9} {'p50 ms':>7} {'p99 ms':>7} {'peak KiB':>9} {'kept B/req':>10}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        socket_path = os.path.join(directory, "flagd.sock")
+        latency, jitter = args.latency_ms / 1000, args.jitter_ms / 1000
+        with serve(latency, jitter, args.seed, socket_path=socket_path) as port:
+            for transport, resolver in itertools.product(
+                args.transports, args.resolvers
+            ):
+                provider = create_provider(
+                    resolver,
+                    port,
+                    socket_path if transport == "unix" else None,
+                    args.channel_pool_size,
+                )
+                try:
+                    for flag_type, attributes, threads in itertools.product(
+                        args.types, map(int, args.attributes), map(int, args.threads)
+                    ):
+                        scenario = Scenario(
+                            transport, resolver, flag_type, attributes, threads
+                        )
+                        result = run_scenario(
+                            provider, scenario, args.requests, args.allocation_requests
+                        )
+                        results.append(result)
+                        print(format_result(result))
+                finally:
+                    provider.shutdown()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([dataclasses.asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
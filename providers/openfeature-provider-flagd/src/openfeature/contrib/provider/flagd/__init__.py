@@ -1,3 +1,14 @@
+from .async_provider import AsyncFlagdProvider
+from .config import CacheType, ChannelSelection, ResolverType, SyncProtocol
+from .deadline import deadline
 from .provider import FlagdProvider
 
-__all__ = ["FlagdProvider"]
+__all__ = [
+    "AsyncFlagdProvider",
+    "CacheType",
+    "ChannelSelection",
+    "FlagdProvider",
+    "ResolverType",
+    "SyncProtocol",
+    "deadline",
+]
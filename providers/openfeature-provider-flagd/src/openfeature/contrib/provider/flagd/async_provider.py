@@ -0,0 +1,224 @@
+import asyncio
+import typing
+
+import grpc
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import ErrorCode, OpenFeatureError
+from openfeature.flag_evaluation import FlagResolutionDetails, Reason
+from openfeature.provider.metadata import Metadata
+
+from .channel import create_aio_channel
+from .config import Config
+from .context import ContextSerializer
+from .deadline import remaining_timeout
+from .flag_type import FlagType, flag_type_of
+from .fork import register_fork_handler
+from .resolvers.grpc import (
+    ResolutionKey,
+    to_openfeature_error,
+    to_python_value,
+)
+from .singleflight import AsyncSingleFlight
+from .wire import RESOLVE_METHODS, encode_resolve_request, raw_method
+
+T = typing.TypeVar("T")
+
+
+class AsyncFlagdProvider:
+    """
+    Flagd provider for asyncio applications
+
+    Flags are resolved through a ``grpc.aio`` channel, so evaluations are
+    awaited instead of blocking the event loop. The channel is created on
+    first use, in the event loop that uses it.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        host: typing.Optional[str] = None,
+        port: typing.Optional[int] = None,
+        tls: typing.Optional[bool] = None,
+        timeout: typing.Optional[int] = None,
+        coalesce_requests: typing.Optional[bool] = None,
+        socket_path: typing.Optional[str] = None,
+    ):
+        """
+        Create an instance of the AsyncFlagdProvider
+
+        :param host: the host to make requests to
+        :param port: the port the flagd service is available on
+        :param tls: enable/disable secure TLS connectivity
+        :param timeout: the maximum to wait before a request times out
+        :param coalesce_requests: share one RPC between concurrent identical
+            resolutions
+        :param socket_path: connect through this unix domain socket instead of
+            host and port
+        """
+        self.config = Config(
+            host=host,
+            port=port,
+            tls=tls,
+            timeout=timeout,
+            coalesce_requests=coalesce_requests,
+            socket_path=socket_path,
+        )
+        self.context_serializer = ContextSerializer()
+        self.single_flight: typing.Optional[
+            AsyncSingleFlight[ResolutionKey, FlagResolutionDetails]
+        ] = AsyncSingleFlight() if self.config.coalesce_requests else None
+        self.channel: typing.Optional[grpc.aio.Channel] = None
+        self._connected = False
+        self._raw_methods: typing.Dict[FlagType, typing.Any] = {}
+        register_fork_handler(self)
+
+    @property
+    def raw_methods(self) -> typing.Mapping[FlagType, typing.Any]:
+        """Resolution methods taking requests pre-encoded as bytes"""
+        if not self._connected:
+            self._connect()
+        return self._raw_methods
+
+    def _connect(self) -> None:
+        self.channel = create_aio_channel(self.config)
+        self._raw_methods = {
+            flag_type: raw_method(self.channel, method, response_type)
+            for flag_type, (method, response_type) in RESOLVE_METHODS.items()
+        }
+        self._connected = True
+
+    def after_fork_in_child(self) -> None:
+        # the channel belongs to the parent process and must not be used, a
+        # new one is created on first use in the child
+        self.channel = None
+        self._connected = False
+        self._raw_methods = {}
+        self.context_serializer = ContextSerializer()
+        if self.single_flight is not None:
+            self.single_flight = AsyncSingleFlight()
+
+    async def shutdown(self) -> None:
+        if self.channel is not None:
+            await self.channel.close()
+            self.channel = None
+            self._connected = False
+            self._raw_methods = {}
+
+    def get_metadata(self) -> Metadata:
+        """Returns provider metadata"""
+        return Metadata(name="AsyncFlagdProvider")
+
+    async def resolve_boolean_details(
+        self,
+        key: str,
+        default_value: bool,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[bool]:
+        return await self._resolve(key, FlagType.BOOLEAN, evaluation_context)
+
+    async def resolve_string_details(
+        self,
+        key: str,
+        default_value: str,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[str]:
+        return await self._resolve(key, FlagType.STRING, evaluation_context)
+
+    async def resolve_float_details(
+        self,
+        key: str,
+        default_value: float,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[float]:
+        return await self._resolve(key, FlagType.FLOAT, evaluation_context)
+
+    async def resolve_integer_details(
+        self,
+        key: str,
+        default_value: int,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[int]:
+        return await self._resolve(key, FlagType.INTEGER, evaluation_context)
+
+    async def resolve_object_details(
+        self,
+        key: str,
+        default_value: typing.Union[dict, list],
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[typing.Union[dict, list]]:
+        return await self._resolve(key, FlagType.OBJECT, evaluation_context)
+
+    async def resolve_many(
+        self,
+        flags: typing.Mapping[str, typing.Any],
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> typing.Dict[str, FlagResolutionDetails]:
+        """
+        Resolves several flags concurrently
+
+        :param flags: the default value of each flag, by flag key. The type of
+            each flag is inferred from its default value.
+        :param evaluation_context: the context used for every flag
+        :return: the resolution of each flag. Flags which failed to resolve
+            carry their default value and the error.
+        """
+        keys = list(flags)
+        results = await asyncio.gather(
+            *(
+                self._resolve(key, flag_type_of(flags[key]), evaluation_context)
+                for key in keys
+            ),
+            return_exceptions=True,
+        )
+        resolved: typing.Dict[str, FlagResolutionDetails] = {}
+        for key, result in zip(keys, results):
+            if isinstance(result, OpenFeatureError):
+                resolved[key] = FlagResolutionDetails(
+                    value=flags[key],
+                    reason=Reason.ERROR,
+                    error_code=result.error_code,
+                    error_message=result.error_message,
+                )
+            elif isinstance(result, Exception):
+                resolved[key] = FlagResolutionDetails(
+                    value=flags[key],
+                    reason=Reason.ERROR,
+                    error_code=ErrorCode.GENERAL,
+                    error_message=str(result),
+                )
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                resolved[key] = result
+        return resolved
+
+    async def _resolve(
+        self,
+        flag_key: str,
+        flag_type: FlagType,
+        evaluation_context: typing.Optional[EvaluationContext],
+    ) -> FlagResolutionDetails[typing.Any]:
+        context_data = self.context_serializer.serialize(evaluation_context).data
+        if self.single_flight is None:
+            return await self._resolve_remote(flag_key, flag_type, context_data)
+
+        key = (flag_key, flag_type, context_data)
+        return await self.single_flight.do(
+            key, lambda: self._resolve_remote(flag_key, flag_type, context_data)
+        )
+
+    async def _resolve_remote(
+        self, flag_key: str, flag_type: FlagType, context_data: bytes
+    ) -> FlagResolutionDetails[typing.Any]:
+        timeout = remaining_timeout(self.config.timeout)
+        request = encode_resolve_request(flag_key, context_data)
+        try:
+            response = await self.raw_methods[flag_type](request, timeout=timeout)
+        except grpc.RpcError as e:
+            raise to_openfeature_error(e) from e
+
+        return FlagResolutionDetails(
+            value=to_python_value(response.value),
+            reason=response.reason,
+            variant=response.variant,
+        )
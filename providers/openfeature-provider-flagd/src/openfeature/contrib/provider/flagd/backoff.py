@@ -0,0 +1,22 @@
+import random
+
+
+class Backoff:
+    """
+    Exponential backoff with full jitter between reconnection attempts, so that
+    many clients losing flagd at once do not reconnect in lockstep
+    """
+
+    def __init__(self, initial: float, maximum: float):
+        self.initial = initial
+        self.maximum = maximum
+        self.attempts = 0
+
+    def next(self) -> float:
+        """Returns how long to wait before the next attempt"""
+        ceiling = min(self.maximum, self.initial * 2**self.attempts)
+        self.attempts += 1
+        return random.uniform(0, ceiling)  # noqa: S311
+
+    def reset(self) -> None:
+        self.attempts = 0
@@ -0,0 +1,154 @@
+import logging
+import threading
+import time
+import typing
+from concurrent.futures import Future
+
+import grpc
+from google.protobuf.struct_pb2 import Struct
+
+from openfeature.exception import GeneralError, OpenFeatureError
+from openfeature.flag_evaluation import FlagResolutionDetails
+
+from .flag_type import FlagType, check_type
+
+logger = logging.getLogger("openfeature.contrib")
+
+# issues a ResolveAll call for a context and returns its result as a future
+ResolveAllCall = typing.Callable[[Struct], grpc.Future]
+ConvertResponse = typing.Callable[
+    [typing.Any], typing.Mapping[str, FlagResolutionDetails]
+]
+ConvertError = typing.Callable[[grpc.RpcError], OpenFeatureError]
+
+
+class _Pending:
+    __slots__ = ("context", "context_key", "flag_key", "flag_type", "future")
+
+    def __init__(
+        self, flag_key: str, flag_type: FlagType, context_key: bytes, context: Struct
+    ):
+        self.flag_key = flag_key
+        self.flag_type = flag_type
+        self.context_key = context_key
+        self.context = context
+        self.future: Future[typing.Optional[FlagResolutionDetails]] = Future()
+
+
+class BatchDispatcher:
+    """
+    Collects flag resolutions submitted by many threads over a short window
+    and resolves them with one ResolveAll call per distinct evaluation context
+
+    A batch is dispatched once ``window`` seconds have passed since its first
+    resolution was submitted, or as soon as it holds ``max_size`` resolutions.
+    """
+
+    def __init__(
+        self,
+        resolve_all: ResolveAllCall,
+        convert_response: ConvertResponse,
+        convert_error: ConvertError,
+        window: float,
+        max_size: int,
+    ):
+        self.resolve_all = resolve_all
+        self.convert_response = convert_response
+        self.convert_error = convert_error
+        self.window = window
+        self.max_size = max_size
+
+        self._pending: typing.List[_Pending] = []
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._dispatch_batches, name="FlagdBatchDispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self, flag_key: str, flag_type: FlagType, context_key: bytes, context: Struct
+    ) -> typing.Optional[FlagResolutionDetails]:
+        """
+        Blocks until the batch holding this resolution was resolved. Returns None
+        when flagd left the flag out of its ResolveAll response, e.g. because it
+        is disabled, in which case the caller should resolve it individually.
+        """
+        pending = _Pending(flag_key, flag_type, context_key, context)
+        with self._condition:
+            if self._stopped:
+                raise GeneralError("provider has been shut down")
+            self._pending.append(pending)
+            if len(self._pending) == 1 or len(self._pending) >= self.max_size:
+                self._condition.notify()
+        return pending.future.result()
+
+    def shutdown(self) -> None:
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _dispatch_batches(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._dispatch(batch)
+
+    def _next_batch(self) -> typing.Optional[typing.List[_Pending]]:
+        with self._condition:
+            while not self._pending and not self._stopped:
+                self._condition.wait()
+            deadline = time.monotonic() + self.window
+            while not self._stopped and len(self._pending) < self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            batch, self._pending = self._pending, []
+
+        if self._stopped:
+            for pending in batch:
+                pending.future.set_exception(
+                    GeneralError("provider has been shut down")
+                )
+            return None
+        return batch
+
+    def _dispatch(self, batch: typing.List[_Pending]) -> None:
+        groups: typing.Dict[bytes, typing.List[_Pending]] = {}
+        for pending in batch:
+            groups.setdefault(pending.context_key, []).append(pending)
+
+        # contexts are resolved concurrently, so one slow context does not
+        # hold back the rest of the batch
+        calls = [
+            (group, self.resolve_all(group[0].context)) for group in groups.values()
+        ]
+        for group, call in calls:
+            try:
+                flags = self.convert_response(call.result())
+            except grpc.RpcError as e:
+                error = self.convert_error(e)
+                for pending in group:
+                    pending.future.set_exception(error)
+                continue
+
+            for pending in group:
+                details = flags.get(pending.flag_key)
+                if details is None:
+                    pending.future.set_result(None)
+                    continue
+                try:
+                    value = check_type(
+                        pending.flag_key, pending.flag_type, details.value
+                    )
+                except OpenFeatureError as e:
+                    pending.future.set_exception(e)
+                    continue
+                pending.future.set_result(
+                    FlagResolutionDetails(
+                        value=value, reason=details.reason, variant=details.variant
+                    )
+                )
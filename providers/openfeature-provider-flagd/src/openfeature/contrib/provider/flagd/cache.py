@@ -0,0 +1,88 @@
+import threading
+import typing
+from collections import OrderedDict
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+class LRUCache(typing.Generic[K, V]):
+    """
+    Thread-safe, bounded least-recently-used cache
+
+    Every call to ``clear`` or ``invalidate`` starts a new generation. Writers
+    that looked up a value before an invalidation can pass the generation they
+    observed to ``put`` so that the stale value is dropped instead of stored.
+
+    With ``group_of``, entries are indexed by the group their key belongs to, so
+    that ``invalidate`` removes the entries of some groups without scanning the
+    whole cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        group_of: typing.Optional[typing.Callable[[K], typing.Hashable]] = None,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        self.max_size = max_size
+        self.group_of = group_of
+        self._entries: typing.OrderedDict[K, V] = OrderedDict()
+        self._groups: typing.Dict[typing.Hashable, typing.Set[K]] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def get(self, key: K) -> typing.Optional[V]:
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                return None
+            return self._entries[key]
+
+    def put(self, key: K, value: V, generation: typing.Optional[int] = None) -> None:
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if self.group_of is not None:
+                self._groups.setdefault(self.group_of(key), set()).add(key)
+            if len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._ungroup(evicted)
+
+    def remove(self, key: K) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._ungroup(key)
+
+    def _ungroup(self, key: K) -> None:
+        if self.group_of is None:
+            return
+        group = self.group_of(key)
+        keys = self._groups.get(group)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._groups[group]
+
+    def invalidate(self, groups: typing.Iterable[typing.Hashable]) -> None:
+        """Removes the entries of the given groups, keeping all others"""
+        if self.group_of is None:
+            raise ValueError("invalidating groups needs a cache with group_of")
+        with self._lock:
+            self.generation += 1
+            for group in groups:
+                for key in self._groups.pop(group, ()):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._groups.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,53 @@
+import typing
+
+import grpc
+
+from .config import Config
+from .pool import ChannelPool
+
+
+def channel_options(config: Config) -> typing.List[typing.Tuple[str, typing.Any]]:
+    options: typing.List[typing.Tuple[str, typing.Any]] = []
+    if config.keepalive_time_ms is not None:
+        options.append(("grpc.keepalive_time_ms", config.keepalive_time_ms))
+    if config.keepalive_timeout_ms is not None:
+        options.append(("grpc.keepalive_timeout_ms", config.keepalive_timeout_ms))
+    if config.channel_pool_size > 1:
+        # channels to the same target otherwise share their connection, which
+        # would defeat pooling them
+        options.append(("grpc.use_local_subchannel_pool", 1))
+    return options
+
+
+def channel_target(config: Config) -> str:
+    if config.socket_path:
+        # "unix:" rather than "unix://", which only takes absolute paths
+        return f"unix:{config.socket_path}"
+    return f"{config.host}:{config.port}"
+
+
+def create_channel(config: Config) -> grpc.Channel:
+    target = channel_target(config)
+    options = channel_options(config)
+    if config.tls:
+        return grpc.secure_channel(
+            target, grpc.ssl_channel_credentials(), options=options
+        )
+    return grpc.insecure_channel(target, options=options)
+
+
+def create_aio_channel(config: Config) -> grpc.aio.Channel:
+    target = channel_target(config)
+    options = channel_options(config)
+    if config.tls:
+        return grpc.aio.secure_channel(
+            target, grpc.ssl_channel_credentials(), options=options
+        )
+    return grpc.aio.insecure_channel(target, options=options)
+
+
+def create_channel_pool(config: Config) -> ChannelPool:
+    return ChannelPool(
+        [create_channel(config) for _ in range(max(1, config.channel_pool_size))],
+        config.channel_selection,
+    )
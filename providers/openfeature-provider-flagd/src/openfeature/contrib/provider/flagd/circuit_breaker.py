@@ -0,0 +1,121 @@
+import collections
+import enum
+import threading
+import time
+import typing
+
+from openfeature.exception import ProviderNotReadyError
+
+
+class CircuitState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+
+class CircuitOpenError(ProviderNotReadyError):
+    """Raised instead of calling flagd while the circuit breaker is open"""
+
+    def __init__(self) -> None:
+        super().__init__("the circuit breaker in front of flagd is open")
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an unhealthy service, so that callers fail fast instead of
+    waiting out their timeouts, and the service gets room to recover
+
+    The outcomes of the last ``window`` calls are kept. Once at least
+    ``min_calls`` of them were recorded, the circuit opens when the share of
+    failed calls, or of calls slower than ``slow_call``, reaches
+    ``failure_rate``. After ``open_duration`` seconds, a single probe call is
+    let through: the circuit closes if it succeeds in time and opens again
+    otherwise. A probe whose outcome is never recorded, e.g. because it was
+    cancelled, is replaced by another one after ``open_duration``.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        failure_rate: float,
+        slow_call: float,
+        open_duration: float,
+        window: int = 100,
+        min_calls: int = 20,
+        on_state_change: typing.Optional[typing.Callable[[CircuitState], None]] = None,
+    ):
+        if not 0 < failure_rate <= 1:
+            raise ValueError("failure_rate must be within (0, 1]")
+        self.failure_rate = failure_rate
+        self.slow_call = slow_call
+        self.open_duration = open_duration
+        self.min_calls = min_calls
+        self.on_state_change = on_state_change
+        self.state = CircuitState.CLOSED
+        # (failed, slow) of every call in the window
+        self._calls: typing.Deque[typing.Tuple[bool, bool]] = collections.deque(
+            maxlen=window
+        )
+        self._failed = 0
+        self._slow = 0
+        # when the circuit opened, or when the current probe was let through
+        self._since = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Returns whether a call may be made now"""
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return True
+            if time.monotonic() - self._since < self.open_duration:
+                return False
+            # the circuit was open for long enough, or the probe was lost
+            changed = self.state != CircuitState.HALF_OPEN
+            self._enter(CircuitState.HALF_OPEN)
+        if changed:
+            self._notify(CircuitState.HALF_OPEN)
+        return True
+
+    def record_call(self, latency: float) -> None:
+        """Records a call that flagd answered, after ``latency`` seconds"""
+        self._record(False, latency >= self.slow_call)
+
+    def record_failure(self) -> None:
+        """Records a call that failed because of flagd or the connection to it"""
+        self._record(True, False)
+
+    def _record(self, failed: bool, slow: bool) -> None:
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                # a call started before the circuit opened
+                return
+            if self.state == CircuitState.HALF_OPEN:
+                state = CircuitState.OPEN if failed or slow else CircuitState.CLOSED
+            else:
+                self._add(failed, slow)
+                if len(self._calls) < self.min_calls or (
+                    max(self._failed, self._slow) < self.failure_rate * len(self._calls)
+                ):
+                    return
+                state = CircuitState.OPEN
+            self._enter(state)
+        self._notify(state)
+
+    def _add(self, failed: bool, slow: bool) -> None:
+        if len(self._calls) == self._calls.maxlen:
+            dropped_failed, dropped_slow = self._calls[0]
+            self._failed -= dropped_failed
+            self._slow -= dropped_slow
+        self._calls.append((failed, slow))
+        self._failed += failed
+        self._slow += slow
+
+    def _enter(self, state: CircuitState) -> None:
+        self.state = state
+        self._since = time.monotonic()
+        if state == CircuitState.CLOSED:
+            self._calls.clear()
+            self._failed = self._slow = 0
+
+    def _notify(self, state: CircuitState) -> None:
+        if self.on_state_change is not None:
+            self.on_state_change(state)
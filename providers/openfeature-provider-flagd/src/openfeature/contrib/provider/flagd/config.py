@@ -1,5 +1,6 @@
 import os
 import typing
+from enum import Enum
 
 T = typing.TypeVar("T")
 
@@ -8,6 +9,14 @@ def str_to_bool(val: str) -> bool:
     return val.lower() == "true"
 
 
+@typing.overload
+def env_or_default(env_var: str, default: T) -> typing.Union[str, T]: ...
+
+
+@typing.overload
+def env_or_default(env_var: str, default: T, cast: typing.Callable[[str], T]) -> T: ...
+
+
 def env_or_default(
     env_var: str, default: T, cast: typing.Optional[typing.Callable[[str], T]] = None
 ) -> typing.Union[str, T]:
@@ -17,19 +26,230 @@ def env_or_default(
     return val if cast is None else cast(val)
 
 
+class ResolverType(Enum):
+    GRPC = "grpc"
+    IN_PROCESS = "in-process"
+
+
+DEFAULT_PORT = {
+    ResolverType.GRPC: 8013,
+    ResolverType.IN_PROCESS: 8015,
+}
+
+
+class CacheType(Enum):
+    LRU = "lru"
+    DISABLED = "disabled"
+
+
+class ChannelSelection(Enum):
+    ROUND_ROBIN = "round-robin"
+    LEAST_OUTSTANDING = "least-outstanding"
+
+
+class SyncProtocol(Enum):
+    FLAGD_SYNC_V1 = "flagd.sync.v1"
+    # the deprecated sync service, which streams changes as deltas
+    SYNC_V1 = "sync.v1"
+
+
 class Config:
-    def __init__(
+    def __init__(  # noqa: PLR0913, PLR0915
         self,
         host: typing.Optional[str] = None,
         port: typing.Optional[int] = None,
         tls: typing.Optional[bool] = None,
         timeout: typing.Optional[int] = None,
+        cache_type: typing.Optional[CacheType] = None,
+        max_cache_size: typing.Optional[int] = None,
+        resolver_type: typing.Optional[ResolverType] = None,
+        selector: typing.Optional[str] = None,
+        coalesce_requests: typing.Optional[bool] = None,
+        batch_window_ms: typing.Optional[int] = None,
+        batch_max_size: typing.Optional[int] = None,
+        channel_pool_size: typing.Optional[int] = None,
+        channel_selection: typing.Optional[ChannelSelection] = None,
+        keepalive_time_ms: typing.Optional[int] = None,
+        keepalive_timeout_ms: typing.Optional[int] = None,
+        socket_path: typing.Optional[str] = None,
+        warm_up: typing.Optional[bool] = None,
+        snapshot_path: typing.Optional[str] = None,
+        snapshot_interval_ms: typing.Optional[int] = None,
+        offline_flag_source_path: typing.Optional[str] = None,
+        offline_poll_interval_ms: typing.Optional[int] = None,
+        sync_protocol: typing.Optional[SyncProtocol] = None,
+        retry_backoff_ms: typing.Optional[int] = None,
+        retry_backoff_max_ms: typing.Optional[int] = None,
+        max_staleness_ms: typing.Optional[int] = None,
+        max_stale_entries: typing.Optional[int] = None,
+        refresh_after_ms: typing.Optional[int] = None,
+        hedge_requests: typing.Optional[bool] = None,
+        circuit_breaker: typing.Optional[bool] = None,
+        circuit_breaker_failure_rate: typing.Optional[float] = None,
+        circuit_breaker_slow_call_ms: typing.Optional[int] = None,
+        circuit_breaker_open_ms: typing.Optional[int] = None,
     ):
+        self.offline_flag_source_path = (
+            env_or_default("FLAGD_OFFLINE_FLAG_SOURCE_PATH", None)
+            if offline_flag_source_path is None
+            else offline_flag_source_path
+        )
+        self.offline_poll_interval_ms = (
+            env_or_default("FLAGD_OFFLINE_POLL_MS", 5000, cast=int)
+            if offline_poll_interval_ms is None
+            else offline_poll_interval_ms
+        )
+        # flags read from a file are always evaluated in-process
+        default_resolver_type = (
+            ResolverType.GRPC
+            if self.offline_flag_source_path is None
+            else ResolverType.IN_PROCESS
+        )
+        self.resolver_type = (
+            env_or_default(
+                "FLAGD_RESOLVER_TYPE", default_resolver_type, cast=ResolverType
+            )
+            if resolver_type is None
+            else resolver_type
+        )
         self.host = env_or_default("FLAGD_HOST", "localhost") if host is None else host
         self.port = (
-            env_or_default("FLAGD_PORT", 8013, cast=int) if port is None else port
+            env_or_default("FLAGD_PORT", DEFAULT_PORT[self.resolver_type], cast=int)
+            if port is None
+            else port
         )
         self.tls = (
             env_or_default("FLAGD_TLS", False, cast=str_to_bool) if tls is None else tls
         )
         self.timeout = 5 if timeout is None else timeout
+        self.cache_type = (
+            env_or_default("FLAGD_CACHE", CacheType.DISABLED, cast=CacheType)
+            if cache_type is None
+            else cache_type
+        )
+        self.max_cache_size = (
+            env_or_default("FLAGD_MAX_CACHE_SIZE", 1000, cast=int)
+            if max_cache_size is None
+            else max_cache_size
+        )
+        self.selector = (
+            env_or_default("FLAGD_SOURCE_SELECTOR", None)
+            if selector is None
+            else selector
+        )
+        self.coalesce_requests = (
+            env_or_default("FLAGD_COALESCE_REQUESTS", False, cast=str_to_bool)
+            if coalesce_requests is None
+            else coalesce_requests
+        )
+        self.batch_window_ms = (
+            env_or_default("FLAGD_BATCH_WINDOW_MS", 0, cast=int)
+            if batch_window_ms is None
+            else batch_window_ms
+        )
+        self.batch_max_size = (
+            env_or_default("FLAGD_BATCH_MAX_SIZE", 100, cast=int)
+            if batch_max_size is None
+            else batch_max_size
+        )
+        self.channel_pool_size = (
+            env_or_default("FLAGD_CHANNEL_POOL_SIZE", 1, cast=int)
+            if channel_pool_size is None
+            else channel_pool_size
+        )
+        self.channel_selection = (
+            env_or_default(
+                "FLAGD_CHANNEL_SELECTION",
+                ChannelSelection.ROUND_ROBIN,
+                cast=ChannelSelection,
+            )
+            if channel_selection is None
+            else channel_selection
+        )
+        self.keepalive_time_ms = (
+            env_or_default("FLAGD_KEEPALIVE_TIME_MS", None, cast=int)
+            if keepalive_time_ms is None
+            else keepalive_time_ms
+        )
+        self.keepalive_timeout_ms = (
+            env_or_default("FLAGD_KEEPALIVE_TIMEOUT_MS", None, cast=int)
+            if keepalive_timeout_ms is None
+            else keepalive_timeout_ms
+        )
+        self.socket_path = (
+            env_or_default("FLAGD_SOCKET_PATH", None)
+            if socket_path is None
+            else socket_path
+        )
+        self.warm_up = (
+            env_or_default("FLAGD_WARM_UP", False, cast=str_to_bool)
+            if warm_up is None
+            else warm_up
+        )
+        self.snapshot_path = (
+            env_or_default("FLAGD_SNAPSHOT_PATH", None)
+            if snapshot_path is None
+            else snapshot_path
+        )
+        self.snapshot_interval_ms = (
+            env_or_default("FLAGD_SNAPSHOT_INTERVAL_MS", 5000, cast=int)
+            if snapshot_interval_ms is None
+            else snapshot_interval_ms
+        )
+        self.sync_protocol = (
+            env_or_default(
+                "FLAGD_SYNC_PROTOCOL", SyncProtocol.FLAGD_SYNC_V1, cast=SyncProtocol
+            )
+            if sync_protocol is None
+            else sync_protocol
+        )
+        self.retry_backoff_ms = (
+            env_or_default("FLAGD_RETRY_BACKOFF_MS", 1000, cast=int)
+            if retry_backoff_ms is None
+            else retry_backoff_ms
+        )
+        self.retry_backoff_max_ms = (
+            env_or_default("FLAGD_RETRY_BACKOFF_MAX_MS", 120000, cast=int)
+            if retry_backoff_max_ms is None
+            else retry_backoff_max_ms
+        )
+        self.max_staleness_ms = (
+            env_or_default("FLAGD_MAX_STALENESS_MS", 0, cast=int)
+            if max_staleness_ms is None
+            else max_staleness_ms
+        )
+        self.max_stale_entries = (
+            env_or_default("FLAGD_MAX_STALE_ENTRIES", 1000, cast=int)
+            if max_stale_entries is None
+            else max_stale_entries
+        )
+        self.refresh_after_ms = (
+            env_or_default("FLAGD_REFRESH_AFTER_MS", 1000, cast=int)
+            if refresh_after_ms is None
+            else refresh_after_ms
+        )
+        self.hedge_requests = (
+            env_or_default("FLAGD_HEDGE_REQUESTS", False, cast=str_to_bool)
+            if hedge_requests is None
+            else hedge_requests
+        )
+        self.circuit_breaker = (
+            env_or_default("FLAGD_CIRCUIT_BREAKER", False, cast=str_to_bool)
+            if circuit_breaker is None
+            else circuit_breaker
+        )
+        self.circuit_breaker_failure_rate = (
+            env_or_default("FLAGD_CIRCUIT_BREAKER_FAILURE_RATE", 0.5, cast=float)
+            if circuit_breaker_failure_rate is None
+            else circuit_breaker_failure_rate
+        )
+        self.circuit_breaker_slow_call_ms = (
+            env_or_default("FLAGD_CIRCUIT_BREAKER_SLOW_CALL_MS", 1000, cast=int)
+            if circuit_breaker_slow_call_ms is None
+            else circuit_breaker_slow_call_ms
+        )
+        self.circuit_breaker_open_ms = (
+            env_or_default("FLAGD_CIRCUIT_BREAKER_OPEN_MS", 30000, cast=int)
+            if circuit_breaker_open_ms is None
+            else circuit_breaker_open_ms
+        )
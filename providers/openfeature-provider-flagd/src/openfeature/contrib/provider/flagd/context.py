@@ -0,0 +1,88 @@
+import typing
+
+from google.protobuf.struct_pb2 import Struct
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import InvalidContextError
+
+from .cache import LRUCache
+
+# number of distinct evaluation contexts whose serialization is remembered
+DEFAULT_MAX_CONTEXTS = 256
+
+
+class SerializedContext(typing.NamedTuple):
+    """
+    An evaluation context converted for flagd. The struct is shared between
+    resolutions and must not be modified; data holds its deterministic wire
+    format, which identifies the context in caches and batches.
+    """
+
+    struct: Struct
+    data: bytes
+
+
+def convert_context(evaluation_context: typing.Optional[EvaluationContext]) -> Struct:
+    s = Struct()
+    if evaluation_context:
+        try:
+            s["targetingKey"] = evaluation_context.targeting_key
+            s.update(evaluation_context.attributes)
+        except ValueError as exc:
+            message = "could not serialize evaluation context to google.protobuf.Struct"
+            raise InvalidContextError(message) from exc
+    return s
+
+
+def _freeze(value: typing.Any) -> typing.Hashable:
+    # the type is part of the key, as True == 1 == 1.0 but each of them is
+    # serialized differently
+    if isinstance(value, dict):
+        return (dict, tuple((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (list, tuple(_freeze(item) for item in value))
+    return (type(value), value)
+
+
+class ContextSerializer:
+    """
+    Converts evaluation contexts to protobuf Structs, remembering the result
+    for recently seen contexts
+
+    Contexts are matched on their content rather than their identity, as
+    they are mutable, so a context changed between two resolutions is
+    serialized again. Contexts whose attributes cannot be hashed are always
+    converted from scratch.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_CONTEXTS):
+        self._serialized: LRUCache[typing.Hashable, SerializedContext] = LRUCache(
+            max_size
+        )
+        self._empty = self._convert(None)
+
+    def serialize(
+        self, evaluation_context: typing.Optional[EvaluationContext]
+    ) -> SerializedContext:
+        if evaluation_context is None:
+            return self._empty
+        try:
+            key = (
+                evaluation_context.targeting_key,
+                _freeze(evaluation_context.attributes),
+            )
+            serialized = self._serialized.get(key)
+        except TypeError:
+            return self._convert(evaluation_context)
+
+        if serialized is None:
+            serialized = self._convert(evaluation_context)
+            self._serialized.put(key, serialized)
+        return serialized
+
+    @staticmethod
+    def _convert(
+        evaluation_context: typing.Optional[EvaluationContext],
+    ) -> SerializedContext:
+        struct = convert_context(evaluation_context)
+        return SerializedContext(struct, struct.SerializeToString(deterministic=True))
@@ -0,0 +1,53 @@
+"""
+Deadlines of the work flag resolutions are done for
+
+A web request, for example, usually has to answer within some time. Flag
+resolutions made while handling it should not outlive that budget, so the
+application sets the deadline once with ``deadline`` and every resolution in
+that context, including those of asyncio tasks it starts, is given at most the
+time left instead of the provider's fixed timeout.
+"""
+
+import contextlib
+import contextvars
+import time
+import typing
+
+from openfeature.exception import GeneralError
+
+# the time.monotonic() value by which resolutions have to be done
+_deadline: contextvars.ContextVar[typing.Optional[float]] = contextvars.ContextVar(
+    "flagd_deadline", default=None
+)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float) -> typing.Iterator[None]:
+    """
+    Bounds flag resolutions made in this context to the next ``seconds``.
+    Nested deadlines can only shorten the time left, never extend it.
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires = min(expires, current)
+    token = _deadline.set(expires)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_timeout(timeout: float) -> float:
+    """
+    Returns how long a call may take: the time left until the current deadline,
+    but at most ``timeout``. Raises GeneralError once the deadline has passed,
+    as waiting for flagd could not help anymore.
+    """
+    expires = _deadline.get()
+    if expires is None:
+        return timeout
+    remaining = expires - time.monotonic()
+    if remaining <= 0:
+        raise GeneralError("the deadline of the flag resolution was exceeded")
+    return min(timeout, remaining)
@@ -1,5 +1,8 @@
+import typing
 from enum import Enum
 
+from openfeature.exception import TypeMismatchError
+
 
 class FlagType(Enum):
     BOOLEAN = "BOOLEAN"
@@ -7,3 +10,49 @@ class FlagType(Enum):
     FLOAT = "FLOAT"
     INTEGER = "INTEGER"
     OBJECT = "OBJECT"
+
+
+def check_type(flag_key: str, flag_type: FlagType, value: typing.Any) -> typing.Any:
+    """Checks that a resolved value has the requested type and normalizes numbers"""
+    # bool is a subclass of int, so it has to be excluded from the numeric types
+    if flag_type == FlagType.BOOLEAN:
+        valid = isinstance(value, bool)
+    elif flag_type == FlagType.STRING:
+        valid = isinstance(value, str)
+    elif flag_type == FlagType.INTEGER:
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    elif flag_type == FlagType.FLOAT:
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if valid else value
+    else:
+        valid = isinstance(value, (dict, list))
+    if not valid:
+        raise TypeMismatchError(
+            f"Flag {flag_key} is not of type {flag_type.value.lower()}"
+        )
+    return value
+
+
+def flag_type_of(value: typing.Any) -> FlagType:
+    """Infers the type of a flag from one of its variants"""
+    if isinstance(value, bool):
+        return FlagType.BOOLEAN
+    if isinstance(value, str):
+        return FlagType.STRING
+    if isinstance(value, int):
+        return FlagType.INTEGER
+    if isinstance(value, float):
+        return FlagType.FLOAT
+    return FlagType.OBJECT
+
+
+def resolvable_types(value: typing.Any) -> typing.List[FlagType]:
+    """Returns the types a flag with this value can be resolved as"""
+    flag_type = flag_type_of(value)
+    if flag_type == FlagType.INTEGER or (
+        flag_type == FlagType.FLOAT and value.is_integer()
+    ):
+        return [FlagType.INTEGER, FlagType.FLOAT]
+    return [flag_type]
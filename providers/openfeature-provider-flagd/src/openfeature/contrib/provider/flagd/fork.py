@@ -0,0 +1,36 @@
+"""
+Support for processes forked after a provider was created, as pre-fork
+servers such as gunicorn or uWSGI do
+
+gRPC channels cannot be used across ``fork()`` and the background threads of
+a resolver do not exist in the child process. Objects owning either register
+here and are notified in the child right after the fork. As little as
+possible may happen at that point, so they only take note of it and rebuild
+their connections when they are next used.
+"""
+
+import os
+import typing
+import weakref
+
+
+class ForkAware(typing.Protocol):
+    def after_fork_in_child(self) -> None:
+        """Called in the child process right after a fork"""
+        ...
+
+
+_instances: "weakref.WeakSet[ForkAware]" = weakref.WeakSet()
+
+
+def register_fork_handler(instance: ForkAware) -> None:
+    _instances.add(instance)
+
+
+def _after_fork_in_child() -> None:
+    for instance in list(_instances):
+        instance.after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
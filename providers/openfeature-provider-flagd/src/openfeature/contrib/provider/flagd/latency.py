@@ -0,0 +1,46 @@
+import collections
+import math
+import threading
+import typing
+
+
+class LatencyWindow:
+    """
+    Thread-safe record of the latencies of the most recent calls
+
+    The percentile is only computed again every ``refresh`` samples, so that
+    reading it on every call does not sort the window every time. It is None
+    until ``min_samples`` latencies were recorded.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        size: int = 200,
+        min_samples: int = 20,
+        refresh: int = 10,
+    ):
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be within (0, 1]")
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.refresh = refresh
+        self._samples: typing.Deque[float] = collections.deque(maxlen=size)
+        self._recorded = 0
+        self._value: typing.Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._recorded += 1
+            if len(self._samples) >= self.min_samples and (
+                self._value is None or self._recorded % self.refresh == 0
+            ):
+                ordered = sorted(self._samples)
+                index = math.ceil(self.percentile * len(ordered)) - 1
+                self._value = ordered[index]
+
+    def value(self) -> typing.Optional[float]:
+        """Returns the latency at the percentile, in seconds"""
+        return self._value
@@ -0,0 +1,60 @@
+import itertools
+import threading
+import typing
+
+import grpc
+
+from .config import ChannelSelection
+
+
+class ChannelPool:
+    """
+    Fixed set of channels to flagd, one of which is picked for every call
+
+    Callers ``acquire`` the index of the channel to use and ``release`` it
+    once the call completed, which lets least-outstanding selection track
+    how many calls each channel is serving.
+    """
+
+    def __init__(
+        self,
+        channels: typing.Sequence[grpc.Channel],
+        selection: ChannelSelection = ChannelSelection.ROUND_ROBIN,
+    ):
+        if not channels:
+            raise ValueError("a channel pool needs at least one channel")
+        self.channels = list(channels)
+        self.selection = selection
+        self._next = itertools.count()
+        self._outstanding = [0] * len(self.channels)
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        size = len(self.channels)
+        if size == 1:
+            return 0
+        if self.selection == ChannelSelection.ROUND_ROBIN:
+            return next(self._next) % size
+
+        # start the search at a rotating offset, so that ties are spread
+        # across the channels instead of all going to the first one
+        offset = next(self._next)
+        with self._lock:
+            index = min(
+                ((offset + i) % size for i in range(size)),
+                key=self._outstanding.__getitem__,
+            )
+            self._outstanding[index] += 1
+        return index
+
+    def release(self, index: int) -> None:
+        if (
+            len(self.channels) > 1
+            and self.selection == ChannelSelection.LEAST_OUTSTANDING
+        ):
+            with self._lock:
+                self._outstanding[index] -= 1
+
+    def close(self) -> None:
+        for channel in self.channels:
+            channel.close()
@@ -23,37 +23,60 @@
 
 import typing
 
-import grpc
-from google.protobuf.struct_pb2 import Struct
-
 from openfeature.evaluation_context import EvaluationContext
-from openfeature.exception import (
-    FlagNotFoundError,
-    GeneralError,
-    InvalidContextError,
-    ParseError,
-    TypeMismatchError,
-)
 from openfeature.flag_evaluation import FlagResolutionDetails
 from openfeature.provider.metadata import Metadata
 from openfeature.provider.provider import AbstractProvider
 
-from .config import Config
+from .config import (
+    CacheType,
+    ChannelSelection,
+    Config,
+    ResolverType,
+    SyncProtocol,
+)
 from .flag_type import FlagType
-from .proto.schema.v1 import schema_pb2, schema_pb2_grpc
-
-T = typing.TypeVar("T")
+from .resolvers import AbstractResolver, GrpcResolver, InProcessResolver
+from .snapshot import FlagSnapshot, active_snapshot
 
 
 class FlagdProvider(AbstractProvider):
     """Flagd OpenFeature Provider"""
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         host: typing.Optional[str] = None,
         port: typing.Optional[int] = None,
         tls: typing.Optional[bool] = None,
         timeout: typing.Optional[int] = None,
+        cache_type: typing.Optional[CacheType] = None,
+        max_cache_size: typing.Optional[int] = None,
+        resolver_type: typing.Optional[ResolverType] = None,
+        selector: typing.Optional[str] = None,
+        coalesce_requests: typing.Optional[bool] = None,
+        batch_window_ms: typing.Optional[int] = None,
+        batch_max_size: typing.Optional[int] = None,
+        channel_pool_size: typing.Optional[int] = None,
+        channel_selection: typing.Optional[ChannelSelection] = None,
+        keepalive_time_ms: typing.Optional[int] = None,
+        keepalive_timeout_ms: typing.Optional[int] = None,
+        socket_path: typing.Optional[str] = None,
+        warm_up: typing.Optional[bool] = None,
+        snapshot_path: typing.Optional[str] = None,
+        snapshot_interval_ms: typing.Optional[int] = None,
+        offline_flag_source_path: typing.Optional[str] = None,
+        offline_poll_interval_ms: typing.Optional[int] = None,
+        sync_protocol: typing.Optional[SyncProtocol] = None,
+        retry_backoff_ms: typing.Optional[int] = None,
+        retry_backoff_max_ms: typing.Optional[int] = None,
+        max_staleness_ms: typing.Optional[int] = None,
+        max_stale_entries: typing.Optional[int] = None,
+        refresh_after_ms: typing.Optional[int] = None,
+        hedge_requests: typing.Optional[bool] = None,
+        circuit_breaker: typing.Optional[bool] = None,
+        circuit_breaker_failure_rate: typing.Optional[float] = None,
+        circuit_breaker_slow_call_ms: typing.Optional[int] = None,
+        circuit_breaker_open_ms: typing.Optional[int] = None,
     ):
         """
         Create an instance of the FlagdProvider
@@ -62,32 +85,149 @@ class FlagdProvider(AbstractProvider):
         :param port: the port the flagd service is available on
         :param tls: enable/disable secure TLS connectivity
         :param timeout: the maximum to wait before a request times out
+        :param cache_type: enable/disable caching of STATIC resolutions
+        :param max_cache_size: the maximum number of cached resolutions
+        :param resolver_type: resolve flags remotely (grpc) or locally (in-process)
+        :param selector: the flag source selector used by the in-process resolver
+        :param coalesce_requests: share one RPC between concurrent identical
+            resolutions
+        :param batch_window_ms: collect resolutions for this many milliseconds
+            and resolve them in batched ResolveAll calls, 0 disables batching
+        :param batch_max_size: dispatch a batch early once it holds this many
+            resolutions
+        :param channel_pool_size: the number of channels, each with its own
+            connection, that remote resolutions are spread over
+        :param channel_selection: how a channel of the pool is picked per call
+        :param keepalive_time_ms: interval of HTTP/2 keepalive pings
+        :param keepalive_timeout_ms: how long to wait for a keepalive ping to
+            be acknowledged before closing the connection
+        :param socket_path: connect through this unix domain socket instead of
+            host and port
+        :param warm_up: return from initialize at once and connect in the
+            background, serving default values until flagd was reached
+        :param snapshot_path: persist the flag configuration of the in-process
+            resolver to this file, and start from it before flagd is reached
+        :param snapshot_interval_ms: how long changes of the flag configuration
+            are collected before the snapshot file is written again
+        :param offline_flag_source_path: evaluate the flags of this flag
+            configuration file in-process, without connecting to flagd
+        :param offline_poll_interval_ms: how often the flag configuration file
+            is checked for changes
+        :param sync_protocol: the flagd sync service the in-process resolver
+            streams the flag configuration from
+        :param retry_backoff_ms: the initial delay before reconnecting a lost
+            stream to flagd, doubled on every failed attempt
+        :param retry_backoff_max_ms: the maximum delay before reconnecting
+        :param max_staleness_ms: serve the last resolution of a flag for an
+            evaluation context for up to this long while it is refreshed in the
+            background, 0 disables serving last known good resolutions
+        :param max_stale_entries: the maximum number of last known good
+            resolutions kept
+        :param refresh_after_ms: only ask flagd again for last known good
+            resolutions older than this, younger ones are served as they are
+        :param hedge_requests: send a second request on another channel of the
+            pool when flagd did not answer within the 95th percentile of recent
+            latencies, and use whichever answer comes first
+        :param circuit_breaker: stop calling flagd while most recent calls fail
+            or are slow, failing resolutions right away instead
+        :param circuit_breaker_failure_rate: the share of failed or slow calls
+            among recent calls at which the circuit breaker opens
+        :param circuit_breaker_slow_call_ms: calls taking at least this long
+            count as slow
+        :param circuit_breaker_open_ms: how long the circuit breaker stays open
+            before a single call probes whether flagd recovered
         """
         self.config = Config(
             host=host,
             port=port,
             tls=tls,
             timeout=timeout,
+            cache_type=cache_type,
+            max_cache_size=max_cache_size,
+            resolver_type=resolver_type,
+            selector=selector,
+            coalesce_requests=coalesce_requests,
+            batch_window_ms=batch_window_ms,
+            batch_max_size=batch_max_size,
+            channel_pool_size=channel_pool_size,
+            channel_selection=channel_selection,
+            keepalive_time_ms=keepalive_time_ms,
+            keepalive_timeout_ms=keepalive_timeout_ms,
+            socket_path=socket_path,
+            warm_up=warm_up,
+            snapshot_path=snapshot_path,
+            snapshot_interval_ms=snapshot_interval_ms,
+            offline_flag_source_path=offline_flag_source_path,
+            offline_poll_interval_ms=offline_poll_interval_ms,
+            sync_protocol=sync_protocol,
+            retry_backoff_ms=retry_backoff_ms,
+            retry_backoff_max_ms=retry_backoff_max_ms,
+            max_staleness_ms=max_staleness_ms,
+            max_stale_entries=max_stale_entries,
+            refresh_after_ms=refresh_after_ms,
+            hedge_requests=hedge_requests,
+            circuit_breaker=circuit_breaker,
+            circuit_breaker_failure_rate=circuit_breaker_failure_rate,
+            circuit_breaker_slow_call_ms=circuit_breaker_slow_call_ms,
+            circuit_breaker_open_ms=circuit_breaker_open_ms,
         )
+        self.resolver = self.setup_resolver()
+
+    def setup_resolver(self) -> AbstractResolver:
+        if self.config.resolver_type == ResolverType.GRPC:
+            return GrpcResolver(
+                self.config,
+                emit_provider_ready=self.emit_provider_ready,
+                emit_provider_configuration_changed=self.emit_provider_configuration_changed,
+                emit_provider_error=self.emit_provider_error,
+                emit_provider_stale=self.emit_provider_stale,
+            )
+        elif self.config.resolver_type == ResolverType.IN_PROCESS:
+            return InProcessResolver(
+                self.config,
+                self.emit_provider_ready,
+                self.emit_provider_configuration_changed,
+                self.emit_provider_error,
+            )
+        raise ValueError(f"Unknown resolver type: {self.config.resolver_type}")
 
-        channel_factory = grpc.secure_channel if tls else grpc.insecure_channel
-        self.channel = channel_factory(f"{self.config.host}:{self.config.port}")
-        self.stub = schema_pb2_grpc.ServiceStub(self.channel)
+    def initialize(self, evaluation_context: EvaluationContext) -> None:
+        self.resolver.initialize(evaluation_context)
 
     def shutdown(self) -> None:
-        self.channel.close()
+        self.resolver.shutdown()
 
     def get_metadata(self) -> Metadata:
         """Returns provider metadata"""
         return Metadata(name="FlagdProvider")
 
+    def resolve_all(
+        self, evaluation_context: typing.Optional[EvaluationContext] = None
+    ) -> FlagSnapshot:
+        """
+        Resolves every flag for the evaluation context in a single call
+
+        Within a ``with snapshot:`` block, flag evaluations for the same
+        evaluation context are served from the returned snapshot.
+        """
+        return FlagSnapshot(
+            self, evaluation_context, self.resolver.resolve_all(evaluation_context)
+        )
+
     def resolve_boolean_details(
         self,
         key: str,
         default_value: bool,
         evaluation_context: typing.Optional[EvaluationContext] = None,
     ) -> FlagResolutionDetails[bool]:
-        return self._resolve(key, FlagType.BOOLEAN, default_value, evaluation_context)
+        snapshot = active_snapshot(self)
+        if snapshot is not None:
+            details = snapshot.get(key, FlagType.BOOLEAN, evaluation_context)
+            if details is not None:
+                return details
+        return self.resolver.resolve_boolean_details(
+            key, default_value, evaluation_context
+        )
 
     def resolve_string_details(
         self,
@@ -95,7 +235,14 @@ class FlagdProvider(AbstractProvider):
         default_value: str,
         evaluation_context: typing.Optional[EvaluationContext] = None,
     ) -> FlagResolutionDetails[str]:
-        return self._resolve(key, FlagType.STRING, default_value, evaluation_context)
+        snapshot = active_snapshot(self)
+        if snapshot is not None:
+            details = snapshot.get(key, FlagType.STRING, evaluation_context)
+            if details is not None:
+                return details
+        return self.resolver.resolve_string_details(
+            key, default_value, evaluation_context
+        )
 
     def resolve_float_details(
         self,
@@ -103,7 +250,14 @@ class FlagdProvider(AbstractProvider):
         default_value: float,
         evaluation_context: typing.Optional[EvaluationContext] = None,
     ) -> FlagResolutionDetails[float]:
-        return self._resolve(key, FlagType.FLOAT, default_value, evaluation_context)
+        snapshot = active_snapshot(self)
+        if snapshot is not None:
+            details = snapshot.get(key, FlagType.FLOAT, evaluation_context)
+            if details is not None:
+                return details
+        return self.resolver.resolve_float_details(
+            key, default_value, evaluation_context
+        )
 
     def resolve_integer_details(
         self,
@@ -111,7 +265,14 @@ class FlagdProvider(AbstractProvider):
         default_value: int,
         evaluation_context: typing.Optional[EvaluationContext] = None,
     ) -> FlagResolutionDetails[int]:
-        return self._resolve(key, FlagType.INTEGER, default_value, evaluation_context)
+        snapshot = active_snapshot(self)
+        if snapshot is not None:
+            details = snapshot.get(key, FlagType.INTEGER, evaluation_context)
+            if details is not None:
+                return details
+        return self.resolver.resolve_integer_details(
+            key, default_value, evaluation_context
+        )
 
     def resolve_object_details(
         self,
@@ -119,76 +280,11 @@ class FlagdProvider(AbstractProvider):
         default_value: typing.Union[dict, list],
         evaluation_context: typing.Optional[EvaluationContext] = None,
     ) -> FlagResolutionDetails[typing.Union[dict, list]]:
-        return self._resolve(key, FlagType.OBJECT, default_value, evaluation_context)
-
-    def _resolve(
-        self,
-        flag_key: str,
-        flag_type: FlagType,
-        default_value: T,
-        evaluation_context: typing.Optional[EvaluationContext],
-    ) -> FlagResolutionDetails[T]:
-        context = self._convert_context(evaluation_context)
-        call_args = {"timeout": self.config.timeout}
-        try:
-            if flag_type == FlagType.BOOLEAN:
-                request = schema_pb2.ResolveBooleanRequest(  # type:ignore[attr-defined]
-                    flag_key=flag_key, context=context
-                )
-                response = self.stub.ResolveBoolean(request, **call_args)
-            elif flag_type == FlagType.STRING:
-                request = schema_pb2.ResolveStringRequest(  # type:ignore[attr-defined]
-                    flag_key=flag_key, context=context
-                )
-                response = self.stub.ResolveString(request, **call_args)
-            elif flag_type == FlagType.OBJECT:
-                request = schema_pb2.ResolveObjectRequest(  # type:ignore[attr-defined]
-                    flag_key=flag_key, context=context
-                )
-                response = self.stub.ResolveObject(request, **call_args)
-            elif flag_type == FlagType.FLOAT:
-                request = schema_pb2.ResolveFloatRequest(  # type:ignore[attr-defined]
-                    flag_key=flag_key, context=context
-                )
-                response = self.stub.ResolveFloat(request, **call_args)
-            elif flag_type == FlagType.INTEGER:
-                request = schema_pb2.ResolveIntRequest(  # type:ignore[attr-defined]
-                    flag_key=flag_key, context=context
-                )
-                response = self.stub.ResolveInt(request, **call_args)
-            else:
-                raise ValueError(f"Unknown flag type: {flag_type}")
-
-        except grpc.RpcError as e:
-            code = e.code()
-            message = f"received grpc status code {code}"
-
-            if code == grpc.StatusCode.NOT_FOUND:
-                raise FlagNotFoundError(message) from e
-            elif code == grpc.StatusCode.INVALID_ARGUMENT:
-                raise TypeMismatchError(message) from e
-            elif code == grpc.StatusCode.DATA_LOSS:
-                raise ParseError(message) from e
-            raise GeneralError(message) from e
-
-        # Got a valid flag and valid type. Return it.
-        return FlagResolutionDetails(
-            value=response.value,
-            reason=response.reason,
-            variant=response.variant,
+        snapshot = active_snapshot(self)
+        if snapshot is not None:
+            details = snapshot.get(key, FlagType.OBJECT, evaluation_context)
+            if details is not None:
+                return details
+        return self.resolver.resolve_object_details(
+            key, default_value, evaluation_context
         )
-
-    def _convert_context(
-        self, evaluation_context: typing.Optional[EvaluationContext]
-    ) -> Struct:
-        s = Struct()
-        if evaluation_context:
-            try:
-                s["targetingKey"] = evaluation_context.targeting_key
-                s.update(evaluation_context.attributes)
-            except ValueError as exc:
-                message = (
-                    "could not serialize evaluation context to google.protobuf.Struct"
-                )
-                raise InvalidContextError(message) from exc
-        return s
@@ -0,0 +1,5 @@
+from .grpc import GrpcResolver
+from .in_process import InProcessResolver
+from .protocol import AbstractResolver
+
+__all__ = ["AbstractResolver", "GrpcResolver", "InProcessResolver"]
@@ -0,0 +1,885 @@
+import dataclasses
+import logging
+import queue
+import threading
+import time
+import typing
+
+import grpc
+from google.protobuf.json_format import MessageToDict
+from google.protobuf.struct_pb2 import Struct
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEventDetails
+from openfeature.exception import (
+    FlagNotFoundError,
+    GeneralError,
+    OpenFeatureError,
+    ParseError,
+    ProviderNotReadyError,
+    TypeMismatchError,
+)
+from openfeature.flag_evaluation import FlagResolutionDetails, Reason
+
+from ..backoff import Backoff
+from ..batching import BatchDispatcher
+from ..cache import LRUCache
+from ..channel import create_channel_pool
+from ..circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+from ..config import CacheType, Config
+from ..context import ContextSerializer
+from ..deadline import remaining_timeout
+from ..flag_type import FlagType, check_type, resolvable_types
+from ..fork import register_fork_handler
+from ..latency import LatencyWindow
+from ..pool import ChannelPool
+from ..proto.schema.v1 import schema_pb2, schema_pb2_grpc
+from ..singleflight import SingleFlight
+from ..wire import RESOLVE_METHODS, encode_resolve_request, raw_method
+from .protocol import EmitEvent
+
+logger = logging.getLogger("openfeature.contrib")
+
+# flag key, flag type and the serialized evaluation context
+ResolutionKey = typing.Tuple[str, FlagType, bytes]
+
+# the status codes of calls which did not reach flagd
+UNANSWERED_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.CANCELLED,
+)
+# the OpenFeature reason of values served by a stale provider, which the SDK's
+# Reason enum does not have yet
+STALE_REASON = "STALE"
+# the OpenFeature reason of default values served while the circuit breaker is
+# open, so that they can be told apart from those of a provider not ready yet
+CIRCUIT_OPEN_REASON = "CIRCUIT_OPEN"
+# the percentile of recent latencies after which a hedged request is sent
+HEDGE_PERCENTILE = 0.95
+
+
+def to_openfeature_error(error: grpc.RpcError) -> OpenFeatureError:
+    code = error.code()
+    message = f"received grpc status code {code}"
+
+    if code == grpc.StatusCode.NOT_FOUND:
+        return FlagNotFoundError(message)
+    elif code == grpc.StatusCode.INVALID_ARGUMENT:
+        return TypeMismatchError(message)
+    elif code == grpc.StatusCode.DATA_LOSS:
+        return ParseError(message)
+    return GeneralError(message)
+
+
+def flag_key_of(key: ResolutionKey) -> str:
+    return key[0]
+
+
+def to_details(
+    method: "FlagMethod", response: typing.Any
+) -> FlagResolutionDetails[typing.Any]:
+    """Converts the response of a single flag resolution"""
+    value = response.value
+    return FlagResolutionDetails(
+        value=value if method.convert is None else method.convert(value),
+        reason=response.reason,
+        variant=response.variant,
+    )
+
+
+def changed_flag_keys(data: Struct) -> typing.Optional[typing.List[str]]:
+    """
+    Returns the keys of the flags listed in the data of a configuration_change
+    event, or None when flagd did not say which flags changed
+    """
+    flags = data.fields.get("flags")
+    if flags is None or flags.WhichOneof("kind") != "struct_value":
+        return None
+    return sorted(flags.struct_value.fields)
+
+
+def to_python_value(value: typing.Any) -> typing.Any:
+    """Converts protobuf object values into the dicts expected by OpenFeature"""
+    if isinstance(value, Struct):
+        return MessageToDict(value)
+    return value
+
+
+def to_resolution_details(
+    response: typing.Any,
+) -> typing.Dict[str, FlagResolutionDetails]:
+    """Converts a ResolveAllResponse into the resolution of each flag"""
+    return {
+        key: FlagResolutionDetails(
+            value=to_python_value(getattr(flag, flag.WhichOneof("value"))),
+            reason=flag.reason,
+            variant=flag.variant,
+        )
+        for key, flag in response.flags.items()
+        if flag.WhichOneof("value") is not None
+    }
+
+
+class LastKnownGood(typing.NamedTuple):
+    """The last successful resolution of a flag for an evaluation context"""
+
+    details: FlagResolutionDetails
+    resolved_at: float
+
+
+class FlagMethod(typing.NamedTuple):
+    """How flags of one type are resolved"""
+
+    flag_type: FlagType
+    # unary calls taking a request encoded by encode_resolve_request, one for
+    # each channel of the pool
+    calls: typing.List[grpc.UnaryUnaryMultiCallable]
+    # converts the protobuf value of a response, if needed
+    convert: typing.Optional[typing.Callable[[typing.Any], typing.Any]]
+
+
+def remember(
+    last_known_good: LRUCache[ResolutionKey, LastKnownGood],
+    key: ResolutionKey,
+    details: FlagResolutionDetails[typing.Any],
+    generation: int,
+) -> None:
+    last_known_good.put(
+        key,
+        LastKnownGood(
+            dataclasses.replace(details, reason=Reason.CACHED), time.monotonic()
+        ),
+        generation,
+    )
+
+
+class GrpcResolver:
+    """Resolves flags remotely through flagd's evaluation service"""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        config: Config,
+        channel: typing.Optional[grpc.Channel] = None,
+        emit_provider_ready: typing.Optional[EmitEvent] = None,
+        emit_provider_configuration_changed: typing.Optional[EmitEvent] = None,
+        emit_provider_error: typing.Optional[EmitEvent] = None,
+        emit_provider_stale: typing.Optional[EmitEvent] = None,
+    ):
+        self.config = config
+        self._channel = channel
+        self.emit_provider_ready = emit_provider_ready
+        self.emit_provider_configuration_changed = emit_provider_configuration_changed
+        self.emit_provider_error = emit_provider_error
+        self.emit_provider_stale = emit_provider_stale
+        # the resolution of each flag type, picked by resolve_*_details so no
+        # per-call dispatch on the flag type is needed. Their calls are added
+        # once the resolver connects.
+        methods = {
+            flag_type: FlagMethod(
+                flag_type, [], MessageToDict if flag_type == FlagType.OBJECT else None
+            )
+            for flag_type in RESOLVE_METHODS
+        }
+        self.boolean_method = methods[FlagType.BOOLEAN]
+        self.string_method = methods[FlagType.STRING]
+        self.float_method = methods[FlagType.FLOAT]
+        self.integer_method = methods[FlagType.INTEGER]
+        self.object_method = methods[FlagType.OBJECT]
+
+        # channels are only opened on first use, so that a resolver created
+        # before a process forks does not leave connections to its children
+        self._connected = False
+        self._connect_lock = threading.Lock()
+        # set while connecting in the background, resolutions then fail fast
+        # so that the SDK serves their default values
+        self._warming = False
+        # set once initialized: the event stream is opened along with the
+        # channels, so that initializing does not connect before a fork either
+        self._listening = False
+        self._setup()
+        register_fork_handler(self)
+
+    def _setup(self) -> None:
+        self.context_serializer = ContextSerializer()
+        self.cache: typing.Optional[LRUCache[ResolutionKey, FlagResolutionDetails]] = (
+            LRUCache(self.config.max_cache_size, group_of=flag_key_of)
+            if self.config.cache_type == CacheType.LRU
+            else None
+        )
+        self.single_flight: typing.Optional[
+            SingleFlight[ResolutionKey, FlagResolutionDetails]
+        ] = SingleFlight() if self.config.coalesce_requests else None
+        # resolutions served while they are refreshed in the background
+        self.last_known_good: typing.Optional[
+            LRUCache[ResolutionKey, LastKnownGood]
+        ] = (
+            LRUCache(self.config.max_stale_entries, group_of=flag_key_of)
+            if self.config.max_staleness_ms > 0
+            else None
+        )
+        self._revalidating: typing.Set[ResolutionKey] = set()
+        # recent latencies of single resolutions, from which the delay before
+        # a hedged request is derived
+        self.latencies: typing.Optional[LatencyWindow] = (
+            LatencyWindow(HEDGE_PERCENTILE) if self.config.hedge_requests else None
+        )
+        self._revalidating_lock = threading.Lock()
+        self.circuit_breaker: typing.Optional[CircuitBreaker] = None
+        if self.config.circuit_breaker:
+            self.circuit_breaker = CircuitBreaker(
+                self.config.circuit_breaker_failure_rate,
+                slow_call=self.config.circuit_breaker_slow_call_ms / 1000,
+                open_duration=self.config.circuit_breaker_open_ms / 1000,
+                on_state_change=self._circuit_changed,
+            )
+        self.dispatcher: typing.Optional[BatchDispatcher] = None
+        if self.config.batch_window_ms > 0:
+            self.dispatcher = BatchDispatcher(
+                self._resolve_all_future,
+                to_resolution_details,
+                to_openfeature_error,
+                window=self.config.batch_window_ms / 1000,
+                max_size=self.config.batch_max_size,
+            )
+        # whether resolutions go straight to flagd unless the cache is active
+        self._uncached = (
+            self.last_known_good is None
+            and self.single_flight is None
+            and self.dispatcher is None
+        )
+        # resolutions are only cached while the event stream is connected, as
+        # that is the only way of learning that a cached value became stale
+        self._cache_active = False
+        self._event_call: typing.Optional[grpc.Future] = None
+        self._event_thread: typing.Optional[threading.Thread] = None
+        # set once the event stream activated the cache, or on shutdown, which
+        # ends the warm-up's wait for it
+        self._event_stream_ready = threading.Event()
+        self._warm_up_thread: typing.Optional[threading.Thread] = None
+        self._warm_up_calls: typing.List[grpc.Future] = []
+        self._stopped = threading.Event()
+        # set in a forked child process until the resolver was rebuilt there
+        self._forked = False
+
+    def _connect(self) -> None:
+        with self._connect_lock:
+            if self._connected:
+                return
+            if self._forked:
+                # the channels, caches and threads inherited from the parent
+                # cannot be used, nor even closed, in the child
+                self._setup()
+
+            self.pool = (
+                create_channel_pool(self.config)
+                if self._channel is None
+                else ChannelPool([self._channel], self.config.channel_selection)
+            )
+            self.stubs = [schema_pb2_grpc.ServiceStub(c) for c in self.pool.channels]
+            self.stub = self.stubs[0]
+            for flag_method in (
+                self.boolean_method,
+                self.string_method,
+                self.float_method,
+                self.integer_method,
+                self.object_method,
+            ):
+                method, response_type = RESOLVE_METHODS[flag_method.flag_type]
+                flag_method.calls[:] = [
+                    raw_method(c, method, response_type) for c in self.pool.channels
+                ]
+            self._connected = True
+        if self._listening:
+            self._start_event_stream()
+
+    def after_fork_in_child(self) -> None:
+        self._connect_lock = threading.Lock()
+        self._channel = None
+        self._connected = False
+        self._forked = True
+        # the warm-up thread did not survive the fork, a child connects on
+        # first use instead
+        self._warming = False
+
+    def initialize(self, evaluation_context: EvaluationContext) -> None:
+        self._listening = True
+        if self._connected:
+            self._start_event_stream()
+        if self.config.warm_up and self._warm_up_thread is None:
+            self._warming = True
+            self._warm_up_thread = threading.Thread(
+                target=self._warm_up,
+                args=(evaluation_context,),
+                name="FlagdWarmUp",
+                daemon=True,
+            )
+            self._warm_up_thread.start()
+
+    def _warm_up(self, evaluation_context: EvaluationContext) -> None:
+        """
+        Connects every channel of the pool and prefetches the flags for the
+        evaluation context the provider was initialized with into the cache and
+        the last known good resolutions. The SDK reported the provider ready
+        when initialize returned, so the end of the warm-up is announced as a
+        configuration change instead.
+        """
+        self._connect()
+        if self.cache is not None:
+            # flags are only cached while the event stream tells of changes
+            self._event_stream_ready.wait(self.config.timeout)
+        context, context_data = self.context_serializer.serialize(evaluation_context)
+        backoff = Backoff(
+            self.config.retry_backoff_ms / 1000,
+            self.config.retry_backoff_max_ms / 1000,
+        )
+        while not self._stopped.is_set():
+            cache = self.cache if self._cache_active else None
+            cache_generation = 0 if cache is None else cache.generation
+            last_known_good_generation = (
+                0 if self.last_known_good is None else self.last_known_good.generation
+            )
+            try:
+                flags = self._prefetch(context)
+            except grpc.FutureCancelledError:
+                return
+            except grpc.RpcError as e:
+                if not self._stopped.is_set():
+                    logger.warning(f"flagd warm-up failed: {e.code()}")
+                    self._stopped.wait(backoff.next())
+                continue
+            for flag_key, details in flags.items():
+                self._store_prefetched(
+                    (flag_key, context_data),
+                    details,
+                    cache,
+                    cache_generation,
+                    last_known_good_generation,
+                )
+            self._warming = False
+            self._emit(
+                self.emit_provider_configuration_changed,
+                ProviderEventDetails(
+                    message="connected to flagd", flags_changed=sorted(flags)
+                ),
+            )
+            return
+
+    def _prefetch(self, context: Struct) -> typing.Dict[str, FlagResolutionDetails]:
+        """
+        Resolves every flag on each channel of the pool, waiting for the
+        channels to connect. Raises the error of a call flagd did not answer.
+        A flagd answering with an error, e.g. as it lacks ResolveAll, is
+        reached all the same, and no flags are prefetched from it.
+        """
+        request = schema_pb2.ResolveAllRequest(context=context)  # type:ignore[attr-defined]
+        calls = self._warm_up_calls = [
+            stub.ResolveAll.future(
+                request, timeout=self.config.timeout, wait_for_ready=True
+            )
+            for stub in self.stubs
+        ]
+        flags: typing.Dict[str, FlagResolutionDetails] = {}
+        try:
+            if self._stopped.is_set():
+                # shutdown ran before there were calls to cancel
+                raise grpc.FutureCancelledError()
+            for call in calls:
+                error = call.exception()
+                if error is None:
+                    flags = to_resolution_details(call.result())
+                elif error.code() in UNANSWERED_CODES:
+                    raise error
+        finally:
+            for call in calls:
+                call.cancel()
+            self._warm_up_calls = []
+        return flags
+
+    def _store_prefetched(
+        self,
+        key: typing.Tuple[str, bytes],
+        details: FlagResolutionDetails,
+        cache: typing.Optional[LRUCache[ResolutionKey, FlagResolutionDetails]],
+        cache_generation: int,
+        last_known_good_generation: int,
+    ) -> None:
+        """
+        Stores a prefetched resolution for every type the flag can be resolved
+        as, since ResolveAll does not tell integers from floats
+        """
+        flag_key, context_data = key
+        for flag_type in resolvable_types(details.value):
+            value = check_type(flag_key, flag_type, details.value)
+            typed = dataclasses.replace(details, value=value)
+            resolution_key = (flag_key, flag_type, context_data)
+            if cache is not None and details.reason == Reason.STATIC:
+                cache.put(resolution_key, typed, cache_generation)
+            if self.last_known_good is not None:
+                remember(
+                    self.last_known_good,
+                    resolution_key,
+                    typed,
+                    last_known_good_generation,
+                )
+
+    def _emit(
+        self, emit_event: typing.Optional[EmitEvent], details: ProviderEventDetails
+    ) -> None:
+        if emit_event is not None:
+            emit_event(details)
+
+    def _circuit_changed(self, state: CircuitState) -> None:
+        details = ProviderEventDetails(
+            message=f"the circuit breaker in front of flagd is {state.value}",
+            metadata={"circuit_breaker": state.value},
+        )
+        if state == CircuitState.CLOSED:
+            self._emit(self.emit_provider_ready, details)
+        else:
+            # resolutions keep failing while a single call probes flagd
+            self._emit(self.emit_provider_error, details)
+
+    def _circuit_allows(self) -> bool:
+        return self.circuit_breaker is None or self.circuit_breaker.allow()
+
+    def _check_circuit(self) -> None:
+        if not self._circuit_allows():
+            raise CircuitOpenError()
+
+    def _record_call(
+        self,
+        started: float,
+        error: typing.Optional[grpc.RpcError] = None,
+        timeout: typing.Optional[float] = None,
+    ) -> None:
+        """
+        Records the outcome of a call to flagd with the circuit breaker. The
+        call was given ``timeout`` seconds, the configured timeout by default.
+        """
+        circuit_breaker = self.circuit_breaker
+        if circuit_breaker is None:
+            return
+        if error is None or not isinstance(to_openfeature_error(error), GeneralError):
+            # flagd answered, even if only to tell that the flag is unknown
+            circuit_breaker.record_call(time.monotonic() - started)
+            return
+        code = error.code()
+        if code == grpc.StatusCode.CANCELLED:
+            return
+        if (
+            code == grpc.StatusCode.DEADLINE_EXCEEDED
+            and timeout is not None
+            and timeout < self.config.timeout
+        ):
+            # the caller's deadline ran out before flagd's time to answer did
+            return
+        circuit_breaker.record_failure()
+
+    def _start_event_stream(self) -> None:
+        with self._connect_lock:
+            if self._event_thread is None and not self._stopped.is_set():
+                self._event_thread = threading.Thread(
+                    target=self._listen_events, name="FlagdEventStream", daemon=True
+                )
+                self._event_thread.start()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        if self._forked:
+            # the channels and threads belong to the parent process
+            return
+        self._event_stream_ready.set()
+        for call in self._warm_up_calls:
+            call.cancel()
+        if self._warm_up_thread is not None:
+            self._warm_up_thread.join(timeout=self.config.timeout)
+            self._warm_up_thread = None
+        if self.dispatcher is not None:
+            self.dispatcher.shutdown()
+        if self._event_call is not None:
+            self._event_call.cancel()
+        if self._event_thread is not None:
+            self._event_thread.join(timeout=self.config.timeout)
+            self._event_thread = None
+        if self._connected:
+            self.pool.close()
+
+    def resolve_boolean_details(
+        self,
+        key: str,
+        default_value: bool,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[bool]:
+        return self._resolve(
+            key, self.boolean_method, default_value, evaluation_context
+        )
+
+    def resolve_string_details(
+        self,
+        key: str,
+        default_value: str,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[str]:
+        return self._resolve(key, self.string_method, default_value, evaluation_context)
+
+    def resolve_float_details(
+        self,
+        key: str,
+        default_value: float,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[float]:
+        return self._resolve(key, self.float_method, default_value, evaluation_context)
+
+    def resolve_integer_details(
+        self,
+        key: str,
+        default_value: int,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[int]:
+        return self._resolve(
+            key, self.integer_method, default_value, evaluation_context
+        )
+
+    def resolve_object_details(
+        self,
+        key: str,
+        default_value: typing.Union[dict, list],
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[typing.Union[dict, list]]:
+        return self._resolve(key, self.object_method, default_value, evaluation_context)
+
+    def resolve_all(
+        self, evaluation_context: typing.Optional[EvaluationContext] = None
+    ) -> typing.Dict[str, FlagResolutionDetails]:
+        if self._warming:
+            raise ProviderNotReadyError("the connection to flagd is warming up")
+        return self._resolve_all(evaluation_context)
+
+    def _resolve_all(
+        self, evaluation_context: typing.Optional[EvaluationContext]
+    ) -> typing.Dict[str, FlagResolutionDetails]:
+        if not self._connected:
+            self._connect()
+        request = schema_pb2.ResolveAllRequest(  # type:ignore[attr-defined]
+            context=self.context_serializer.serialize(evaluation_context).struct
+        )
+        timeout = remaining_timeout(self.config.timeout)
+        self._check_circuit()
+        index = self.pool.acquire()
+        started = time.monotonic()
+        try:
+            response = self.stubs[index].ResolveAll(request, timeout=timeout)
+        except grpc.RpcError as e:
+            self._record_call(started, e, timeout)
+            raise to_openfeature_error(e) from e
+        finally:
+            self.pool.release(index)
+        self._record_call(started)
+        return to_resolution_details(response)
+
+    def _resolve_all_future(self, context: Struct) -> grpc.Future:
+        index = self.pool.acquire()
+        started = time.monotonic()
+        future = self.stubs[index].ResolveAll.future(
+            schema_pb2.ResolveAllRequest(context=context),  # type:ignore[attr-defined]
+            timeout=self.config.timeout,
+        )
+
+        def done(future: grpc.Future) -> None:
+            self.pool.release(index)
+            if not future.cancelled():
+                self._record_call(started, future.exception())
+
+        future.add_done_callback(done)
+        return future
+
+    def _resolve(
+        self,
+        flag_key: str,
+        method: FlagMethod,
+        default_value: typing.Any,
+        evaluation_context: typing.Optional[EvaluationContext],
+    ) -> FlagResolutionDetails[typing.Any]:
+        try:
+            return self._resolve_flag(flag_key, method, evaluation_context)
+        except CircuitOpenError:
+            return FlagResolutionDetails(default_value, reason=CIRCUIT_OPEN_REASON)
+
+    def _resolve_flag(
+        self,
+        flag_key: str,
+        method: FlagMethod,
+        evaluation_context: typing.Optional[EvaluationContext],
+    ) -> FlagResolutionDetails[typing.Any]:
+        if self._warming:
+            raise ProviderNotReadyError("the connection to flagd is warming up")
+        if not self._connected:
+            self._connect()
+        context, context_data = self.context_serializer.serialize(evaluation_context)
+        cache = self.cache if self._cache_active else None
+        last_known_good = self.last_known_good
+        if cache is None and self._uncached:
+            self._check_circuit()
+            return self._resolve_remote(flag_key, method, context_data)
+
+        key = (flag_key, method.flag_type, context_data)
+        generation = 0
+        if cache is not None:
+            generation = cache.generation
+            cached = cache.get(key)
+            if cached is not None:
+                return dataclasses.replace(cached, reason=Reason.CACHED)
+        last_known_good_generation = 0
+        if last_known_good is not None:
+            last_known_good_generation = last_known_good.generation
+            served = self._serve_last_known_good(last_known_good, key, method)
+            if served is not None:
+                return served
+
+        details = self._fetch_shared(key, method, context)
+        if cache is not None and details.reason == Reason.STATIC:
+            cache.put(key, details, generation)
+        if last_known_good is not None:
+            remember(last_known_good, key, details, last_known_good_generation)
+        return details
+
+    def _serve_last_known_good(
+        self,
+        last_known_good: LRUCache[ResolutionKey, LastKnownGood],
+        key: ResolutionKey,
+        method: FlagMethod,
+    ) -> typing.Optional[FlagResolutionDetails[typing.Any]]:
+        entry = last_known_good.get(key)
+        if entry is None:
+            return None
+        age = time.monotonic() - entry.resolved_at
+        if age > self.config.max_staleness_ms / 1000:
+            # too old to be served, resolving it has to wait for flagd
+            return None
+        if age >= self.config.refresh_after_ms / 1000:
+            self._revalidate(key, method)
+        return entry.details
+
+    def _revalidate(self, key: ResolutionKey, method: FlagMethod) -> None:
+        """Refreshes a last known good resolution without waiting for flagd"""
+        last_known_good = self.last_known_good
+        if last_known_good is None:
+            return
+        with self._revalidating_lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+        if not self._circuit_allows():
+            # the entry keeps being served, flagd is not asked until it recovers
+            with self._revalidating_lock:
+                self._revalidating.discard(key)
+            return
+        generation = last_known_good.generation
+        flag_key, _, context_data = key
+        index = self.pool.acquire()
+        started = time.monotonic()
+        future = method.calls[index].future(
+            encode_resolve_request(flag_key, context_data),
+            timeout=self.config.timeout,
+        )
+
+        def revalidated(future: grpc.Future) -> None:
+            self.pool.release(index)
+            with self._revalidating_lock:
+                self._revalidating.discard(key)
+            self._revalidated(last_known_good, key, method, future, started, generation)
+
+        future.add_done_callback(revalidated)
+
+    def _revalidated(  # noqa: PLR0913
+        self,
+        last_known_good: LRUCache[ResolutionKey, LastKnownGood],
+        key: ResolutionKey,
+        method: FlagMethod,
+        future: grpc.Future,
+        started: float,
+        generation: int,
+    ) -> None:
+        try:
+            response = future.result()
+        except grpc.RpcError as e:
+            self._record_call(started, e)
+            if e.code() == grpc.StatusCode.CANCELLED:
+                return
+            if isinstance(to_openfeature_error(e), GeneralError):
+                # flagd is unavailable, the entry is served until it expires
+                entry = last_known_good.get(key)
+                if entry is not None:
+                    stale = dataclasses.replace(entry.details, reason=STALE_REASON)
+                    last_known_good.put(key, entry._replace(details=stale), generation)
+            else:
+                # the flag is gone or does not have this type anymore
+                last_known_good.remove(key)
+            return
+        except grpc.FutureCancelledError:
+            return
+        self._record_call(started)
+        remember(last_known_good, key, to_details(method, response), generation)
+
+    def _fetch_shared(
+        self, key: ResolutionKey, method: FlagMethod, context: Struct
+    ) -> FlagResolutionDetails[typing.Any]:
+        if self.single_flight is None:
+            return self._fetch(key, method, context)
+        return self.single_flight.do(key, lambda: self._fetch(key, method, context))
+
+    def _fetch(
+        self, key: ResolutionKey, method: FlagMethod, context: Struct
+    ) -> FlagResolutionDetails[typing.Any]:
+        flag_key, flag_type, context_key = key
+        self._check_circuit()
+        if self.dispatcher is not None:
+            details = self.dispatcher.submit(flag_key, flag_type, context_key, context)
+            if details is not None:
+                return details
+        return self._resolve_remote(flag_key, method, context_key)
+
+    def _resolve_remote(
+        self, flag_key: str, method: FlagMethod, context_data: bytes
+    ) -> FlagResolutionDetails[typing.Any]:
+        """Resolves a flag with one call, which the circuit breaker allowed"""
+        timeout = remaining_timeout(self.config.timeout)
+        request = encode_resolve_request(flag_key, context_data)
+        started = time.monotonic()
+        try:
+            response = self._call(method, request, timeout)
+        except grpc.RpcError as e:
+            self._record_call(started, e, timeout)
+            raise to_openfeature_error(e) from e
+        self._record_call(started)
+        return to_details(method, response)
+
+    def _call(self, method: FlagMethod, request: bytes, timeout: float) -> typing.Any:
+        latencies = self.latencies
+        if latencies is not None:
+            hedge_delay = latencies.value()
+            if hedge_delay is not None and hedge_delay < timeout:
+                return self._call_hedged(method, request, timeout, hedge_delay)
+
+        index = self.pool.acquire()
+        started = time.monotonic()
+        try:
+            response = method.calls[index](request, timeout=timeout)
+        finally:
+            self.pool.release(index)
+        if latencies is not None:
+            latencies.record(time.monotonic() - started)
+        return response
+
+    def _call_hedged(
+        self, method: FlagMethod, request: bytes, timeout: float, delay: float
+    ) -> typing.Any:
+        """
+        Sends the request, and once more on another channel of the pool if no
+        answer came within ``delay``. Returns the first successful response, or
+        raises the error of the last call to fail.
+        """
+        latencies = typing.cast(LatencyWindow, self.latencies)
+        answered: "queue.Queue[grpc.Future]" = queue.Queue()
+
+        def call(timeout: float) -> grpc.Future:
+            index = self.pool.acquire()
+            started = time.monotonic()
+            future = method.calls[index].future(request, timeout=timeout)
+
+            def done(future: grpc.Future) -> None:
+                self.pool.release(index)
+                if not future.cancelled() and future.exception() is None:
+                    latencies.record(time.monotonic() - started)
+                answered.put(future)
+
+            future.add_done_callback(done)
+            return future
+
+        calls = [call(timeout)]
+        try:
+            future = answered.get(timeout=delay)
+        except queue.Empty:
+            calls.append(call(timeout - delay))
+            future = answered.get()
+            if future.exception() is not None:
+                future = answered.get()
+        for other in calls:
+            if other is not future:
+                other.cancel()
+        return future.result()
+
+    def _listen_events(self) -> None:
+        self._connect()
+        backoff = Backoff(
+            self.config.retry_backoff_ms / 1000,
+            self.config.retry_backoff_max_ms / 1000,
+        )
+        # consecutive attempts which ended without a working stream
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                self._event_call = self.stub.EventStream(
+                    schema_pb2.EventStreamRequest()  # type:ignore[attr-defined]
+                )
+                if self._stopped.is_set():
+                    # shutdown ran before there was a call to cancel
+                    self._event_call.cancel()
+                for message in self._event_call:
+                    backoff.reset()
+                    self._handle_event(message.type, message.data, failures > 0)
+                    failures = 0
+            except grpc.RpcError as e:
+                if not self._stopped.is_set():
+                    logger.warning(f"flagd event stream failed: {e.code()}")
+            finally:
+                self._cache_active = False
+                self._event_stream_ready.clear()
+                if self.cache is not None:
+                    self.cache.clear()
+            if self._stopped.is_set():
+                return
+
+            failures += 1
+            if failures == 1:
+                # resolutions may still work, but changes are not seen anymore
+                self._emit(
+                    self.emit_provider_stale,
+                    ProviderEventDetails(message="lost flagd's event stream"),
+                )
+            elif failures == 2:
+                self._emit(
+                    self.emit_provider_error,
+                    ProviderEventDetails(message="failed to reconnect to flagd"),
+                )
+            self._stopped.wait(backoff.next())
+
+    def _handle_event(self, event_type: str, data: Struct, reconnected: bool) -> None:
+        if event_type not in ("provider_ready", "configuration_change"):
+            return
+        flags_changed = (
+            changed_flag_keys(data) if event_type == "configuration_change" else None
+        )
+        if self.cache is not None:
+            if flags_changed is None:
+                self.cache.clear()
+            else:
+                # only the changed flags are resolved again, instead of every
+                # cached flag at once
+                self.cache.invalidate(flags_changed)
+            self._cache_active = True
+            self._event_stream_ready.set()
+        if self.last_known_good is not None and event_type == "configuration_change":
+            if flags_changed is None:
+                self.last_known_good.clear()
+            else:
+                self.last_known_good.invalidate(flags_changed)
+        if event_type == "configuration_change":
+            self._emit(
+                self.emit_provider_configuration_changed,
+                ProviderEventDetails(flags_changed=flags_changed),
+            )
+        elif reconnected:
+            # the first READY is emitted by the SDK once initialize returns
+            self._emit(self.emit_provider_ready, ProviderEventDetails())
@@ -0,0 +1,465 @@
+import logging
+import threading
+import time
+import typing
+
+import grpc
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEventDetails
+from openfeature.exception import (
+    FlagNotFoundError,
+    GeneralError,
+    OpenFeatureError,
+    ParseError,
+    ProviderNotReadyError,
+)
+from openfeature.flag_evaluation import FlagResolutionDetails, Reason
+
+from ..backoff import Backoff
+from ..channel import create_channel
+from ..config import Config, SyncProtocol
+from ..flag_type import FlagType, check_type, flag_type_of
+from ..fork import register_fork_handler
+from ..proto.flagd.sync.v1 import sync_pb2, sync_pb2_grpc
+from ..proto.sync.v1 import sync_service_pb2, sync_service_pb2_grpc
+from .process.file_watcher import FileWatcher
+from .process.flags import (
+    FlagStore,
+    dump_flag_configuration,
+    parse_flag_configuration,
+    parse_flag_keys,
+)
+from .process.snapshot_file import configuration_hash, read_snapshot, write_snapshot
+from .protocol import EmitEvent
+
+T = typing.TypeVar("T")
+
+SyncStub = typing.Union[
+    sync_pb2_grpc.FlagSyncServiceStub, sync_service_pb2_grpc.FlagSyncServiceStub
+]
+
+logger = logging.getLogger("openfeature.contrib")
+
+
+class InProcessResolver:
+    """
+    Evaluates flags locally against the flag configuration streamed from
+    flagd's sync service, so that resolving a flag needs no network call
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        emit_provider_ready: EmitEvent,
+        emit_provider_configuration_changed: EmitEvent,
+        emit_provider_error: EmitEvent,
+    ):
+        self.config = config
+        self.emit_provider_ready = emit_provider_ready
+        self.emit_provider_configuration_changed = emit_provider_configuration_changed
+        self.emit_provider_error = emit_provider_error
+
+        self.flag_store = FlagStore()
+        self._ready = threading.Event()
+        # the SDK emits the first READY event itself once initialize returns,
+        # so the resolver only does so after a timeout or a lost connection
+        self._emit_ready = False
+        # hash of the configuration last persisted to the snapshot file
+        self._snapshot_hash: typing.Optional[str] = None
+        self._setup()
+        # set in a forked child process until the sync stream was reconnected
+        self._forked = False
+        self._fork_lock = threading.Lock()
+        register_fork_handler(self)
+
+    def _setup(self) -> None:
+        # opened when syncing starts, so that a provider created before worker
+        # processes are forked leaves no channel behind in the parent
+        self.channel: typing.Optional[grpc.Channel] = None
+        self.watcher: typing.Optional[FileWatcher] = None
+        if self.config.offline_flag_source_path is not None:
+            self.watcher = FileWatcher(self.config.offline_flag_source_path)
+        self._lock = threading.Lock()
+        self._sync_call: typing.Optional[grpc.Future] = None
+        self._sync_thread: typing.Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # pending write of the snapshot file, started by the first unsaved change
+        self._snapshot_timer: typing.Optional[threading.Timer] = None
+        # the configuration the snapshot is written from, None to dump the flags
+        self._snapshot_configuration: typing.Optional[str] = None
+
+    def initialize(self, evaluation_context: EvaluationContext) -> None:
+        if self._forked:
+            self._recover_from_fork()
+        if self.config.snapshot_path is not None and not self._ready.is_set():
+            self._load_snapshot(self.config.snapshot_path)
+        self._start_sync()
+        if self._ready.is_set():
+            return
+        if self.config.warm_up:
+            # defaults are served until the first flag configuration arrives.
+            # The SDK already reported the provider ready when this returns.
+            return
+        if not self._ready.wait(self.config.timeout):
+            with self._lock:
+                self._emit_ready = not self._ready.is_set()
+            raise ProviderNotReadyError(
+                "no flag configuration was received from flagd in time"
+            )
+
+    def _load_snapshot(self, path: str) -> None:
+        try:
+            configuration = read_snapshot(path)
+            if configuration is None:
+                return
+            flags = parse_flag_configuration(configuration)
+        except (OSError, ParseError) as e:
+            logger.warning(f"ignoring flag snapshot {path}: {e}")
+            return
+        self.flag_store.update(flags)
+        self._snapshot_hash = configuration_hash(configuration)
+        self._ready.set()
+
+    def _schedule_snapshot(self, configuration: typing.Optional[str]) -> None:
+        """
+        Writes the snapshot file once ``snapshot_interval_ms`` passed, so that
+        a burst of changes writes the flags once rather than once per change
+        """
+        with self._lock:
+            self._snapshot_configuration = configuration
+            if self._snapshot_timer is not None:
+                return
+            timer = self._snapshot_timer = threading.Timer(
+                self.config.snapshot_interval_ms / 1000, self._flush_snapshot
+            )
+        timer.name = "FlagdSnapshotWriter"
+        timer.daemon = True
+        timer.start()
+
+    def _flush_snapshot(self) -> None:
+        with self._lock:
+            timer, self._snapshot_timer = self._snapshot_timer, None
+            configuration = self._snapshot_configuration
+            self._snapshot_configuration = None
+        if timer is None or self.config.snapshot_path is None:
+            # nothing changed since the snapshot was last written
+            return
+        timer.cancel()
+        if configuration is None:
+            configuration = dump_flag_configuration(self.flag_store.flags)
+        self._save_snapshot(self.config.snapshot_path, configuration)
+
+    def _save_snapshot(self, path: str, configuration: str) -> None:
+        snapshot_hash = configuration_hash(configuration)
+        if snapshot_hash == self._snapshot_hash:
+            return
+        try:
+            write_snapshot(path, configuration)
+        except OSError as e:
+            logger.warning(f"failed to write flag snapshot {path}: {e}")
+            return
+        self._snapshot_hash = snapshot_hash
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        if self._forked:
+            # the channel and sync thread belong to the parent process
+            return
+        if self._sync_call is not None:
+            self._sync_call.cancel()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout=self.config.timeout)
+            self._sync_thread = None
+        # changes received since the snapshot was last written are kept
+        self._flush_snapshot()
+        if self.channel is not None:
+            self.channel.close()
+
+    def _start_sync(self) -> None:
+        if self._sync_thread is not None:
+            return
+        if self.watcher is None:
+            self.channel = create_channel(self.config)
+            stub: SyncStub = (
+                sync_service_pb2_grpc.FlagSyncServiceStub(self.channel)
+                if self.config.sync_protocol == SyncProtocol.SYNC_V1
+                else sync_pb2_grpc.FlagSyncServiceStub(self.channel)
+            )
+            self._sync_thread = threading.Thread(
+                target=self._sync_flags,
+                args=(stub,),
+                name="FlagdFlagSync",
+                daemon=True,
+            )
+        else:
+            self._sync_thread = threading.Thread(
+                target=self._watch_file,
+                args=(self.watcher,),
+                name="FlagdFileWatcher",
+                daemon=True,
+            )
+        self._sync_thread.start()
+
+    def resolve_boolean_details(
+        self,
+        key: str,
+        default_value: bool,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[bool]:
+        return self._resolve(key, FlagType.BOOLEAN, default_value, evaluation_context)
+
+    def resolve_string_details(
+        self,
+        key: str,
+        default_value: str,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[str]:
+        return self._resolve(key, FlagType.STRING, default_value, evaluation_context)
+
+    def resolve_float_details(
+        self,
+        key: str,
+        default_value: float,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[float]:
+        return self._resolve(key, FlagType.FLOAT, default_value, evaluation_context)
+
+    def resolve_integer_details(
+        self,
+        key: str,
+        default_value: int,
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[int]:
+        return self._resolve(key, FlagType.INTEGER, default_value, evaluation_context)
+
+    def resolve_object_details(
+        self,
+        key: str,
+        default_value: typing.Union[dict, list],
+        evaluation_context: typing.Optional[EvaluationContext] = None,
+    ) -> FlagResolutionDetails[typing.Union[dict, list]]:
+        return self._resolve(key, FlagType.OBJECT, default_value, evaluation_context)
+
+    def after_fork_in_child(self) -> None:
+        # locks may have been held by threads of the parent, which do not
+        # exist anymore. The flags themselves are kept, so the child can
+        # serve them straight away while it reconnects.
+        self.flag_store.after_fork_in_child()
+        ready = threading.Event()
+        if self._ready.is_set():
+            ready.set()
+        self._ready = ready
+        self._fork_lock = threading.Lock()
+        self._forked = True
+
+    def _recover_from_fork(self) -> None:
+        with self._fork_lock:
+            if not self._forked:
+                return
+            syncing = self._sync_thread is not None
+            self._setup()
+            self._forked = False
+        if syncing:
+            self._start_sync()
+
+    def resolve_all(
+        self, evaluation_context: typing.Optional[EvaluationContext] = None
+    ) -> typing.Dict[str, FlagResolutionDetails]:
+        if self._forked:
+            self._recover_from_fork()
+        if not self._ready.is_set():
+            raise ProviderNotReadyError("flag configuration has not been received yet")
+
+        resolved: typing.Dict[str, FlagResolutionDetails] = {}
+        for key, flag in self.flag_store.flags.items():
+            if flag.state == "DISABLED":
+                continue
+            try:
+                resolved[key] = self._resolve(
+                    key, flag_type_of(flag.default[1]), None, evaluation_context
+                )
+            except OpenFeatureError as e:
+                logger.debug(f"skipping flag {key} in bulk evaluation: {e}")
+        return resolved
+
+    def _resolve(
+        self,
+        flag_key: str,
+        flag_type: FlagType,
+        default_value: T,
+        evaluation_context: typing.Optional[EvaluationContext],
+    ) -> FlagResolutionDetails[T]:
+        if self._forked:
+            self._recover_from_fork()
+        if not self._ready.is_set():
+            raise ProviderNotReadyError("flag configuration has not been received yet")
+
+        flag = self.flag_store.get_flag(flag_key)
+        if flag is None:
+            raise FlagNotFoundError(
+                f"Flag with key {flag_key} not present in flag store"
+            )
+        if flag.state == "DISABLED":
+            raise FlagNotFoundError(f"Flag with key {flag_key} is disabled")
+        if flag.rule is None:
+            variant, value = flag.default
+            return FlagResolutionDetails(
+                value=check_type(flag_key, flag_type, value),
+                reason=Reason.STATIC,
+                variant=variant,
+            )
+
+        data = self._targeting_data(flag_key, evaluation_context)
+        try:
+            variant = flag.rule(data)
+        except Exception as e:
+            raise GeneralError(f"Flag {flag_key} targeting failed: {e}") from e
+
+        if variant is None:
+            variant, value = flag.default
+            return FlagResolutionDetails(
+                value=check_type(flag_key, flag_type, value),
+                reason=Reason.DEFAULT,
+                variant=variant,
+            )
+        if isinstance(variant, bool):
+            variant = "true" if variant else "false"
+        if not isinstance(variant, str) or variant not in flag.variants:
+            raise GeneralError(
+                f"Flag {flag_key} targeting returned an unknown variant: {variant}"
+            )
+        return FlagResolutionDetails(
+            value=check_type(flag_key, flag_type, flag.variants[variant]),
+            reason=Reason.TARGETING_MATCH,
+            variant=variant,
+        )
+
+    def _targeting_data(
+        self, flag_key: str, evaluation_context: typing.Optional[EvaluationContext]
+    ) -> typing.Dict[str, typing.Any]:
+        data: typing.Dict[str, typing.Any] = {}
+        if evaluation_context is not None:
+            data.update(evaluation_context.attributes)
+            if evaluation_context.targeting_key is not None:
+                data["targetingKey"] = evaluation_context.targeting_key
+        data["$flagd"] = {"flagKey": flag_key, "timestamp": int(time.time())}
+        return data
+
+    def _sync_flags(self, stub: SyncStub) -> None:
+        deltas = self.config.sync_protocol == SyncProtocol.SYNC_V1
+        messages = sync_service_pb2 if deltas else sync_pb2
+        request = messages.SyncFlagsRequest(selector=self.config.selector or "")
+        backoff = Backoff(
+            self.config.retry_backoff_ms / 1000,
+            self.config.retry_backoff_max_ms / 1000,
+        )
+        while not self._stopped.is_set():
+            try:
+                self._sync_call = stub.SyncFlags(request)
+                if self._stopped.is_set():
+                    # shutdown ran before there was a call to cancel
+                    self._sync_call.cancel()
+                for response in self._sync_call:
+                    backoff.reset()
+                    if deltas:
+                        self._apply_safely(
+                            self._apply_sync_state,
+                            response.state,
+                            response.flag_configuration,
+                        )
+                    else:
+                        self._apply_safely(self._update, response.flag_configuration)
+            except grpc.RpcError as e:
+                if self._stopped.is_set():
+                    return
+                message = f"flagd sync stream failed: {e.code()}"
+                logger.warning(message)
+                with self._lock:
+                    self._emit_ready = True
+                self.emit_provider_error(ProviderEventDetails(message=message))
+            self._stopped.wait(backoff.next())
+
+    def _watch_file(self, watcher: FileWatcher) -> None:
+        interval = self.config.offline_poll_interval_ms / 1000
+        failing = False
+        while not self._stopped.is_set():
+            try:
+                configuration = watcher.poll()
+            except OSError as e:
+                if not failing:
+                    message = f"failed to read flag configuration file: {e}"
+                    logger.warning(message)
+                    with self._lock:
+                        self._emit_ready = True
+                    self.emit_provider_error(ProviderEventDetails(message=message))
+                failing = True
+            else:
+                failing = False
+                if configuration is not None:
+                    self._apply_safely(self._update, configuration)
+            self._stopped.wait(interval)
+
+    def _apply_safely(
+        self, apply: typing.Callable[..., None], *args: typing.Any
+    ) -> None:
+        """
+        Applies a flag configuration in a background thread, which has to keep
+        running whatever it received, as later configurations may be valid
+        """
+        try:
+            apply(*args)
+        except Exception:
+            logger.exception("ignoring flag configuration which failed to apply")
+
+    def _apply_sync_state(self, state: int, configuration: str) -> None:
+        """Applies a message of the deprecated sync service to the flag store"""
+        if state == sync_service_pb2.SYNC_STATE_PING:  # type:ignore[attr-defined]
+            return
+        if state in (
+            sync_service_pb2.SYNC_STATE_ADD,  # type:ignore[attr-defined]
+            sync_service_pb2.SYNC_STATE_UPDATE,  # type:ignore[attr-defined]
+        ):
+            try:
+                # only the flags of the delta are parsed, and only those whose
+                # definition changed have their targeting compiled again
+                flags = parse_flag_configuration(configuration, self.flag_store.flags)
+            except ParseError as e:
+                logger.error(f"ignoring invalid flag delta: {e.error_message}")
+                return
+            self._flags_updated(self.flag_store.merge(flags))
+        elif state == sync_service_pb2.SYNC_STATE_DELETE:  # type:ignore[attr-defined]
+            try:
+                keys = parse_flag_keys(configuration)
+            except ParseError as e:
+                logger.error(f"ignoring invalid flag delta: {e.error_message}")
+                return
+            self._flags_updated(self.flag_store.remove(keys))
+        else:
+            self._update(configuration)
+
+    def _update(self, configuration: str) -> None:
+        try:
+            flags = parse_flag_configuration(configuration, self.flag_store.flags)
+        except ParseError as e:
+            logger.error(f"ignoring invalid flag configuration: {e.error_message}")
+            return
+        self._flags_updated(self.flag_store.update(flags), configuration)
+
+    def _flags_updated(
+        self, changed: typing.List[str], configuration: typing.Optional[str] = None
+    ) -> None:
+        with self._lock:
+            emit_ready, self._emit_ready = self._emit_ready, False
+            first_update = not self._ready.is_set()
+            self._ready.set()
+
+        if emit_ready:
+            self.emit_provider_ready(ProviderEventDetails())
+        elif changed and not first_update:
+            self.emit_provider_configuration_changed(
+                ProviderEventDetails(flags_changed=changed)
+            )
+
+        if self.config.snapshot_path is not None:
+            self._schedule_snapshot(configuration)
@@ -0,0 +1,221 @@
+"""flagd's custom JsonLogic operations"""
+
+import bisect
+import logging
+import re
+import typing
+
+from openfeature.exception import ParseError
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from .targeting import Compiler, Rule
+
+logger = logging.getLogger("openfeature.contrib")
+
+MAX_INT32 = 2**31 - 1
+
+SEMVER_PATTERN = re.compile(
+    r"^v?(0|[1-9]\d*)(?:\.(0|[1-9]\d*))?(?:\.(0|[1-9]\d*))?"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+[0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*)?$"
+)
+
+SemVer = typing.Tuple[int, int, int, typing.Tuple[typing.Any, ...]]
+Distribution = typing.Tuple[typing.List[str], typing.List[float]]
+
+
+def is_literal(value: typing.Any) -> bool:
+    if isinstance(value, list):
+        return all(is_literal(item) for item in value)
+    return not isinstance(value, dict)
+
+
+def murmurhash3_32(data: bytes, seed: int = 0) -> int:
+    """Signed 32 bit MurmurHash3 (x86), as used by flagd to bucket contexts"""
+    c1, c2, mask = 0xCC9E2D51, 0x1B873593, 0xFFFFFFFF
+    length = len(data)
+    h = seed & mask
+    rounded_end = length & ~3
+
+    for i in range(0, rounded_end, 4):
+        k = int.from_bytes(data[i : i + 4], "little")
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        k = (k * c2) & mask
+        h ^= k
+        h = ((h << 13) | (h >> 19)) & mask
+        h = (h * 5 + 0xE6546B64) & mask
+
+    k = 0
+    tail = length & 3
+    if tail == 3:
+        k ^= data[rounded_end + 2] << 16
+    if tail >= 2:
+        k ^= data[rounded_end + 1] << 8
+    if tail >= 1:
+        k ^= data[rounded_end]
+        k = (k * c1) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        k = (k * c2) & mask
+        h ^= k
+
+    h ^= length
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & mask
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & mask
+    h ^= h >> 16
+    return h - 2**32 if h > MAX_INT32 else h
+
+
+def _distribution(buckets: typing.List[typing.Any]) -> typing.Optional[Distribution]:
+    """Turns ``[variant, weight]`` pairs into variants and cumulative bounds"""
+    variants: typing.List[str] = []
+    bounds: typing.List[float] = []
+    total = 0.0
+    for bucket in buckets:
+        if not isinstance(bucket, list) or not 1 <= len(bucket) <= 2:
+            return None
+        variant, weight = bucket[0], bucket[1] if len(bucket) > 1 else 1
+        if not isinstance(variant, str) or not isinstance(weight, (int, float)):
+            return None
+        total += weight
+        variants.append(variant)
+        bounds.append(total)
+    if not variants or total <= 0:
+        return None
+    return variants, bounds
+
+
+def _select(bucket_by: str, distribution: Distribution) -> str:
+    variants, bounds = distribution
+    ratio = abs(murmurhash3_32(bucket_by.encode("utf-8"))) / MAX_INT32
+    index = bisect.bisect_right(bounds, ratio * bounds[-1])
+    return variants[min(index, len(variants) - 1)]
+
+
+def _default_bucket_by(data: typing.Any) -> typing.Optional[str]:
+    if not isinstance(data, dict):
+        return None
+    flagd = data.get("$flagd")
+    targeting_key = data.get("targetingKey")
+    if not isinstance(flagd, dict) or not isinstance(targeting_key, str):
+        return None
+    return f"{flagd.get('flagKey', '')}{targeting_key}"
+
+
+def compile_fractional(
+    args: typing.List[typing.Any], compile_arg: "Compiler"
+) -> "Rule":
+    """
+    ``{"fractional": [bucket_by?, [variant, weight], ...]}`` deterministically
+    assigns a variant by hashing ``bucket_by``, which defaults to the flag key
+    followed by the targeting key
+    """
+    bucket_by_rule: typing.Optional[Rule] = None
+    if args and not isinstance(args[0], list):
+        bucket_by_rule = compile_arg(args[0])
+        args = args[1:]
+
+    if is_literal(args):
+        distribution = _distribution(args)
+        if distribution is None:
+            raise ParseError(f"Invalid fractional buckets: {args}")
+        buckets_rule: Rule = lambda data: distribution  # noqa: E731
+    else:
+        rules = [compile_arg(bucket) for bucket in args]
+        buckets_rule = lambda data: _distribution([rule(data) for rule in rules])  # noqa: E731
+
+    def fractional(data: typing.Any) -> typing.Optional[str]:
+        if bucket_by_rule is None:
+            bucket_by = _default_bucket_by(data)
+        else:
+            bucket_by = bucket_by_rule(data)
+        distribution = buckets_rule(data)
+        if not isinstance(bucket_by, str) or distribution is None:
+            logger.debug("fractional evaluation requires a string bucketing key")
+            return None
+        return _select(bucket_by, distribution)
+
+    return fractional
+
+
+def parse_semver(value: typing.Any) -> typing.Optional[SemVer]:
+    if not isinstance(value, str):
+        return None
+    match = SEMVER_PATTERN.match(value.strip())
+    if match is None:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    if prerelease is None:
+        # releases take precedence over any of their pre-releases
+        prerelease_key: typing.Tuple[typing.Any, ...] = (1,)
+    else:
+        prerelease_key = (
+            0,
+            *(
+                (0, int(part), "") if part.isdigit() else (1, 0, part)
+                for part in prerelease.split(".")
+            ),
+        )
+    return int(major), int(minor or 0), int(patch or 0), prerelease_key
+
+
+SEMVER_OPERATORS: typing.Dict[str, typing.Callable[[SemVer, SemVer], bool]] = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "^": lambda a, b: a[0] == b[0],
+    "~": lambda a, b: a[:2] == b[:2],
+}
+
+
+def compile_sem_ver(args: typing.List[typing.Any], compile_arg: "Compiler") -> "Rule":
+    """``{"sem_ver": [version, operator, version]}`` compares semantic versions"""
+    if len(args) != 3:
+        raise ParseError(f"sem_ver expects 3 arguments, got {len(args)}")
+    left, operator, right = (compile_arg(arg) for arg in args)
+    if is_literal(args[1]) and args[1] not in SEMVER_OPERATORS:
+        raise ParseError(f"Unknown sem_ver operator: {args[1]}")
+    # versions given as literals are parsed once, at compile time
+    if is_literal(args[2]):
+        parsed_right = parse_semver(args[2])
+        right = lambda data: parsed_right  # noqa: E731
+    else:
+        right_value = right
+        right = lambda data: parse_semver(right_value(data))  # noqa: E731
+
+    def sem_ver(data: typing.Any) -> bool:
+        compare = SEMVER_OPERATORS.get(operator(data))
+        a, b = parse_semver(left(data)), right(data)
+        if compare is None or a is None or b is None:
+            return False
+        return compare(a, b)
+
+    return sem_ver
+
+
+def _string_comparison(
+    compare: typing.Callable[[str, str], bool],
+) -> typing.Callable[[typing.List[typing.Any], "Compiler"], "Rule"]:
+    def compile_operation(
+        args: typing.List[typing.Any], compile_arg: "Compiler"
+    ) -> "Rule":
+        if len(args) != 2:
+            raise ParseError(f"Expected 2 arguments, got {len(args)}")
+        value, affix = (compile_arg(arg) for arg in args)
+
+        def string_comparison(data: typing.Any) -> bool:
+            a, b = value(data), affix(data)
+            return isinstance(a, str) and isinstance(b, str) and compare(a, b)
+
+        return string_comparison
+
+    return compile_operation
+
+
+compile_starts_with = _string_comparison(str.startswith)
+compile_ends_with = _string_comparison(str.endswith)
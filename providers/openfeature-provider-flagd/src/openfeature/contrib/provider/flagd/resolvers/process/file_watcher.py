@@ -0,0 +1,42 @@
+import os
+import typing
+
+# what identifies a version of the file without reading it
+FileSignature = typing.Tuple[int, int, int]
+
+
+class FileWatcher:
+    """
+    Detects changes to a flag configuration file by polling its metadata, so
+    that the file is only read when it was modified or replaced
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._signature: typing.Optional[FileSignature] = None
+        self._content: typing.Optional[str] = None
+
+    def poll(self) -> typing.Optional[str]:
+        """
+        Returns the content of the file when it changed since the last poll,
+        otherwise None. Raises OSError when the file cannot be read.
+        """
+        try:
+            stat = os.stat(self.path)
+            # the inode changes when the file is replaced by a rename, as done
+            # by editors and by kubernetes for mounted config maps
+            signature = (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+            if signature == self._signature:
+                return None
+            with open(self.path, encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            # read again once the file is back, even if it did not change
+            self._signature = self._content = None
+            raise
+        self._signature = signature
+        if content == self._content:
+            # touched, but not modified
+            return None
+        self._content = content
+        return content
@@ -0,0 +1,270 @@
+import json
+import threading
+import typing
+
+from openfeature.exception import ParseError
+
+from .json_reader import JsonObjectReader
+from .targeting import Rule, compile_rule, expand_refs, has_refs
+
+FLAG_STATES = ("ENABLED", "DISABLED")
+
+
+class Flag:
+    # a store can hold thousands of flags, slots keep each of them small
+    __slots__ = ("key", "state", "variants", "default_variant", "targeting", "rule")
+
+    def __init__(
+        self,
+        key: str,
+        state: str,
+        variants: typing.Mapping[str, typing.Any],
+        default_variant: str,
+        targeting: typing.Optional[dict] = None,
+    ):
+        self.key = key
+        self.state = state
+        self.variants = variants
+        self.default_variant = default_variant
+        self.targeting = targeting
+        self.rule: typing.Optional[Rule] = None
+        self._validate()
+
+    def _validate(self) -> None:
+        if self.state not in FLAG_STATES:
+            raise ParseError(f"Flag {self.key} has an invalid state: {self.state}")
+        if not isinstance(self.variants, dict):
+            raise ParseError(f"Flag {self.key} has no variants")
+        if (
+            not isinstance(self.default_variant, str)
+            or self.default_variant not in self.variants
+        ):
+            raise ParseError(
+                f"Flag {self.key} has an unknown default variant: {self.default_variant}"
+            )
+        if self.targeting is not None and not isinstance(self.targeting, dict):
+            raise ParseError(f"Flag {self.key} has invalid targeting rules")
+        if self.targeting:
+            self.rule = compile_rule(self.targeting)
+
+    def __eq__(self, other: object) -> bool:
+        if other is self:
+            return True
+        if not isinstance(other, Flag):
+            return NotImplemented
+        return (
+            self.key == other.key
+            and self.state == other.state
+            and self.variants == other.variants
+            and self.default_variant == other.default_variant
+            and self.targeting == other.targeting
+        )
+
+    # flags are compared by value but are not meant to be used as keys
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"Flag(key={self.key!r}, state={self.state!r}, "
+            f"variants={self.variants!r}, default_variant={self.default_variant!r}, "
+            f"targeting={self.targeting!r})"
+        )
+
+    @classmethod
+    def from_dict(
+        cls,
+        key: str,
+        data: typing.Any,
+        evaluators: typing.Optional[typing.Mapping[str, typing.Any]] = None,
+        previous: typing.Optional["Flag"] = None,
+    ) -> "Flag":
+        """
+        Creates a flag from its JSON definition. When the definition is the same
+        as that of the previous flag, the previous flag is returned instead, so
+        that its targeting rules are not compiled again.
+        """
+        if not isinstance(data, dict):
+            raise ParseError(f"Flag {key} is not a JSON object")
+        targeting = data.get("targeting") or None
+        if targeting is not None:
+            # shared evaluators are inlined, so that a change to an evaluator
+            # shows up as a change to every flag which references it
+            targeting = expand_refs(targeting, evaluators or {})
+        state = data.get("state")
+        variants = data.get("variants")
+        default_variant = data.get("defaultVariant")
+        if (
+            previous is not None
+            and previous.key == key
+            and previous.state == state
+            and previous.variants == variants
+            and previous.default_variant == default_variant
+            and previous.targeting == targeting
+        ):
+            return previous
+        return cls(
+            key=key,
+            state=state,  # type: ignore[arg-type]
+            variants=variants,  # type: ignore[arg-type]
+            default_variant=default_variant,  # type: ignore[arg-type]
+            targeting=targeting,
+        )
+
+    def to_dict(self) -> typing.Dict[str, typing.Any]:
+        """Returns the flag's JSON definition, with shared evaluators inlined"""
+        data: typing.Dict[str, typing.Any] = {
+            "state": self.state,
+            "variants": self.variants,
+            "defaultVariant": self.default_variant,
+        }
+        if self.targeting is not None:
+            data["targeting"] = self.targeting
+        return data
+
+    @property
+    def default(self) -> typing.Tuple[str, typing.Any]:
+        return self.default_variant, self.variants[self.default_variant]
+
+
+def _read_flag_configuration(
+    configuration: str,
+) -> typing.Iterator[typing.Tuple[typing.Optional[str], typing.Any]]:
+    """
+    Yields the key and the decoded definition of every flag, decoding one flag
+    at a time rather than the whole document. The shared evaluators are yielded
+    with None as key once read.
+    """
+    try:
+        reader = JsonObjectReader(configuration)
+    except ValueError as e:
+        raise ParseError("flag configuration is not a JSON object") from e
+    has_flags = False
+    try:
+        for key in reader.iter_keys():
+            if key == "flags":
+                flags = reader.object()
+                if flags is None:
+                    raise ParseError("flag configuration has no 'flags' object")
+                has_flags = True
+                for flag_key in flags.iter_keys():
+                    yield flag_key, flags.value()
+            elif key == "$evaluators":
+                evaluators = reader.value() or {}
+                if not isinstance(evaluators, dict):
+                    raise ParseError(
+                        "flag configuration has an invalid '$evaluators' object"
+                    )
+                yield None, evaluators
+            else:
+                reader.value()
+        reader.end()
+    except ValueError as e:
+        raise ParseError("flag configuration is not valid JSON") from e
+    if not has_flags:
+        raise ParseError("flag configuration has no 'flags' object")
+
+
+def parse_flag_configuration(
+    configuration: str, previous: typing.Optional[typing.Mapping[str, Flag]] = None
+) -> typing.Dict[str, Flag]:
+    """
+    Parses a flagd flag configuration JSON document into its flags, reusing the
+    previous flags whose definition did not change.
+
+    Flags are decoded and compiled one at a time, so that the document is never
+    decoded into a tree of JSON objects on top of the flags built from it: the
+    objects decoded for a flag can be freed once it is built, right away for
+    unchanged flags. Only that intermediate memory is bounded. The document
+    text is held until parsing ends, the flags keep their variants and
+    targeting rules, and the definitions of flags referencing evaluators which
+    are defined further down are held until the evaluators are read.
+    """
+    previous = previous or {}
+    flags: typing.Dict[str, typing.Optional[Flag]] = {}
+    evaluators: typing.Optional[typing.Dict[str, typing.Any]] = None
+    # flags referencing evaluators which are only defined further down
+    pending: typing.Dict[str, typing.Any] = {}
+    for key, data in _read_flag_configuration(configuration):
+        if key is None:
+            evaluators = data
+        elif (
+            evaluators is None
+            and isinstance(data, dict)
+            and has_refs(data.get("targeting"))
+        ):
+            # kept in order, and compiled once the evaluators are known
+            flags[key] = None
+            pending[key] = data
+        else:
+            flags[key] = Flag.from_dict(key, data, evaluators, previous.get(key))
+
+    for key, data in pending.items():
+        flags[key] = Flag.from_dict(key, data, evaluators, previous.get(key))
+    return typing.cast(typing.Dict[str, Flag], flags)
+
+
+class FlagStore:
+    """
+    Holds the flags as an immutable snapshot which is replaced as a whole.
+
+    A published dict of flags is never modified, writers build the next one and
+    swap it in with a single assignment. Readers only read the current
+    reference, so they never take a lock and are not held up by updates. The
+    lock only serializes writers.
+    """
+
+    def __init__(self) -> None:
+        self.flags: typing.Mapping[str, Flag] = {}
+        self._lock = threading.Lock()
+
+    def get_flag(self, key: str) -> typing.Optional[Flag]:
+        return self.flags.get(key)
+
+    def after_fork_in_child(self) -> None:
+        # the lock may have been held by a thread of the parent process
+        self._lock = threading.Lock()
+
+    def merge(self, flags: typing.Mapping[str, Flag]) -> typing.List[str]:
+        """Adds or replaces the given flags and returns the keys that changed"""
+        with self._lock:
+            changed = [
+                key for key, flag in flags.items() if self.flags.get(key) != flag
+            ]
+            if changed:
+                self.flags = {**self.flags, **flags}
+        return sorted(changed)
+
+    def remove(self, keys: typing.Iterable[str]) -> typing.List[str]:
+        """Removes the flags with the given keys and returns the keys removed"""
+        with self._lock:
+            removed = [key for key in set(keys) if key in self.flags]
+            if removed:
+                flags = dict(self.flags)
+                for key in removed:
+                    del flags[key]
+                self.flags = flags
+        return sorted(removed)
+
+    def update(self, flags: typing.Dict[str, Flag]) -> typing.List[str]:
+        """
+        Replaces all flags in the store and returns the keys that changed. The
+        store takes ownership of flags, which must not be modified afterwards.
+        """
+        with self._lock:
+            changed = [
+                key
+                for key in self.flags.keys() | flags.keys()
+                if self.flags.get(key) != flags.get(key)
+            ]
+            self.flags = flags
+        return sorted(changed)
+
+
+def parse_flag_keys(configuration: str) -> typing.List[str]:
+    """Returns the keys of the flags in a flag configuration, ignoring their definition"""
+    return [key for key, _ in _read_flag_configuration(configuration) if key]
+
+
+def dump_flag_configuration(flags: typing.Mapping[str, Flag]) -> str:
+    """Serializes flags into a flag configuration JSON document"""
+    return json.dumps({"flags": {key: flag.to_dict() for key, flag in flags.items()}})
@@ -0,0 +1,92 @@
+import json
+import re
+import typing
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+class JsonObjectReader:
+    """
+    Reads the members of a JSON object in a document one at a time.
+
+    Only the value of the current member is decoded, so that a large document
+    never has to be held as decoded objects all at once. Malformed JSON raises
+    json.JSONDecodeError.
+    """
+
+    def __init__(self, document: str, index: int = 0):
+        self.document = document
+        self.index = self._expect(index, "{")
+        self._first = True
+
+    def iter_keys(self) -> typing.Iterator[str]:
+        """
+        Yields the key of every member. The value of each member has to be read
+        with value or object before the next key is read.
+        """
+        while True:
+            index = self._skip_whitespace(self.index)
+            if self.document.startswith("}", index):
+                self.index = index + 1
+                return
+            if not self._first:
+                index = self._skip_whitespace(self._expect(index, ","))
+            self._first = False
+            if not self.document.startswith('"', index):
+                raise self._error(
+                    "Expecting property name enclosed in double quotes", index
+                )
+            key, index = _decoder.raw_decode(self.document, index)
+            self.index = self._expect(self._skip_whitespace(index), ":")
+            yield key
+
+    def value(self) -> typing.Any:
+        """Decodes the value of the current member"""
+        value, self.index = _decoder.raw_decode(
+            self.document, self._skip_whitespace(self.index)
+        )
+        return value
+
+    def object(self) -> typing.Optional["JsonObjectReader"]:
+        """
+        Returns a reader of the current member's value when it is an object,
+        otherwise None after skipping the value. The nested reader has to be
+        read to its end before this reader is used again.
+        """
+        index = self._skip_whitespace(self.index)
+        if not self.document.startswith("{", index):
+            self.value()
+            return None
+        return _NestedReader(self, index)
+
+    def end(self) -> None:
+        """Checks that nothing but whitespace follows the object"""
+        index = self._skip_whitespace(self.index)
+        if index != len(self.document):
+            raise self._error("Extra data", index)
+
+    def _skip_whitespace(self, index: int) -> int:
+        match = _whitespace.match(self.document, index)
+        return index if match is None else match.end()
+
+    def _expect(self, index: int, token: str) -> int:
+        index = self._skip_whitespace(index)
+        if not self.document.startswith(token, index):
+            raise self._error(f"Expecting '{token}' delimiter", index)
+        return index + 1
+
+    def _error(self, message: str, index: int) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.document, index)
+
+
+class _NestedReader(JsonObjectReader):
+    """Reads an object nested in another, handing the position back at its end"""
+
+    def __init__(self, parent: JsonObjectReader, index: int):
+        super().__init__(parent.document, index)
+        self._parent = parent
+
+    def iter_keys(self) -> typing.Iterator[str]:
+        yield from super().iter_keys()
+        self._parent.index = self.index
@@ -0,0 +1,96 @@
+import contextlib
+import hashlib
+import mmap
+import os
+import tempfile
+import typing
+
+from openfeature.exception import ParseError
+
+SNAPSHOT_MAGIC = b"flagd-snapshot"
+SNAPSHOT_VERSION = 1
+
+
+def configuration_hash(configuration: str) -> str:
+    return hashlib.sha256(configuration.encode("utf-8")).hexdigest()
+
+
+def write_snapshot(path: str, configuration: str) -> None:
+    """
+    Persists a flag configuration, replacing the file atomically so that readers
+    see either the previous or the new snapshot but never a partial one
+    """
+    body = configuration.encode("utf-8")
+    header = b"%s %d %s %d\n" % (
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        hashlib.sha256(body).hexdigest().encode("ascii"),
+        len(body),
+    )
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=".flagd-snapshot-", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(body)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+def read_snapshot(path: str) -> typing.Optional[str]:
+    """
+    Returns the flag configuration persisted at path, or None when there is no
+    snapshot. Raises ParseError for snapshots that are corrupt or were written
+    by an unknown version.
+    """
+    try:
+        f = open(path, "rb")  # noqa: SIM115
+    except FileNotFoundError:
+        return None
+    with f:
+        try:
+            data: typing.Union[bytes, mmap.mmap] = mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except (ValueError, OSError):
+            # empty files, and file systems that do not support mapping
+            data = f.read()
+        try:
+            return _parse_snapshot(data)
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+
+def _parse_snapshot(data: typing.Union[bytes, mmap.mmap]) -> str:
+    end = data.find(b"\n")
+    if end < 0:
+        raise ParseError("flag snapshot has no header")
+    fields = data[:end].split(b" ")
+    if len(fields) != 4 or fields[0] != SNAPSHOT_MAGIC:
+        raise ParseError("flag snapshot has an invalid header")
+    if fields[1] != b"%d" % SNAPSHOT_VERSION:
+        raise ParseError(f"flag snapshot has unsupported version {fields[1]!r}")
+    try:
+        length = int(fields[3])
+    except ValueError as e:
+        raise ParseError("flag snapshot has an invalid length") from e
+
+    # views rather than slices, so the body is hashed and decoded without
+    # copying it out of the mapped file first
+    with memoryview(data) as view, view[end + 1 :] as body:
+        if len(body) != length:
+            raise ParseError("flag snapshot is truncated")
+        if hashlib.sha256(body).hexdigest().encode("ascii") != fields[2]:
+            raise ParseError("flag snapshot does not match its hash")
+        try:
+            return str(body, "utf-8")
+        except UnicodeDecodeError as e:
+            raise ParseError("flag snapshot is not valid UTF-8") from e
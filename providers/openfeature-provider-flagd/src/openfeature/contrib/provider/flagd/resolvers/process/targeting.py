@@ -0,0 +1,449 @@
+"""
+JsonLogic targeting rules compiled into trees of Python closures.
+
+Each rule is compiled once, when the flag configuration is received, so that
+evaluating it only calls into the prebuilt closures instead of walking the
+rule's JSON on every evaluation. Sub-expressions without any data access are
+folded into constants at compile time.
+"""
+
+import logging
+import typing
+from functools import reduce
+
+from openfeature.exception import ParseError
+
+from . import custom_ops
+
+logger = logging.getLogger("openfeature.contrib")
+
+Rule = typing.Callable[[typing.Any], typing.Any]
+Compiler = typing.Callable[[typing.Any], Rule]
+OperationCompiler = typing.Callable[[typing.List[typing.Any], Compiler], Rule]
+
+OPERATIONS: typing.Dict[str, OperationCompiler] = {}
+
+_MISSING = object()
+
+
+def compile_rule(logic: typing.Any) -> Rule:
+    """Compiles a JsonLogic expression into a function of the evaluation data"""
+    if isinstance(logic, list):
+        if is_constant(logic):
+            return constant(logic)
+        rules = [compile_rule(item) for item in logic]
+        return lambda data: [rule(data) for rule in rules]
+    if not is_operation(logic):
+        return constant(logic)
+
+    name, args = next(iter(logic.items()))
+    compile_operation = OPERATIONS.get(name)
+    if compile_operation is None:
+        raise ParseError(f"Unrecognized targeting operation: {name}")
+    if not isinstance(args, list):
+        args = [args]
+    return compile_operation(args, compile_rule)
+
+
+def expand_refs(
+    logic: typing.Any,
+    evaluators: typing.Mapping[str, typing.Any],
+    seen: typing.Tuple[str, ...] = (),
+) -> typing.Any:
+    """Replaces every ``{"$ref": name}`` with the shared evaluator it names"""
+    if isinstance(logic, list):
+        return [expand_refs(item, evaluators, seen) for item in logic]
+    if not isinstance(logic, dict):
+        return logic
+    if len(logic) == 1 and "$ref" in logic:
+        name = logic["$ref"]
+        if not isinstance(name, str):
+            raise ParseError(f"Invalid evaluator reference in targeting: {name!r}")
+        if name not in evaluators:
+            raise ParseError(f"Unknown evaluator referenced in targeting: {name}")
+        if name in seen:
+            raise ParseError(f"Circular evaluator reference: {name}")
+        return expand_refs(evaluators[name], evaluators, (*seen, name))
+    return {key: expand_refs(value, evaluators, seen) for key, value in logic.items()}
+
+
+def has_refs(logic: typing.Any) -> bool:
+    """Returns whether logic references any shared evaluator"""
+    if isinstance(logic, list):
+        return any(has_refs(item) for item in logic)
+    if not isinstance(logic, dict):
+        return False
+    if len(logic) == 1 and "$ref" in logic:
+        return True
+    return any(has_refs(value) for value in logic.values())
+
+
+def is_operation(logic: typing.Any) -> bool:
+    return isinstance(logic, dict) and len(logic) == 1
+
+
+def is_constant(logic: typing.Any) -> bool:
+    if isinstance(logic, list):
+        return all(is_constant(item) for item in logic)
+    return not is_operation(logic)
+
+
+def constant(value: typing.Any) -> Rule:
+    return lambda data: value
+
+
+def truthy(value: typing.Any) -> bool:
+    # JsonLogic follows JavaScript truthiness, where objects are always truthy
+    return True if isinstance(value, dict) else bool(value)
+
+
+def operation(*names: str) -> typing.Callable[[OperationCompiler], OperationCompiler]:
+    def register(compile_operation: OperationCompiler) -> OperationCompiler:
+        for name in names:
+            OPERATIONS[name] = compile_operation
+        return compile_operation
+
+    return register
+
+
+def eager(
+    func: typing.Callable[..., typing.Any], *names: str, pure: bool = True
+) -> None:
+    """
+    Registers an operation that evaluates all of its arguments before it is
+    applied. Pure operations on constant arguments are folded at compile time.
+    """
+
+    def compile_operation(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+        if pure and is_constant(args):
+            try:
+                return constant(func(*args))
+            except Exception:  # noqa: S110
+                # leave the error to be raised when the rule is evaluated
+                pass
+        rules = [compile_arg(arg) for arg in args]
+        if len(rules) == 1:
+            (first,) = rules
+            return lambda data: func(first(data))
+        if len(rules) == 2:
+            first, second = rules
+            return lambda data: func(first(data), second(data))
+        return lambda data: func(*[rule(data) for rule in rules])
+
+    for name in names:
+        OPERATIONS[name] = compile_operation
+
+
+def get_path(data: typing.Any, parts: typing.Sequence[str]) -> typing.Any:
+    for part in parts:
+        if isinstance(data, dict):
+            data = data.get(part, _MISSING)
+        elif isinstance(data, list) and part.isdigit() and int(part) < len(data):
+            data = data[int(part)]
+        else:
+            return _MISSING
+        if data is _MISSING:
+            return _MISSING
+    return data
+
+
+def split_path(path: typing.Any) -> typing.Tuple[str, ...]:
+    if path is None or path == "" or path == []:
+        return ()
+    return tuple(str(path).split("."))
+
+
+@operation("var")
+def compile_var(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+    path = args[0] if args else None
+    default = compile_arg(args[1]) if len(args) > 1 else constant(None)
+    if isinstance(path, list):
+        path = path[0] if path else None
+
+    if not is_constant(path):
+        path_rule = compile_arg(path)
+
+        def dynamic_var(data: typing.Any) -> typing.Any:
+            value = get_path(data, split_path(path_rule(data)))
+            return default(data) if value is _MISSING else value
+
+        return dynamic_var
+
+    parts = split_path(path)
+    if not parts:
+        return lambda data: data
+    if len(parts) == 1:
+        (key,) = parts
+
+        def simple_var(data: typing.Any) -> typing.Any:
+            if isinstance(data, dict):
+                value = data.get(key, _MISSING)
+            else:
+                value = get_path(data, parts)
+            return default(data) if value is _MISSING else value
+
+        return simple_var
+
+    def nested_var(data: typing.Any) -> typing.Any:
+        value = get_path(data, parts)
+        return default(data) if value is _MISSING else value
+
+    return nested_var
+
+
+def _missing_keys(data: typing.Any, keys: typing.Iterable[typing.Any]) -> list:
+    return [
+        key for key in keys if get_path(data, split_path(key)) in (_MISSING, None, "")
+    ]
+
+
+@operation("missing")
+def compile_missing(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+    rule = compile_arg(args)
+
+    def missing(data: typing.Any) -> list:
+        keys = rule(data)
+        if keys and isinstance(keys[0], list):
+            keys = keys[0]
+        return _missing_keys(data, keys)
+
+    return missing
+
+
+@operation("missing_some")
+def compile_missing_some(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+    need = compile_arg(args[0] if args else 0)
+    keys = compile_arg(args[1] if len(args) > 1 else [])
+
+    def missing_some(data: typing.Any) -> list:
+        all_keys = keys(data)
+        missing = _missing_keys(data, all_keys)
+        if len(all_keys) - len(missing) >= need(data):
+            return []
+        return missing
+
+    return missing_some
+
+
+@operation("if", "?:")
+def compile_if(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+    rules = [compile_arg(arg) for arg in args]
+    if len(rules) == 3:
+        condition, then, otherwise = rules
+        return lambda data: then(data) if truthy(condition(data)) else otherwise(data)
+
+    def if_(data: typing.Any) -> typing.Any:
+        for i in range(0, len(rules) - 1, 2):
+            if truthy(rules[i](data)):
+                return rules[i + 1](data)
+        return rules[-1](data) if len(rules) % 2 else None
+
+    return if_
+
+
+@operation("and")
+def compile_and(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+    rules = [compile_arg(arg) for arg in args]
+
+    def and_(data: typing.Any) -> typing.Any:
+        value = None
+        for rule in rules:
+            value = rule(data)
+            if not truthy(value):
+                return value
+        return value
+
+    return and_
+
+
+@operation("or")
+def compile_or(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+    rules = [compile_arg(arg) for arg in args]
+
+    def or_(data: typing.Any) -> typing.Any:
+        value = None
+        for rule in rules:
+            value = rule(data)
+            if truthy(value):
+                return value
+        return value
+
+    return or_
+
+
+def _collection_operation(
+    apply: typing.Callable[[Rule, list], typing.Any],
+) -> OperationCompiler:
+    """Operations that evaluate their second argument against each item"""
+
+    def compile_operation(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+        items = compile_arg(args[0] if args else None)
+        logic = compile_arg(args[1] if len(args) > 1 else None)
+
+        def collection(data: typing.Any) -> typing.Any:
+            values = items(data)
+            return apply(logic, values if isinstance(values, list) else [])
+
+        return collection
+
+    return compile_operation
+
+
+OPERATIONS["map"] = _collection_operation(
+    lambda logic, items: [logic(item) for item in items]
+)
+OPERATIONS["filter"] = _collection_operation(
+    lambda logic, items: [item for item in items if truthy(logic(item))]
+)
+OPERATIONS["all"] = _collection_operation(
+    lambda logic, items: bool(items) and all(truthy(logic(item)) for item in items)
+)
+OPERATIONS["some"] = _collection_operation(
+    lambda logic, items: any(truthy(logic(item)) for item in items)
+)
+OPERATIONS["none"] = _collection_operation(
+    lambda logic, items: not any(truthy(logic(item)) for item in items)
+)
+
+
+@operation("reduce")
+def compile_reduce(args: typing.List[typing.Any], compile_arg: Compiler) -> Rule:
+    items = compile_arg(args[0] if args else None)
+    logic = compile_arg(args[1] if len(args) > 1 else None)
+    initial = compile_arg(args[2] if len(args) > 2 else None)
+
+    def reduce_(data: typing.Any) -> typing.Any:
+        values = items(data)
+        return reduce(
+            lambda accumulator, current: logic(
+                {"current": current, "accumulator": accumulator}
+            ),
+            values if isinstance(values, list) else [],
+            initial(data),
+        )
+
+    return reduce_
+
+
+def to_number(value: typing.Any) -> typing.Union[int, float]:
+    if isinstance(value, str):
+        return float(value) if "." in value else int(value)
+    return value  # type: ignore[no-any-return]
+
+
+def to_string(value: typing.Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return "null"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def soft_equals(a: typing.Any, b: typing.Any) -> bool:
+    if isinstance(a, str) or isinstance(b, str):
+        return to_string(a) == to_string(b)
+    if isinstance(a, bool) or isinstance(b, bool):
+        return bool(a) is bool(b)
+    return a == b  # type: ignore[no-any-return]
+
+
+def hard_equals(a: typing.Any, b: typing.Any) -> bool:
+    def kind(value: typing.Any) -> type:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return float
+        return type(value)
+
+    return kind(a) is kind(b) and bool(a == b)
+
+
+def less(a: typing.Any, b: typing.Any, *others: typing.Any) -> bool:
+    try:
+        if isinstance(a, (int, float)) or isinstance(b, (int, float)):
+            a, b = to_number(a), to_number(b)
+        result = a < b
+    except (TypeError, ValueError):
+        return False
+    return bool(result) and (not others or less(b, *others))
+
+
+def less_or_equal(a: typing.Any, b: typing.Any, *others: typing.Any) -> bool:
+    return (less(a, b) or soft_equals(a, b)) and (
+        not others or less_or_equal(b, *others)
+    )
+
+
+def contains(needle: typing.Any, haystack: typing.Any) -> bool:
+    try:
+        return needle in haystack
+    except TypeError:
+        return False
+
+
+def substr(
+    source: typing.Any, start: int = 0, length: typing.Optional[int] = None
+) -> str:
+    text = to_string(source)
+    start = int(start)
+    if start < 0:
+        start = max(len(text) + start, 0)
+    if length is None:
+        return text[start:]
+    length = int(length)
+    end = len(text) + length if length < 0 else start + length
+    return text[start:end]
+
+
+def merge(*values: typing.Any) -> list:
+    merged: list = []
+    for value in values:
+        merged.extend(value if isinstance(value, list) else [value])
+    return merged
+
+
+def minus(a: typing.Any, b: typing.Any = _MISSING) -> typing.Union[int, float]:
+    if b is _MISSING:
+        return -to_number(a)
+    return to_number(a) - to_number(b)
+
+
+def multiply(*values: typing.Any) -> typing.Union[int, float]:
+    product: typing.Union[int, float] = 1
+    for value in values:
+        product *= to_number(value)
+    return product
+
+
+def log(value: typing.Any) -> typing.Any:
+    logger.info(f"targeting log: {value}")
+    return value
+
+
+eager(soft_equals, "==")
+eager(lambda a, b: not soft_equals(a, b), "!=")
+eager(hard_equals, "===")
+eager(lambda a, b: not hard_equals(a, b), "!==")
+eager(lambda value=None: not truthy(value), "!")
+eager(lambda value=None: truthy(value), "!!")
+eager(less, "<")
+eager(less_or_equal, "<=")
+eager(lambda a, b: less(b, a), ">")
+eager(lambda a, b: less_or_equal(b, a), ">=")
+eager(lambda *values: max(map(to_number, values)) if values else None, "max")
+eager(lambda *values: min(map(to_number, values)) if values else None, "min")
+eager(lambda *values: sum(map(to_number, values)), "+")
+eager(minus, "-")
+eager(multiply, "*")
+eager(lambda a, b: to_number(a) / to_number(b), "/")
+eager(lambda a, b: to_number(a) % to_number(b), "%")
+eager(contains, "in")
+eager(lambda *values: "".join(map(to_string, values)), "cat")
+eager(substr, "substr")
+eager(merge, "merge")
+eager(log, "log", pure=False)
+
+OPERATIONS["fractional"] = custom_ops.compile_fractional
+OPERATIONS["sem_ver"] = custom_ops.compile_sem_ver
+OPERATIONS["starts_with"] = custom_ops.compile_starts_with
+OPERATIONS["ends_with"] = custom_ops.compile_ends_with
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import typing
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+class _Call(typing.Generic[V]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: typing.Optional[V] = None
+        self.error: typing.Optional[BaseException] = None
+
+
+class SingleFlight(typing.Generic[K, V]):
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    function, and callers arriving while it is in flight wait for its outcome
+    instead of running it again
+    """
+
+    def __init__(self) -> None:
+        self._calls: typing.Dict[K, _Call[V]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: K, func: typing.Callable[[], V]) -> V:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return typing.cast(V, call.result)
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight(typing.Generic[K, V]):
+    """Coalesces concurrent coroutine calls with the same key, like SingleFlight"""
+
+    def __init__(self) -> None:
+        self._calls: typing.Dict[K, asyncio.Future[V]] = {}
+
+    async def do(self, key: K, func: typing.Callable[[], typing.Awaitable[V]]) -> V:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        # a cancelled waiter must not cancel the call the other waiters share
+        return await asyncio.shield(future)
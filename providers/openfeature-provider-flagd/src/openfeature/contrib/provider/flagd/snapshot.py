@@ -0,0 +1,71 @@
+import contextvars
+import copy
+import dataclasses
+import typing
+
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import FlagResolutionDetails
+
+from .flag_type import FlagType, check_type
+
+_active_snapshot: "contextvars.ContextVar[typing.Optional[FlagSnapshot]]" = (
+    contextvars.ContextVar("flagd_active_snapshot", default=None)
+)
+
+
+class FlagSnapshot:
+    """
+    All flags resolved in a single call for one evaluation context
+
+    While a snapshot is entered as a context manager, the provider that created
+    it serves ``resolve_*_details`` calls for the same evaluation context from
+    the snapshot instead of resolving every flag individually.
+    """
+
+    def __init__(
+        self,
+        owner: object,
+        evaluation_context: typing.Optional[EvaluationContext],
+        flags: typing.Mapping[str, FlagResolutionDetails],
+    ):
+        self.owner = owner
+        # copied, so that later changes to the caller's context are not missed
+        self.evaluation_context = copy.deepcopy(
+            evaluation_context or EvaluationContext()
+        )
+        self.flags = flags
+        self._tokens: typing.List[contextvars.Token] = []
+
+    def get(
+        self,
+        flag_key: str,
+        flag_type: FlagType,
+        evaluation_context: typing.Optional[EvaluationContext],
+    ) -> typing.Optional[FlagResolutionDetails]:
+        """
+        Returns the flag's resolution from the snapshot, or None when the flag is
+        missing or the evaluation context differs from the snapshot's
+        """
+        details = self.flags.get(flag_key)
+        if details is None:
+            return None
+        if (evaluation_context or EvaluationContext()) != self.evaluation_context:
+            return None
+        value = check_type(flag_key, flag_type, details.value)
+        if value is details.value:
+            return details
+        return dataclasses.replace(details, value=value)
+
+    def __enter__(self) -> "FlagSnapshot":
+        self._tokens.append(_active_snapshot.set(self))
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        _active_snapshot.reset(self._tokens.pop())
+
+
+def active_snapshot(owner: object) -> typing.Optional[FlagSnapshot]:
+    snapshot = _active_snapshot.get()
+    if snapshot is None or snapshot.owner is not owner:
+        return None
+    return snapshot
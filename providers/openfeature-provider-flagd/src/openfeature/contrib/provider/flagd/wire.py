@@ -0,0 +1,91 @@
+"""
+Hand-written protobuf encoding of flagd's single flag resolution requests
+
+Every ResolveXxxRequest has the same shape, ``flag_key = 1`` and
+``context = 2``, so a request can be assembled from the encoded flag key and
+the already serialized evaluation context instead of building and
+serializing a new message for every resolution.
+"""
+
+import functools
+import typing
+
+from .flag_type import FlagType
+from .proto.schema.v1 import schema_pb2
+
+SERVICE_PATH = "/schema.v1.Service/"
+
+# flag type -> (service method name, response message)
+RESOLVE_METHODS: typing.Mapping[FlagType, typing.Tuple[str, typing.Any]] = {
+    FlagType.BOOLEAN: (
+        "ResolveBoolean",
+        schema_pb2.ResolveBooleanResponse,  # type:ignore[attr-defined]
+    ),
+    FlagType.STRING: (
+        "ResolveString",
+        schema_pb2.ResolveStringResponse,  # type:ignore[attr-defined]
+    ),
+    FlagType.FLOAT: (
+        "ResolveFloat",
+        schema_pb2.ResolveFloatResponse,  # type:ignore[attr-defined]
+    ),
+    FlagType.INTEGER: (
+        "ResolveInt",
+        schema_pb2.ResolveIntResponse,  # type:ignore[attr-defined]
+    ),
+    FlagType.OBJECT: (
+        "ResolveObject",
+        schema_pb2.ResolveObjectResponse,  # type:ignore[attr-defined]
+    ),
+}
+
+# field number 1 and 2 with the length-delimited wire type
+_FLAG_KEY_TAG = b"\x0a"
+_CONTEXT_TAG = b"\x12"
+
+
+def encode_varint(value: int) -> bytes:
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    return bytes(encoded)
+
+
+@functools.lru_cache(maxsize=1024)
+def encode_flag_key(flag_key: str) -> bytes:
+    if not flag_key:
+        return b""
+    data = flag_key.encode("utf-8")
+    return _FLAG_KEY_TAG + encode_varint(len(data)) + data
+
+
+def encode_resolve_request(flag_key: str, context_data: bytes) -> bytes:
+    """
+    Returns the wire format of a ResolveXxxRequest for the flag key and the
+    serialized context, as produced by ``Struct.SerializeToString``
+    """
+    return b"".join(
+        (
+            encode_flag_key(flag_key),
+            _CONTEXT_TAG,
+            encode_varint(len(context_data)),
+            context_data,
+        )
+    )
+
+
+def raw_method(
+    channel: typing.Any, method: str, response_type: typing.Any
+) -> typing.Any:
+    """
+    Returns a callable for a unary flagd method which sends requests encoded
+    with ``encode_resolve_request`` as they are. Works for both ``grpc`` and
+    ``grpc.aio`` channels.
+    """
+    return channel.unary_unary(
+        SERVICE_PATH + method,
+        request_serializer=None,
+        response_deserializer=response_type.FromString,
+    )
@@ -1,10 +1,276 @@
+import contextlib
+import json
+import queue
+import time
+import typing
+from concurrent import futures
+
+import grpc
 import pytest
+from google.protobuf.struct_pb2 import Struct
 
 from openfeature import api
 from openfeature.contrib.provider.flagd import FlagdProvider
+from openfeature.contrib.provider.flagd.proto.flagd.sync.v1 import (
+    sync_pb2,
+    sync_pb2_grpc,
+)
+from openfeature.contrib.provider.flagd.proto.schema.v1 import (
+    schema_pb2,
+    schema_pb2_grpc,
+)
+from openfeature.contrib.provider.flagd.proto.sync.v1 import (
+    sync_service_pb2,
+    sync_service_pb2_grpc,
+)
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.event import ProviderEvent
+from openfeature.exception import OpenFeatureError
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition was not met in time")
+        time.sleep(0.01)
+
+
+class FakeFlagdServicer(schema_pb2_grpc.ServiceServicer):
+    """In-memory stand-in for the flagd evaluation service"""
+
+    def __init__(self):
+        # flag key -> (value, reason, variant)
+        self.flags: typing.Dict[str, typing.Tuple[typing.Any, str, str]] = {}
+        self.calls: typing.List[typing.Tuple[str, str, dict]] = []
+        self.events: queue.Queue = queue.Queue()
+        # seconds every resolution takes, to simulate a slow flagd
+        self.delay = 0.0
+        # seconds the next resolutions take, before falling back to delay
+        self.delays: typing.List[float] = []
+        # the number of event streams to fail right away
+        self.failing_streams = 0
+        # whether ResolveAll is served, older flagd versions lack it
+        self.resolve_all = True
+
+    def send_event(self, event_type: str, data: typing.Optional[dict] = None):
+        self.events.put((event_type, data))
+
+    def end_event_stream(self):
+        self.events.put((None, None))
+
+    def _resolve(self, method, request, context, response_type):
+        self.calls.append((method, request.flag_key, dict(request.context.items())))
+        delay = self.delays.pop(0) if self.delays else self.delay
+        if delay:
+            time.sleep(delay)
+        if request.flag_key not in self.flags:
+            context.abort(grpc.StatusCode.NOT_FOUND, "flag not found")
+        value, reason, variant = self.flags[request.flag_key]
+        if isinstance(value, dict):
+            struct = Struct()
+            struct.update(value)
+            value = struct
+        return response_type(value=value, reason=reason, variant=variant)
+
+    def ResolveAll(self, request, context):  # noqa: N802
+        if not self.resolve_all:
+            context.abort(grpc.StatusCode.UNIMPLEMENTED, "method not implemented")
+        self.calls.append(("ResolveAll", None, dict(request.context.items())))
+        response = schema_pb2.ResolveAllResponse()
+        for key, (value, reason, variant) in self.flags.items():
+            flag = response.flags[key]
+            flag.reason, flag.variant = reason, variant
+            if isinstance(value, bool):
+                flag.bool_value = value
+            elif isinstance(value, str):
+                flag.string_value = value
+            elif isinstance(value, (int, float)):
+                flag.double_value = value
+            else:
+                flag.object_value.update(value)
+        return response
+
+    def ResolveBoolean(self, request, context):  # noqa: N802
+        return self._resolve(
+            "ResolveBoolean", request, context, schema_pb2.ResolveBooleanResponse
+        )
+
+    def ResolveString(self, request, context):  # noqa: N802
+        return self._resolve(
+            "ResolveString", request, context, schema_pb2.ResolveStringResponse
+        )
+
+    def ResolveFloat(self, request, context):  # noqa: N802
+        return self._resolve(
+            "ResolveFloat", request, context, schema_pb2.ResolveFloatResponse
+        )
+
+    def ResolveInt(self, request, context):  # noqa: N802
+        return self._resolve(
+            "ResolveInt", request, context, schema_pb2.ResolveIntResponse
+        )
+
+    def ResolveObject(self, request, context):  # noqa: N802
+        return self._resolve(
+            "ResolveObject", request, context, schema_pb2.ResolveObjectResponse
+        )
+
+    def EventStream(self, request, context):  # noqa: N802
+        if self.failing_streams:
+            self.failing_streams -= 1
+            context.abort(grpc.StatusCode.UNAVAILABLE, "unavailable")
+        while context.is_active():
+            try:
+                event_type, data = self.events.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if event_type is None:
+                return
+            struct = Struct()
+            if data:
+                struct.update(data)
+            yield schema_pb2.EventStreamResponse(type=event_type, data=struct)
+
+
+class FakeFlagSyncServicer(sync_pb2_grpc.FlagSyncServiceServicer):
+    """In-memory stand-in for the flagd sync service"""
+
+    def __init__(self):
+        self.configurations: queue.Queue = queue.Queue()
+        self.requests: typing.List[sync_pb2.SyncFlagsRequest] = []
+
+    def send_configuration(self, configuration: typing.Union[dict, str]):
+        if isinstance(configuration, dict):
+            configuration = json.dumps(configuration)
+        self.configurations.put(configuration)
+
+    def SyncFlags(self, request, context):  # noqa: N802
+        self.requests.append(request)
+        while context.is_active():
+            try:
+                configuration = self.configurations.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            yield sync_pb2.SyncFlagsResponse(flag_configuration=configuration)
+
+
+class FakeLegacyFlagSyncServicer(sync_service_pb2_grpc.FlagSyncServiceServicer):
+    """In-memory stand-in for flagd's deprecated sync service, streaming deltas"""
+
+    def __init__(self):
+        self.messages: queue.Queue = queue.Queue()
+
+    def send(self, state: int, configuration: typing.Union[dict, str] = ""):
+        if isinstance(configuration, dict):
+            configuration = json.dumps(configuration)
+        self.messages.put((state, configuration))
+
+    def SyncFlags(self, request, context):  # noqa: N802
+        while context.is_active():
+            try:
+                state, configuration = self.messages.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            yield sync_service_pb2.SyncFlagsResponse(
+                flag_configuration=configuration, state=state
+            )
+
+
+@pytest.fixture()
+def wait_for():
+    return _wait_for
+
+
+@pytest.fixture()
+def flag_configuration():
+    """A flag configuration with a single boolean flag, as flagd syncs it"""
+    return {
+        "flags": {
+            "flag": {
+                "state": "ENABLED",
+                "variants": {"on": True, "off": False},
+                "defaultVariant": "on",
+            }
+        }
+    }
+
+
+@pytest.fixture()
+def unstarted_flagd_server(tmp_path):
+    """A flagd_server which only serves once its start() was called"""
+    servicer = FakeFlagdServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    schema_pb2_grpc.add_ServiceServicer_to_server(servicer, server)
+    servicer.port = server.add_insecure_port("localhost:0")
+    servicer.socket_path = str(tmp_path / "flagd.sock")
+    server.add_insecure_port(f"unix:{servicer.socket_path}")
+    servicer.start = server.start
+    yield servicer
+    server.stop(grace=None)
+
+
+@pytest.fixture()
+def flagd_server(unstarted_flagd_server):
+    unstarted_flagd_server.start()
+    return unstarted_flagd_server
+
+
+@pytest.fixture()
+def flagd_sync_server():
+    servicer = FakeFlagSyncServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    sync_pb2_grpc.add_FlagSyncServiceServicer_to_server(servicer, server)
+    servicer.port = server.add_insecure_port("localhost:0")
+    server.start()
+    yield servicer
+    server.stop(grace=None)
+
+
+@pytest.fixture()
+def flagd_legacy_sync_server():
+    servicer = FakeLegacyFlagSyncServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=8))
+    sync_service_pb2_grpc.add_FlagSyncServiceServicer_to_server(servicer, server)
+    servicer.port = server.add_insecure_port("localhost:0")
+    server.start()
+    yield servicer
+    server.stop(grace=None)
 
 
 @pytest.fixture()
 def flagd_provider_client():
     api.set_provider(FlagdProvider())
     return api.get_client()
+
+
+@pytest.fixture()
+def connected_provider(flagd_server):
+    """
+    Creates providers connected to flagd_server whose event stream is open, as
+    it is after the first resolution once flagd reported ready. The
+    resolutions made on the way are left out of the calls of the server.
+    """
+    providers = []
+
+    def connect(**kwargs) -> FlagdProvider:
+        provider = FlagdProvider(port=flagd_server.port, **kwargs)
+        providers.append(provider)
+        events = []
+        provider.emit = lambda event, details: events.append(event)
+        provider.initialize(EvaluationContext())
+        with contextlib.suppress(OpenFeatureError):
+            # whatever flagd answers, the first resolution opens the channels
+            # along with the event stream
+            provider.resolve_boolean_details("flag", False)
+        flagd_server.send_event("provider_ready")
+        # events are handled in order, the change is seen once ready was
+        flagd_server.send_event("configuration_change")
+        _wait_for(lambda: ProviderEvent.PROVIDER_CONFIGURATION_CHANGED in events)
+        del provider.emit
+        flagd_server.calls.clear()
+        return provider
+
+    yield connect
+    for provider in providers:
+        provider.shutdown()
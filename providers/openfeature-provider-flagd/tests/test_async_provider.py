@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from openfeature.contrib.provider.flagd import AsyncFlagdProvider
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import ErrorCode, FlagNotFoundError
+from openfeature.flag_evaluation import Reason
+
+
+@pytest.fixture()
+def provider(flagd_server):
+    flagd_server.flags.update(
+        {
+            "bool-flag": (True, "STATIC", "on"),
+            "string-flag": ("blue", "TARGETING_MATCH", "blue"),
+            "object-flag": ({"key": "value"}, "STATIC", "full"),
+        }
+    )
+    return AsyncFlagdProvider(port=flagd_server.port)
+
+
+def test_resolves_flags_asynchronously(provider, flagd_server):
+    async def resolve():
+        context = EvaluationContext("user", {"plan": "free"})
+        boolean = await provider.resolve_boolean_details("bool-flag", False, context)
+        obj = await provider.resolve_object_details("object-flag", {})
+        await provider.shutdown()
+        return boolean, obj
+
+    boolean, obj = asyncio.run(resolve())
+
+    assert (boolean.value, boolean.variant, boolean.reason) == (True, "on", "STATIC")
+    assert obj.value == {"key": "value"}
+    assert flagd_server.calls[0] == (
+        "ResolveBoolean",
+        "bool-flag",
+        {"targetingKey": "user", "plan": "free"},
+    )
+
+
+def test_maps_grpc_errors(provider):
+    async def resolve():
+        try:
+            await provider.resolve_boolean_details("missing-flag", False)
+        finally:
+            await provider.shutdown()
+
+    with pytest.raises(FlagNotFoundError):
+        asyncio.run(resolve())
+
+
+def test_resolve_many_fans_out_concurrently(provider, flagd_server):
+    async def resolve():
+        try:
+            return await provider.resolve_many(
+                {"bool-flag": False, "string-flag": "red", "missing-flag": 1}
+            )
+        finally:
+            await provider.shutdown()
+
+    resolved = asyncio.run(resolve())
+
+    assert resolved["bool-flag"].value is True
+    assert resolved["string-flag"].value == "blue"
+    assert resolved["string-flag"].reason == Reason.TARGETING_MATCH
+    assert resolved["missing-flag"].value == 1
+    assert resolved["missing-flag"].error_code == ErrorCode.FLAG_NOT_FOUND
+    assert sorted(call[0] for call in flagd_server.calls) == [
+        "ResolveBoolean",
+        "ResolveInt",
+        "ResolveString",
+    ]
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openfeature.contrib.provider.flagd import FlagdProvider
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import TypeMismatchError
+
+
+@pytest.fixture
+def batching_provider(flagd_server):
+    provider = FlagdProvider(
+        port=flagd_server.port, batch_window_ms=50, batch_max_size=1000
+    )
+    yield provider
+    provider.shutdown()
+
+
+def test_concurrent_resolutions_share_resolve_all_calls(
+    flagd_server, batching_provider
+):
+    for i in range(8):
+        flagd_server.flags[f"flag-{i}"] = (i % 2 == 0, "STATIC", "on")
+    contexts = [EvaluationContext("alice"), EvaluationContext("bob")]
+
+    def resolve(i):
+        return batching_provider.resolve_boolean_details(
+            f"flag-{i % 8}", False, contexts[i % 2]
+        )
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(resolve, range(16)))
+
+    assert [result.value for result in results] == [i % 2 == 0 for i in range(16)]
+    methods = [method for method, _, _ in flagd_server.calls]
+    assert set(methods) == {"ResolveAll"}
+    assert len(methods) < 16
+
+
+def test_batched_resolution_checks_flag_type(flagd_server, batching_provider):
+    flagd_server.flags["flag"] = ("blue", "STATIC", "blue")
+
+    with pytest.raises(TypeMismatchError):
+        batching_provider.resolve_boolean_details("flag", False)
+    assert batching_provider.resolve_string_details("flag", "red").value == "blue"
+
+
+def test_flags_missing_from_batch_fall_back_to_single_resolution(
+    flagd_server, batching_provider
+):
+    flagd_server.flags["count"] = (3, "STATIC", "three")
+
+    details = batching_provider.resolve_integer_details("count", 1)
+
+    assert details.value == 3
+    assert isinstance(details.value, int)
+    assert details.variant == "three"
@@ -0,0 +1,121 @@
+from openfeature.contrib.provider.flagd import FlagdProvider
+from openfeature.contrib.provider.flagd.cache import LRUCache
+from openfeature.contrib.provider.flagd.config import CacheType
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import Reason
+
+
+def test_lru_cache_evicts_least_recently_used_entry():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_drops_writes_from_previous_generation():
+    cache = LRUCache(max_size=2)
+    generation = cache.generation
+
+    cache.clear()
+    cache.put("a", 1, generation)
+
+    assert cache.get("a") is None
+
+
+def test_lru_cache_invalidates_groups():
+    cache = LRUCache(max_size=3, group_of=lambda key: key[0])
+    cache.put(("a", 1), 1)
+    cache.put(("a", 2), 2)
+    cache.put(("b", 1), 3)
+    generation = cache.generation
+
+    cache.invalidate(["a", "missing"])
+    cache.put(("a", 3), 4, generation)
+
+    assert cache.get(("a", 1)) is None
+    assert cache.get(("a", 2)) is None
+    assert cache.get(("a", 3)) is None
+    assert cache.get(("b", 1)) == 3
+    assert len(cache) == 1
+
+
+def test_lru_cache_forgets_groups_of_evicted_entries():
+    cache = LRUCache(max_size=1, group_of=lambda key: key[0])
+    cache.put(("a", 1), 1)
+    cache.put(("b", 1), 2)
+
+    cache.invalidate(["a"])
+
+    assert cache.get(("b", 1)) == 2
+    assert cache._groups == {"b": {("b", 1)}}
+
+
+def test_cache_is_disabled_by_default(flagd_server):
+    provider = FlagdProvider(port=flagd_server.port)
+    assert provider.resolver.cache is None
+    provider.shutdown()
+
+
+def test_caches_static_resolutions_until_configuration_changes(
+    flagd_server, connected_provider, wait_for
+):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider = connected_provider(cache_type=CacheType.LRU)
+    context = EvaluationContext("user", {"email": "user@example.com"})
+
+    first = provider.resolve_boolean_details("flag", False, context)
+    second = provider.resolve_boolean_details("flag", False, context)
+
+    assert first.reason == Reason.STATIC
+    assert second.reason == Reason.CACHED
+    assert second.value is True
+    assert len(flagd_server.calls) == 1
+
+    flagd_server.send_event("configuration_change")
+    wait_for(lambda: len(provider.resolver.cache) == 0)
+    provider.resolve_boolean_details("flag", False, context)
+
+    assert len(flagd_server.calls) == 2
+
+
+def test_does_not_cache_targeted_resolutions(flagd_server, connected_provider):
+    flagd_server.flags["flag"] = ("blue", "TARGETING_MATCH", "blue")
+    provider = connected_provider(cache_type=CacheType.LRU)
+
+    provider.resolve_string_details("flag", "red")
+    provider.resolve_string_details("flag", "red")
+
+    assert len(flagd_server.calls) == 2
+
+
+def test_does_not_cache_without_event_stream(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider = FlagdProvider(port=flagd_server.port, cache_type=CacheType.LRU)
+
+    provider.resolve_boolean_details("flag", False)
+    provider.resolve_boolean_details("flag", False)
+
+    assert len(flagd_server.calls) == 2
+    provider.shutdown()
+
+
+def test_invalidates_only_changed_flags(flagd_server, connected_provider, wait_for):
+    flagd_server.flags["a"] = (True, "STATIC", "on")
+    flagd_server.flags["b"] = (True, "STATIC", "on")
+    provider = connected_provider(cache_type=CacheType.LRU)
+    provider.resolve_boolean_details("a", False)
+    provider.resolve_boolean_details("b", False)
+
+    flagd_server.send_event("configuration_change", {"flags": {"a": {}}})
+    wait_for(lambda: len(provider.resolver.cache) == 1)
+
+    assert provider.resolve_boolean_details("a", False).reason == Reason.STATIC
+    assert provider.resolve_boolean_details("b", False).reason == Reason.CACHED
+    assert [key for _, key, _ in flagd_server.calls] == ["a", "b", "a"]
@@ -0,0 +1,48 @@
+import asyncio
+import os
+
+from openfeature.contrib.provider.flagd import AsyncFlagdProvider, FlagdProvider
+from openfeature.contrib.provider.flagd.channel import channel_target
+from openfeature.contrib.provider.flagd.config import Config
+
+
+def test_channel_target_prefers_socket_path(monkeypatch):
+    assert channel_target(Config(host="flagd", port=1234)) == "flagd:1234"
+
+    monkeypatch.setenv("FLAGD_SOCKET_PATH", "/var/run/flagd.sock")
+    assert channel_target(Config(host="flagd")) == "unix:/var/run/flagd.sock"
+
+
+def test_provider_resolves_over_unix_socket(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider = FlagdProvider(port=1, socket_path=flagd_server.socket_path)
+
+    details = provider.resolve_boolean_details("flag", False)
+
+    assert details.value is True
+    assert len(flagd_server.calls) == 1
+    provider.shutdown()
+
+
+def test_provider_resolves_over_relative_unix_socket_path(flagd_server, monkeypatch):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    monkeypatch.chdir(os.path.dirname(flagd_server.socket_path))
+    provider = FlagdProvider(
+        port=1, socket_path=os.path.basename(flagd_server.socket_path)
+    )
+
+    assert provider.resolve_boolean_details("flag", False).value is True
+    provider.shutdown()
+
+
+def test_async_provider_resolves_over_unix_socket(flagd_server):
+    flagd_server.flags["flag"] = ("blue", "STATIC", "blue")
+    provider = AsyncFlagdProvider(port=1, socket_path=flagd_server.socket_path)
+
+    async def run():
+        try:
+            return await provider.resolve_string_details("flag", "red")
+        finally:
+            await provider.shutdown()
+
+    assert asyncio.run(run()).value == "blue"
@@ -0,0 +1,164 @@
+import time
+
+import pytest
+
+from openfeature import api
+from openfeature.contrib.provider.flagd import FlagdProvider, deadline
+from openfeature.contrib.provider.flagd.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+)
+from openfeature.contrib.provider.flagd.resolvers.grpc import CIRCUIT_OPEN_REASON
+from openfeature.event import ProviderEvent
+from openfeature.exception import GeneralError
+
+
+def breaker(changes, **kwargs):
+    options = {"failure_rate": 0.5, "slow_call": 1.0, "open_duration": 0.05}
+    options.update(kwargs)
+    return CircuitBreaker(
+        window=10, min_calls=4, on_state_change=changes.append, **options
+    )
+
+
+def test_opens_once_enough_calls_failed():
+    changes = []
+    circuit = breaker(changes)
+    for _ in range(3):
+        circuit.record_failure()
+    assert circuit.allow()
+
+    circuit.record_call(0.01)
+    circuit.record_failure()
+
+    assert changes == [CircuitState.OPEN]
+    assert not circuit.allow()
+
+
+def test_opens_once_enough_calls_were_slow():
+    changes = []
+    circuit = breaker(changes)
+    for latency in [0.1, 2.0, 0.1, 1.5]:
+        circuit.record_call(latency)
+
+    assert changes == [CircuitState.OPEN]
+
+
+def test_failures_leave_the_window():
+    changes = []
+    circuit = breaker(changes)
+    for _ in range(4):
+        circuit.record_failure()
+        for _ in range(3):
+            circuit.record_call(0.01)
+
+    assert changes == []
+
+
+def test_probes_half_open_after_open_duration():
+    changes = []
+    circuit = breaker(changes)
+    for _ in range(4):
+        circuit.record_failure()
+
+    time.sleep(0.06)
+    assert circuit.allow()
+    # only the probe is let through
+    assert not circuit.allow()
+    circuit.record_failure()
+    assert not circuit.allow()
+
+    time.sleep(0.06)
+    assert circuit.allow()
+    circuit.record_call(0.01)
+
+    assert changes == [
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.CLOSED,
+    ]
+    assert circuit.allow()
+
+
+def test_provider_fails_fast_while_circuit_is_open(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    flagd_server.delay = 0.02
+    events = []
+    provider = FlagdProvider(
+        port=flagd_server.port,
+        circuit_breaker=True,
+        circuit_breaker_slow_call_ms=10,
+        circuit_breaker_open_ms=100,
+    )
+    provider.emit = lambda event, details: events.append((event, details))
+    for _ in range(20):
+        provider.resolve_boolean_details("flag", False)
+
+    details = provider.resolve_boolean_details("flag", False)
+    assert (details.value, details.reason) == (False, CIRCUIT_OPEN_REASON)
+    assert details.error_code is None
+    assert len(flagd_server.calls) == 20
+
+    flagd_server.delay = 0
+    time.sleep(0.11)
+    assert provider.resolve_boolean_details("flag", False).value is True
+
+    assert [event for event, _ in events] == [
+        ProviderEvent.PROVIDER_ERROR,
+        ProviderEvent.PROVIDER_ERROR,
+        ProviderEvent.PROVIDER_READY,
+    ]
+    assert [details.metadata for _, details in events] == [
+        {"circuit_breaker": "open"},
+        {"circuit_breaker": "half-open"},
+        {"circuit_breaker": "closed"},
+    ]
+    provider.shutdown()
+
+
+def test_client_tells_open_circuit_from_provider_not_ready(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider = FlagdProvider(port=flagd_server.port, circuit_breaker=True)
+    api.set_provider(provider)
+    for _ in range(20):
+        provider.resolver.circuit_breaker.record_failure()
+
+    details = api.get_client().get_boolean_details("flag", False)
+
+    assert (details.value, details.reason) == (False, CIRCUIT_OPEN_REASON)
+    assert details.error_code is None
+    assert flagd_server.calls == []
+    api.clear_providers()
+
+
+def test_caller_deadlines_do_not_open_the_circuit(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    flagd_server.delay = 0.05
+    provider = FlagdProvider(port=flagd_server.port, circuit_breaker=True)
+    for _ in range(25):
+        with deadline(0.005), pytest.raises(GeneralError):
+            provider.resolve_boolean_details("flag", False)
+
+    flagd_server.delay = 0
+    assert provider.resolve_boolean_details("flag", False).value is True
+    assert provider.resolver.circuit_breaker.state == CircuitState.CLOSED
+    provider.shutdown()
+
+
+def test_checks_the_circuit_once_per_resolution(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider = FlagdProvider(
+        port=flagd_server.port, circuit_breaker=True, batch_window_ms=1
+    )
+    resolver = provider.resolver
+    allowed = []
+    allow = resolver.circuit_breaker.allow
+    resolver.circuit_breaker.allow = lambda: allowed.append(True) or allow()
+    # flagd left the flag out of the batch, it is then resolved on its own
+    resolver.dispatcher.submit = lambda *args: None
+
+    assert provider.resolve_boolean_details("flag", False).value is True
+    assert allowed == [True]
+    provider.shutdown()
@@ -1,4 +1,9 @@
-from openfeature.contrib.provider.flagd.config import Config
+from openfeature.contrib.provider.flagd.config import (
+    CacheType,
+    ChannelSelection,
+    Config,
+    SyncProtocol,
+)
 
 
 def test_return_default_values():
@@ -7,6 +12,24 @@ def test_return_default_values():
     assert config.port == 8013
     assert config.tls is False
     assert config.timeout == 5
+    assert config.cache_type == CacheType.DISABLED
+    assert config.max_cache_size == 1000
+    assert config.coalesce_requests is False
+    assert config.batch_window_ms == 0
+    assert config.batch_max_size == 100
+    assert config.channel_pool_size == 1
+    assert config.channel_selection == ChannelSelection.ROUND_ROBIN
+    assert config.keepalive_time_ms is None
+    assert config.warm_up is False
+    assert config.sync_protocol == SyncProtocol.FLAGD_SYNC_V1
+    assert config.max_staleness_ms == 0
+    assert config.max_stale_entries == 1000
+    assert config.refresh_after_ms == 1000
+    assert config.hedge_requests is False
+    assert config.circuit_breaker is False
+    assert config.circuit_breaker_failure_rate == 0.5
+    assert config.circuit_breaker_slow_call_ms == 1000
+    assert config.circuit_breaker_open_ms == 30000
 
 
 def test_overrides_defaults_with_environment(monkeypatch):
@@ -27,3 +50,12 @@ def test_uses_arguments_over_environments_and_defaults(monkeypatch):
     assert config.host == "flagd2"
     assert config.port == 12345
     assert config.tls is True
+
+
+def test_cache_is_configurable_through_environment(monkeypatch):
+    monkeypatch.setenv("FLAGD_CACHE", "lru")
+    monkeypatch.setenv("FLAGD_MAX_CACHE_SIZE", "10")
+
+    config = Config()
+    assert config.cache_type == CacheType.LRU
+    assert config.max_cache_size == 10
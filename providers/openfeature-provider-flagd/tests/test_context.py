@@ -0,0 +1,58 @@
+import pytest
+
+from openfeature.contrib.provider.flagd.context import (
+    ContextSerializer,
+    convert_context,
+)
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import InvalidContextError
+
+
+def test_serializer_reuses_struct_for_equal_contexts():
+    serializer = ContextSerializer()
+
+    first = serializer.serialize(EvaluationContext("user", {"plan": "free"}))
+    second = serializer.serialize(EvaluationContext("user", {"plan": "free"}))
+
+    assert first.struct is second.struct
+    assert first.data == convert_context(
+        EvaluationContext("user", {"plan": "free"})
+    ).SerializeToString(deterministic=True)
+
+
+def test_serializer_notices_changed_contexts():
+    serializer = ContextSerializer()
+    context = EvaluationContext("user", {"plan": "free"})
+    first = serializer.serialize(context)
+
+    context.attributes["plan"] = "pro"
+    second = serializer.serialize(context)
+
+    assert second.struct["plan"] == "pro"
+    assert first.data != second.data
+
+
+@pytest.mark.parametrize(
+    "attributes",
+    [
+        {"value": True},
+        {"value": 1},
+        {"value": [1, {"nested": "list"}]},
+        {"value": {"nested": {"deeply": 1.5}}},
+    ],
+)
+def test_serializer_matches_fresh_conversion(attributes):
+    serializer = ContextSerializer()
+    context = EvaluationContext("user", attributes)
+
+    # prime the memo with values that are equal in Python but not on the wire
+    serializer.serialize(EvaluationContext("user", {"value": 1.0}))
+
+    assert serializer.serialize(context).struct == convert_context(context)
+
+
+def test_serializer_rejects_unsupported_attributes():
+    serializer = ContextSerializer()
+
+    with pytest.raises(InvalidContextError):
+        serializer.serialize(EvaluationContext("user", {"value": object()}))
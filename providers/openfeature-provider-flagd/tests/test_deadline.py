@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+
+from openfeature.contrib.provider.flagd import (
+    AsyncFlagdProvider,
+    FlagdProvider,
+    deadline,
+)
+from openfeature.contrib.provider.flagd.deadline import remaining_timeout
+from openfeature.contrib.provider.flagd.latency import LatencyWindow
+from openfeature.exception import GeneralError
+
+
+@pytest.fixture()
+def flagd(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    return flagd_server
+
+
+def test_nested_deadlines_only_shorten_the_time_left():
+    assert remaining_timeout(5) == 5
+    with deadline(10):
+        assert remaining_timeout(5) == 5
+        assert 9 < remaining_timeout(60) <= 10
+        with deadline(0.5):
+            assert remaining_timeout(5) <= 0.5
+        with deadline(60):
+            assert 5 < remaining_timeout(60) <= 10
+    assert remaining_timeout(5) == 5
+
+
+def test_resolutions_inherit_the_callers_deadline(flagd):
+    flagd.delay = 1.0
+    provider = FlagdProvider(port=flagd.port)
+
+    started = time.monotonic()
+    with deadline(0.1), pytest.raises(GeneralError):
+        provider.resolve_boolean_details("flag", False)
+
+    assert time.monotonic() - started < 0.5
+    provider.shutdown()
+
+
+def test_does_not_call_flagd_after_the_deadline(flagd):
+    provider = FlagdProvider(port=flagd.port)
+
+    with deadline(0), pytest.raises(GeneralError):
+        provider.resolve_boolean_details("flag", False)
+
+    assert flagd.calls == []
+    provider.shutdown()
+
+
+def test_async_resolutions_inherit_the_callers_deadline(flagd):
+    flagd.delay = 1.0
+    provider = AsyncFlagdProvider(port=flagd.port)
+
+    async def resolve():
+        with deadline(0.1):
+            return await provider.resolve_boolean_details("flag", False)
+
+    async def run():
+        try:
+            with pytest.raises(GeneralError):
+                await asyncio.create_task(resolve())
+        finally:
+            await provider.shutdown()
+
+    asyncio.run(run())
+
+
+def test_latency_window_tracks_percentile():
+    window = LatencyWindow(0.95, size=100, min_samples=20, refresh=10)
+    for latency in range(19):
+        window.record(latency)
+    assert window.value() is None
+
+    window.record(19)
+    assert window.value() == 18
+    for latency in range(20, 100):
+        window.record(latency)
+    assert window.value() == 94
+
+
+def test_hedges_slow_requests_on_another_channel(flagd):
+    provider = FlagdProvider(port=flagd.port, channel_pool_size=2, hedge_requests=True)
+    for _ in range(20):
+        provider.resolver.latencies.record(0.05)
+    flagd.delays = [1.0]
+
+    started = time.monotonic()
+    details = provider.resolve_boolean_details("flag", False)
+
+    assert details.value is True
+    assert time.monotonic() - started < 0.5
+    assert len(flagd.calls) == 2
+    provider.shutdown()
+
+
+def test_does_not_hedge_fast_requests(flagd):
+    provider = FlagdProvider(port=flagd.port, channel_pool_size=2, hedge_requests=True)
+    for _ in range(20):
+        provider.resolver.latencies.record(0.5)
+
+    assert provider.resolve_boolean_details("flag", False).value is True
+    assert len(flagd.calls) == 1
+    provider.shutdown()
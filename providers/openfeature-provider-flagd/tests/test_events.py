@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from openfeature.contrib.provider.flagd.backoff import Backoff
+from openfeature.event import ProviderEvent
+
+
+@pytest.fixture()
+def events():
+    return []
+
+
+@pytest.fixture()
+def provider(connected_provider, events):
+    provider = connected_provider(retry_backoff_ms=10)
+    provider.emit = lambda event, details: events.append((event, details))
+    return provider
+
+
+def test_emits_changed_flag_keys(provider, flagd_server, events, wait_for):
+    flagd_server.send_event("provider_ready")
+    flagd_server.send_event(
+        "configuration_change", {"flags": {"b": {"type": "write"}, "a": {}}}
+    )
+    flagd_server.send_event("configuration_change")
+    wait_for(lambda: len(events) == 2)
+
+    assert [event for event, _ in events] == [
+        ProviderEvent.PROVIDER_CONFIGURATION_CHANGED,
+        ProviderEvent.PROVIDER_CONFIGURATION_CHANGED,
+    ]
+    assert events[0][1].flags_changed == ["a", "b"]
+    # flagd did not say which flags changed
+    assert events[1][1].flags_changed is None
+
+
+def test_reports_stale_then_ready_after_reconnecting(
+    provider, flagd_server, events, wait_for
+):
+    flagd_server.send_event("provider_ready")
+    flagd_server.end_event_stream()
+    wait_for(lambda: events)
+    flagd_server.send_event("provider_ready")
+    wait_for(lambda: len(events) == 2)
+
+    assert [event for event, _ in events] == [
+        ProviderEvent.PROVIDER_STALE,
+        ProviderEvent.PROVIDER_READY,
+    ]
+
+
+def test_reports_error_when_reconnecting_fails(
+    provider, flagd_server, events, wait_for
+):
+    flagd_server.failing_streams = 2
+    flagd_server.end_event_stream()
+    wait_for(lambda: len(events) == 2)
+    flagd_server.send_event("provider_ready")
+    wait_for(lambda: len(events) == 3)
+
+    assert [event for event, _ in events] == [
+        ProviderEvent.PROVIDER_STALE,
+        ProviderEvent.PROVIDER_ERROR,
+        ProviderEvent.PROVIDER_READY,
+    ]
+
+
+def test_backoff_grows_exponentially_with_jitter():
+    random.seed(3)
+    backoff = Backoff(1.0, 5.0)
+    delays = [backoff.next() for _ in range(6)]
+
+    for delay, ceiling in zip(delays, [1, 2, 4, 5, 5, 5]):
+        assert 0 <= delay <= ceiling
+    assert len(set(delays)) == len(delays)
+
+    backoff.reset()
+    assert backoff.next() <= 1.0
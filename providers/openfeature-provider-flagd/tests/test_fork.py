@@ -0,0 +1,144 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from openfeature.contrib.provider.flagd import CacheType, FlagdProvider, ResolverType
+from openfeature.contrib.provider.flagd.fork import _after_fork_in_child
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import Reason
+
+
+def test_grpc_resolver_connects_on_first_use(flagd_server):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider = FlagdProvider(port=flagd_server.port)
+
+    assert not hasattr(provider.resolver, "pool")
+    assert provider.resolve_boolean_details("flag", False).value is True
+    assert len(provider.resolver.pool.channels) == 1
+    provider.shutdown()
+
+
+def test_grpc_resolver_reconnects_lazily_after_fork(flagd_server, wait_for):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider = FlagdProvider(port=flagd_server.port, cache_type=CacheType.LRU)
+    provider.initialize(EvaluationContext())
+    resolver = provider.resolver
+    assert provider.resolve_boolean_details("flag", False).value is True
+    inherited_pool, inherited_cache = resolver.pool, resolver.cache
+
+    _after_fork_in_child()
+
+    assert resolver.pool is inherited_pool
+    assert provider.resolve_boolean_details("flag", False).value is True
+    assert resolver.pool is not inherited_pool
+    assert resolver.cache is not inherited_cache
+    # the event stream feeding the cache is restarted in the child
+    flagd_server.send_event("provider_ready")
+    wait_for(
+        lambda: provider.resolve_boolean_details("flag", False).reason == Reason.CACHED
+    )
+    provider.shutdown()
+
+
+def test_in_process_resolver_connects_when_initialized(
+    flagd_sync_server, flag_configuration
+):
+    flagd_sync_server.send_configuration(flag_configuration)
+    provider = FlagdProvider(
+        port=flagd_sync_server.port, resolver_type=ResolverType.IN_PROCESS
+    )
+
+    assert provider.resolver.channel is None
+    provider.initialize(EvaluationContext())
+    assert provider.resolver.channel is not None
+    assert provider.resolve_boolean_details("flag", False).value is True
+    provider.shutdown()
+
+
+def test_in_process_resolver_keeps_flags_after_fork(
+    flagd_sync_server, flag_configuration, wait_for
+):
+    flagd_sync_server.send_configuration(flag_configuration)
+    provider = FlagdProvider(
+        port=flagd_sync_server.port, resolver_type=ResolverType.IN_PROCESS
+    )
+    provider.initialize(EvaluationContext())
+    inherited_channel = provider.resolver.channel
+
+    _after_fork_in_child()
+
+    # flags are served from the inherited store while the sync stream
+    # reconnects in the background
+    assert provider.resolve_boolean_details("flag", False).value is True
+    assert provider.resolver.channel is not inherited_channel
+    wait_for(lambda: len(flagd_sync_server.requests) == 2)
+    provider.shutdown()
+
+
+# forks a worker the way pre-fork servers do, which resolves a flag with the
+# provider created by its parent
+FORKING_CLIENT = """
+import os, sys
+from openfeature.contrib.provider.flagd import FlagdProvider
+
+provider = FlagdProvider(port=int(sys.argv[1]))
+pid = os.fork()
+if pid == 0:
+    print(provider.resolve_string_details("flag", "red").value, flush=True)
+    os._exit(0)
+os.waitpid(pid, 0)
+print(provider.resolve_string_details("flag", "red").value)
+"""
+
+
+# the same, but with the provider registered with the SDK, which initializes
+# it, before forking
+FORKING_SDK_CLIENT = """
+import os, sys, time
+from openfeature import api
+from openfeature.contrib.provider.flagd import FlagdProvider
+
+api.set_provider(FlagdProvider(port=int(sys.argv[1])))
+time.sleep(0.2)
+client = api.get_client()
+pid = os.fork()
+if pid == 0:
+    print(client.get_string_value("flag", "red"), flush=True)
+    os._exit(0)
+os.waitpid(pid, 0)
+print(client.get_string_value("flag", "red"))
+"""
+
+
+def run_client(script, port):
+    # the client runs in its own interpreter, as forking a process that
+    # also runs a gRPC server is not supported
+    return subprocess.run(
+        [sys.executable, "-c", script, str(port)],  # noqa: S603
+        capture_output=True,
+        text=True,
+        timeout=30,
+        check=True,
+    )
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_provider_resolves_in_forked_child(flagd_server):
+    flagd_server.flags["flag"] = ("blue", "STATIC", "blue")
+
+    result = run_client(FORKING_CLIENT, flagd_server.port)
+
+    assert result.stdout.split() == ["blue", "blue"]
+    assert len(flagd_server.calls) == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_initialized_provider_resolves_in_forked_child(flagd_server):
+    flagd_server.flags["flag"] = ("blue", "STATIC", "blue")
+
+    result = run_client(FORKING_SDK_CLIENT, flagd_server.port)
+
+    assert result.stdout.split() == ["blue", "blue"]
+    assert len(flagd_server.calls) == 2
@@ -0,0 +1,200 @@
+import json
+
+import pytest
+
+from openfeature.contrib.provider.flagd import FlagdProvider, ResolverType
+from openfeature.contrib.provider.flagd.resolvers.process.flags import (
+    Flag,
+    FlagStore,
+    parse_flag_configuration,
+)
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import (
+    FlagNotFoundError,
+    ParseError,
+    ProviderNotReadyError,
+    TypeMismatchError,
+)
+from openfeature.flag_evaluation import Reason
+
+FLAGS = {
+    "flags": {
+        "bool-flag": {
+            "state": "ENABLED",
+            "variants": {"on": True, "off": False},
+            "defaultVariant": "on",
+        },
+        "string-flag": {
+            "state": "ENABLED",
+            "variants": {"red": "red", "blue": "blue"},
+            "defaultVariant": "blue",
+        },
+        "int-flag": {
+            "state": "ENABLED",
+            "variants": {"one": 1, "two": 2},
+            "defaultVariant": "two",
+        },
+        "float-flag": {
+            "state": "ENABLED",
+            "variants": {"half": 0.5, "one": 1},
+            "defaultVariant": "one",
+        },
+        "object-flag": {
+            "state": "ENABLED",
+            "variants": {"empty": {}, "full": {"key": "value"}},
+            "defaultVariant": "full",
+        },
+        "targeted-flag": {
+            "state": "ENABLED",
+            "variants": {"red": "red", "blue": "blue", "green": "green"},
+            "defaultVariant": "blue",
+            "targeting": {
+                "if": [
+                    {"$ref": "is_internal"},
+                    "red",
+                    {"==": [{"var": "plan"}, "free"]},
+                    "green",
+                    None,
+                ]
+            },
+        },
+        "disabled-flag": {
+            "state": "DISABLED",
+            "variants": {"on": True, "off": False},
+            "defaultVariant": "on",
+        },
+    },
+    "$evaluators": {
+        "is_internal": {"ends_with": [{"var": "email"}, "@example.com"]},
+    },
+}
+
+
+@pytest.fixture()
+def provider(flagd_sync_server):
+    flagd_sync_server.send_configuration(FLAGS)
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS, port=flagd_sync_server.port
+    )
+    provider.initialize(EvaluationContext())
+    yield provider
+    provider.shutdown()
+
+
+def test_in_process_resolver_uses_sync_port_by_default():
+    provider = FlagdProvider(resolver_type=ResolverType.IN_PROCESS)
+    assert provider.config.port == 8015
+    provider.shutdown()
+
+
+def test_resolves_flags_locally(provider):
+    boolean = provider.resolve_boolean_details("bool-flag", False)
+    assert boolean.value is True
+    assert boolean.variant == "on"
+    assert boolean.reason == Reason.STATIC
+    assert provider.resolve_string_details("string-flag", "").value == "blue"
+    assert provider.resolve_integer_details("int-flag", 0).value == 2
+    float_details = provider.resolve_float_details("float-flag", 0.0)
+    assert float_details.value == 1.0
+    assert isinstance(float_details.value, float)
+    assert provider.resolve_object_details("object-flag", {}).value == {"key": "value"}
+
+
+def test_evaluates_targeting_rules(provider):
+    internal = EvaluationContext("user", {"email": "user@example.com"})
+    free = EvaluationContext("user", {"email": "user@example.org", "plan": "free"})
+
+    matched = provider.resolve_string_details("targeted-flag", "", internal)
+    assert (matched.value, matched.reason) == ("red", Reason.TARGETING_MATCH)
+    assert provider.resolve_string_details("targeted-flag", "", free).value == "green"
+    unmatched = provider.resolve_string_details("targeted-flag", "")
+    assert (unmatched.value, unmatched.reason) == ("blue", Reason.DEFAULT)
+
+
+def test_raises_for_missing_and_disabled_flags(provider):
+    with pytest.raises(FlagNotFoundError):
+        provider.resolve_boolean_details("missing-flag", False)
+    with pytest.raises(FlagNotFoundError):
+        provider.resolve_boolean_details("disabled-flag", False)
+
+
+def test_raises_on_type_mismatch(provider):
+    with pytest.raises(TypeMismatchError):
+        provider.resolve_string_details("bool-flag", "")
+    with pytest.raises(TypeMismatchError):
+        provider.resolve_integer_details("bool-flag", 0)
+
+
+def test_emits_configuration_changed_with_changed_flags(
+    provider, flagd_sync_server, wait_for
+):
+    changes = []
+    provider.resolver.emit_provider_configuration_changed = changes.append
+    updated = {**FLAGS, "flags": dict(FLAGS["flags"])}
+    updated["flags"]["string-flag"] = {
+        "state": "ENABLED",
+        "variants": {"red": "red", "blue": "blue"},
+        "defaultVariant": "red",
+    }
+    del updated["flags"]["int-flag"]
+
+    flagd_sync_server.send_configuration(updated)
+    wait_for(lambda: changes)
+
+    assert changes[0].flags_changed == ["int-flag", "string-flag"]
+    assert provider.resolve_string_details("string-flag", "").value == "red"
+
+
+def test_ignores_invalid_configuration(provider, flagd_sync_server, wait_for):
+    changes = []
+    provider.resolver.emit_provider_configuration_changed = changes.append
+    updated = {**FLAGS, "flags": dict(FLAGS["flags"])}
+    del updated["flags"]["int-flag"]
+
+    flagd_sync_server.send_configuration("{not json")
+    flagd_sync_server.send_configuration(updated)
+    wait_for(lambda: changes)
+
+    assert [change.flags_changed for change in changes] == [["int-flag"]]
+    assert provider.resolve_boolean_details("bool-flag", False).value is True
+
+
+def test_initialize_raises_when_no_configuration_arrives(flagd_sync_server):
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS, port=flagd_sync_server.port, timeout=0.1
+    )
+    with pytest.raises(ProviderNotReadyError):
+        provider.initialize(EvaluationContext())
+    with pytest.raises(ProviderNotReadyError):
+        provider.resolve_boolean_details("bool-flag", False)
+    provider.shutdown()
+
+
+@pytest.mark.parametrize("default_variant", ['"b"', '["a"]', '{"a": 1}', "null"])
+def test_parse_flag_configuration_rejects_unknown_default_variant(default_variant):
+    with pytest.raises(ParseError):
+        parse_flag_configuration(
+            '{"flags": {"f": {"state": "ENABLED", "variants": {"a": 1}, '
+            f'"defaultVariant": {default_variant}}}}}}}'
+        )
+
+
+def test_flag_store_publishes_new_snapshots():
+    store = FlagStore()
+    store.update(parse_flag_configuration(json.dumps(FLAGS)))
+    published = store.flags
+
+    with store._lock:
+        # readers do not wait for a writer
+        assert store.get_flag("bool-flag") is published["bool-flag"]
+    assert store.remove(["int-flag"]) == ["int-flag"]
+
+    assert "int-flag" in published
+    assert store.get_flag("int-flag") is None
+    assert store.flags is not published
+
+
+def test_flags_have_no_instance_dict():
+    flag = parse_flag_configuration(json.dumps(FLAGS))["bool-flag"]
+    assert not hasattr(flag, "__dict__")
+    assert flag == Flag("bool-flag", "ENABLED", {"on": True, "off": False}, "on")
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from openfeature.contrib.provider.flagd.resolvers.process.flags import (
+    parse_flag_configuration,
+    parse_flag_keys,
+)
+from openfeature.contrib.provider.flagd.resolvers.process.json_reader import (
+    JsonObjectReader,
+)
+from openfeature.exception import ParseError
+
+
+def read(document):
+    reader = JsonObjectReader(document)
+    members = {}
+    for key in reader.iter_keys():
+        nested = reader.object() if key == "nested" else None
+        if nested is None and key == "nested":
+            members[key] = "skipped"
+        elif nested is not None:
+            members[key] = {k: nested.value() for k in nested.iter_keys()}
+        else:
+            members[key] = reader.value()
+    reader.end()
+    return members
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        "{}",
+        ' { "a" : 1 , "b" : [1, {"c": null}], "d": "\\u00e9\\"" } \n',
+        '{"nested": {"x": {"y": [true, false]}, "z": 1.5}, "after": "a"}',
+        '{"nested": {}, "after": {}}',
+    ],
+)
+def test_reads_members_like_json_loads(document):
+    assert read(document) == json.loads(document)
+
+
+def test_skips_values_which_are_not_objects():
+    assert read('{"nested": [1, 2], "after": 1}') == {"nested": "skipped", "after": 1}
+
+
+@pytest.mark.parametrize(
+    "document",
+    ["", "[]", '{"a": 1,}', '{"a" 1}', '{"a": 1 "b": 2}', '{"a": 1} x', "{1: 2}"],
+)
+def test_rejects_malformed_documents(document):
+    with pytest.raises(json.JSONDecodeError):
+        read(document)
+
+
+def test_parses_flags_referencing_evaluators_defined_after_them():
+    configuration = json.dumps(
+        {
+            "flags": {
+                "targeted": {
+                    "state": "ENABLED",
+                    "variants": {"on": True, "off": False},
+                    "defaultVariant": "off",
+                    "targeting": {"if": [{"$ref": "is_beta"}, "on", None]},
+                },
+                "$evaluators": {
+                    "state": "ENABLED",
+                    "variants": {"on": True},
+                    "defaultVariant": "on",
+                },
+            },
+            "$evaluators": {"is_beta": {"var": "beta"}},
+        }
+    )
+
+    flags = parse_flag_configuration(configuration)
+
+    assert list(flags) == ["targeted", "$evaluators"]
+    assert flags["targeted"].targeting == {"if": [{"var": "beta"}, "on", None]}
+    assert parse_flag_keys(configuration) == ["targeted", "$evaluators"]
+
+
+@pytest.mark.parametrize(
+    "configuration",
+    ["not json", "[]", "{}", '{"flags": []}', '{"flags": {}, "$evaluators": 1}'],
+)
+def test_rejects_invalid_configurations(configuration):
+    with pytest.raises(ParseError):
+        parse_flag_configuration(configuration)
@@ -0,0 +1,110 @@
+import time
+
+import pytest
+
+from openfeature.contrib.provider.flagd import FlagdProvider
+from openfeature.contrib.provider.flagd.config import CacheType
+from openfeature.exception import FlagNotFoundError
+from openfeature.flag_evaluation import Reason
+
+
+def resolutions(flagd_server):
+    return [call for call in flagd_server.calls if call[0] == "ResolveBoolean"]
+
+
+@pytest.fixture()
+def provider(flagd_server):
+    flagd_server.flags["flag"] = (True, "TARGETING_MATCH", "on")
+    provider = FlagdProvider(
+        port=flagd_server.port,
+        cache_type=CacheType.DISABLED,
+        max_staleness_ms=60000,
+        refresh_after_ms=0,
+        timeout=0.2,
+    )
+    yield provider
+    provider.shutdown()
+
+
+def test_serves_last_known_good_while_revalidating(provider, flagd_server, wait_for):
+    assert provider.resolve_boolean_details("flag", False).reason == "TARGETING_MATCH"
+
+    flagd_server.flags["flag"] = (False, "TARGETING_MATCH", "off")
+    details = provider.resolve_boolean_details("flag", False)
+
+    assert details.value is True
+    assert details.reason == Reason.CACHED
+    wait_for(lambda: len(resolutions(flagd_server)) == 2)
+    wait_for(lambda: provider.resolve_boolean_details("flag", True).value is False)
+
+
+def test_only_refreshes_resolutions_older_than_refresh_after(flagd_server, wait_for):
+    flagd_server.flags["flag"] = (True, "TARGETING_MATCH", "on")
+    provider = FlagdProvider(
+        port=flagd_server.port,
+        cache_type=CacheType.DISABLED,
+        max_staleness_ms=60000,
+        refresh_after_ms=200,
+    )
+    provider.resolve_boolean_details("flag", False)
+
+    for _ in range(20):
+        assert provider.resolve_boolean_details("flag", False).reason == Reason.CACHED
+    time.sleep(0.05)
+    assert len(resolutions(flagd_server)) == 1
+
+    time.sleep(0.2)
+    provider.resolve_boolean_details("flag", False)
+    wait_for(lambda: len(resolutions(flagd_server)) == 2)
+    provider.shutdown()
+
+
+def test_serves_stale_resolution_while_flagd_is_down(provider, flagd_server, wait_for):
+    provider.resolve_boolean_details("flag", False)
+
+    flagd_server.delay = 0.5
+    started = time.monotonic()
+    details = provider.resolve_boolean_details("flag", False)
+
+    assert details.value is True
+    assert time.monotonic() - started < 0.1
+    wait_for(lambda: provider.resolve_boolean_details("flag", False).reason == "STALE")
+
+
+def test_forgets_flags_which_are_gone(provider, flagd_server, wait_for):
+    provider.resolve_boolean_details("flag", False)
+
+    del flagd_server.flags["flag"]
+    assert provider.resolve_boolean_details("flag", False).value is True
+    wait_for(lambda: len(resolutions(flagd_server)) == 2)
+
+    wait_for(lambda: len(provider.resolver.last_known_good) == 0)
+    with pytest.raises(FlagNotFoundError):
+        provider.resolve_boolean_details("flag", False)
+
+
+def test_does_not_serve_resolutions_older_than_max_staleness(flagd_server):
+    flagd_server.flags["flag"] = (True, "TARGETING_MATCH", "on")
+    provider = FlagdProvider(
+        port=flagd_server.port, cache_type=CacheType.DISABLED, max_staleness_ms=50
+    )
+    provider.resolve_boolean_details("flag", False)
+
+    time.sleep(0.1)
+    flagd_server.flags["flag"] = (False, "TARGETING_MATCH", "off")
+
+    assert provider.resolve_boolean_details("flag", True).value is False
+    provider.shutdown()
+
+
+def test_drops_changed_flags_on_configuration_change(provider, flagd_server, wait_for):
+    provider.initialize(None)
+    provider.resolve_boolean_details("flag", False)
+    flagd_server.flags["flag"] = (False, "TARGETING_MATCH", "off")
+
+    flagd_server.send_event("configuration_change", {"flags": {"flag": {}}})
+    wait_for(lambda: len(provider.resolver.last_known_good) == 0)
+
+    details = provider.resolve_boolean_details("flag", True)
+    assert details.value is False
+    assert details.reason == "TARGETING_MATCH"
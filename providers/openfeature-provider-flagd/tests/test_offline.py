@@ -0,0 +1,165 @@
+import json
+import os
+import time
+
+import pytest
+
+from openfeature.contrib.provider.flagd import FlagdProvider, ResolverType
+from openfeature.contrib.provider.flagd.config import Config
+from openfeature.contrib.provider.flagd.resolvers.process.file_watcher import (
+    FileWatcher,
+)
+from openfeature.contrib.provider.flagd.resolvers.process.flags import (
+    parse_flag_configuration,
+)
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.flag_evaluation import Reason
+
+FLAGS = {
+    "flags": {
+        "bool-flag": {
+            "state": "ENABLED",
+            "variants": {"on": True, "off": False},
+            "defaultVariant": "on",
+        },
+        "color": {
+            "state": "ENABLED",
+            "variants": {"red": "red", "blue": "blue"},
+            "defaultVariant": "red",
+            "targeting": {
+                "if": [{"$ref": "is_internal"}, "blue", None],
+            },
+        },
+    },
+    "$evaluators": {
+        "is_internal": {"ends_with": [{"var": "email"}, "@example.com"]},
+    },
+}
+
+
+def write_flags(path, flags):
+    # replaced by a rename, so the watcher never reads a partial file
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(flags, f)
+    os.replace(temp_path, path)
+
+
+@pytest.fixture()
+def flags_path(tmp_path):
+    path = str(tmp_path / "flags.json")
+    write_flags(path, FLAGS)
+    return path
+
+
+@pytest.fixture()
+def provider(flags_path):
+    provider = FlagdProvider(
+        offline_flag_source_path=flags_path, offline_poll_interval_ms=10
+    )
+    provider.initialize(EvaluationContext())
+    yield provider
+    provider.shutdown()
+
+
+def test_offline_source_defaults_to_in_process_resolver(flags_path):
+    config = Config(offline_flag_source_path=flags_path)
+    assert config.resolver_type == ResolverType.IN_PROCESS
+    assert config.offline_poll_interval_ms == 5000
+
+
+def test_evaluates_flags_from_file(provider):
+    assert provider.resolver.channel is None
+    assert provider.resolve_boolean_details("bool-flag", False).value is True
+
+    targeted = provider.resolve_string_details(
+        "color", "none", EvaluationContext(attributes={"email": "me@example.com"})
+    )
+    assert targeted.value == "blue"
+    assert targeted.reason == Reason.TARGETING_MATCH
+
+
+def test_reloads_changed_flags(provider, flags_path, wait_for):
+    changes = []
+    provider.resolver.emit_provider_configuration_changed = changes.append
+    unchanged = provider.resolver.flag_store.get_flag("color")
+
+    flags = json.loads(json.dumps(FLAGS))
+    flags["flags"]["bool-flag"]["defaultVariant"] = "off"
+    write_flags(flags_path, flags)
+    wait_for(lambda: changes)
+
+    assert [change.flags_changed for change in changes] == [["bool-flag"]]
+    assert provider.resolve_boolean_details("bool-flag", True).value is False
+    # flags whose definition did not change are not compiled again
+    assert provider.resolver.flag_store.get_flag("color") is unchanged
+
+
+def test_reports_missing_file_until_it_is_restored(provider, flags_path, wait_for):
+    errors, ready = [], []
+    provider.resolver.emit_provider_error = errors.append
+    provider.resolver.emit_provider_ready = ready.append
+
+    os.remove(flags_path)
+    wait_for(lambda: errors)
+    write_flags(flags_path, FLAGS)
+    wait_for(lambda: ready)
+
+    assert len(errors) == 1
+    assert provider.resolve_boolean_details("bool-flag", False).value is True
+
+
+def test_keeps_watching_after_an_invalid_file(provider, flags_path, wait_for):
+    changes = []
+    provider.resolver.emit_provider_configuration_changed = changes.append
+    flags = json.loads(json.dumps(FLAGS))
+    flags["flags"]["bool-flag"]["defaultVariant"] = ["off"]
+    write_flags(flags_path, flags)
+    time.sleep(0.05)
+
+    flags["flags"]["bool-flag"]["defaultVariant"] = "off"
+    write_flags(flags_path, flags)
+    wait_for(lambda: changes)
+
+    assert provider.resolve_boolean_details("bool-flag", True).value is False
+
+
+def test_keeps_watching_after_failing_to_apply_a_file(provider, flags_path, wait_for):
+    update, failed = provider.resolver._update, []
+
+    def update_once_failing(configuration):
+        if not failed:
+            failed.append(configuration)
+            raise TypeError("unexpected payload")
+        update(configuration)
+
+    provider.resolver._update = update_once_failing
+    flags = json.loads(json.dumps(FLAGS))
+    flags["flags"]["bool-flag"]["defaultVariant"] = "off"
+    write_flags(flags_path, flags)
+    wait_for(lambda: failed)
+    flags["flags"]["other-flag"] = flags["flags"]["bool-flag"]
+    write_flags(flags_path, flags)
+
+    wait_for(lambda: provider.resolve_boolean_details("bool-flag", True).value is False)
+
+
+def test_file_watcher_only_returns_modified_content(flags_path):
+    watcher = FileWatcher(flags_path)
+    assert json.loads(watcher.poll()) == FLAGS
+    assert watcher.poll() is None
+
+    write_flags(flags_path, FLAGS)
+    assert watcher.poll() is None
+
+
+def test_parse_reuses_flags_with_unchanged_definition():
+    previous = parse_flag_configuration(json.dumps(FLAGS))
+    flags = json.loads(json.dumps(FLAGS))
+    flags["$evaluators"]["is_internal"]["ends_with"][1] = "@example.org"
+
+    parsed = parse_flag_configuration(json.dumps(flags), previous)
+
+    assert parsed["bool-flag"] is previous["bool-flag"]
+    # a changed evaluator changes the flags referencing it
+    assert parsed["color"] is not previous["color"]
@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+from openfeature.contrib.provider.flagd import ChannelSelection, FlagdProvider
+from openfeature.contrib.provider.flagd.channel import channel_options
+from openfeature.contrib.provider.flagd.config import Config
+from openfeature.contrib.provider.flagd.pool import ChannelPool
+
+
+def test_round_robin_cycles_through_channels():
+    pool = ChannelPool([Mock(), Mock(), Mock()], ChannelSelection.ROUND_ROBIN)
+
+    assert [pool.acquire() for _ in range(6)] == [0, 1, 2, 0, 1, 2]
+
+
+def test_least_outstanding_prefers_idle_channels():
+    pool = ChannelPool([Mock(), Mock(), Mock()], ChannelSelection.LEAST_OUTSTANDING)
+
+    busy = {pool.acquire(), pool.acquire()}
+    idle = pool.acquire()
+    assert idle not in busy
+
+    pool.release(idle)
+    assert pool.acquire() == idle
+
+
+def test_pool_close_closes_every_channel():
+    channels = [Mock(), Mock()]
+
+    ChannelPool(channels).close()
+
+    assert all(channel.close.called for channel in channels)
+
+
+def test_pooled_channels_do_not_share_connections():
+    assert channel_options(Config()) == []
+    assert ("grpc.use_local_subchannel_pool", 1) in channel_options(
+        Config(channel_pool_size=4, keepalive_time_ms=10000)
+    )
+    assert ("grpc.keepalive_time_ms", 10000) in channel_options(
+        Config(keepalive_time_ms=10000)
+    )
+
+
+def test_provider_resolves_through_pooled_channels(flagd_server):
+    flagd_server.flags["flag"] = ("blue", "STATIC", "blue")
+    provider = FlagdProvider(
+        port=flagd_server.port,
+        channel_pool_size=4,
+        channel_selection=ChannelSelection.LEAST_OUTSTANDING,
+    )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: provider.resolve_string_details("flag", "red"), range(32)
+            )
+        )
+
+    assert [result.value for result in results] == ["blue"] * 32
+    assert len(provider.resolver.pool.channels) == 4
+    assert provider.resolver.pool._outstanding == [0, 0, 0, 0]
+    provider.shutdown()
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openfeature.contrib.provider.flagd import AsyncFlagdProvider, FlagdProvider
+from openfeature.contrib.provider.flagd.singleflight import (
+    AsyncSingleFlight,
+    SingleFlight,
+)
+from openfeature.evaluation_context import EvaluationContext
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    single_flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait()
+        return "result"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = [executor.submit(single_flight.do, "key", slow) for _ in range(8)]
+        time.sleep(0.05)
+        release.set()
+
+    assert [result.result() for result in results] == ["result"] * 8
+    assert len(calls) == 1
+
+
+def test_single_flight_propagates_errors_and_forgets_finished_calls():
+    single_flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        single_flight.do("key", fail)
+    assert single_flight.do("key", lambda: "retried") == "retried"
+
+
+def test_async_single_flight_shares_one_call():
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def run():
+        return await asyncio.gather(*(single_flight.do("key", slow) for _ in range(8)))
+
+    assert asyncio.run(run()) == ["result"] * 8
+    assert len(calls) == 1
+
+
+def test_provider_coalesces_identical_resolutions(flagd_server):
+    flagd_server.flags["flag"] = (True, "TARGETING_MATCH", "on")
+    flagd_server.delay = 0.1
+    provider = FlagdProvider(port=flagd_server.port, coalesce_requests=True)
+    context = EvaluationContext("user", {"plan": "free"})
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(
+            executor.map(
+                lambda _: provider.resolve_boolean_details("flag", False, context),
+                range(16),
+            )
+        )
+
+    assert all(result.value is True for result in results)
+    assert len(flagd_server.calls) < 16
+    provider.shutdown()
+
+
+def test_async_provider_coalesces_identical_resolutions(flagd_server):
+    flagd_server.flags["flag"] = ("blue", "TARGETING_MATCH", "blue")
+    flagd_server.delay = 0.05
+    provider = AsyncFlagdProvider(port=flagd_server.port, coalesce_requests=True)
+
+    async def run():
+        try:
+            return await asyncio.gather(
+                *(provider.resolve_string_details("flag", "red") for _ in range(16))
+            )
+        finally:
+            await provider.shutdown()
+
+    results = asyncio.run(run())
+
+    assert [result.value for result in results] == ["blue"] * 16
+    assert len(flagd_server.calls) == 1
@@ -0,0 +1,98 @@
+import pytest
+
+from openfeature.contrib.provider.flagd import FlagdProvider, ResolverType
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import TypeMismatchError
+from openfeature.flag_evaluation import Reason
+
+
+@pytest.fixture()
+def provider(flagd_server):
+    flagd_server.flags.update(
+        {
+            "bool-flag": (True, "STATIC", "on"),
+            "int-flag": (3, "TARGETING_MATCH", "three"),
+            "object-flag": ({"key": "value"}, "STATIC", "full"),
+        }
+    )
+    provider = FlagdProvider(port=flagd_server.port)
+    yield provider
+    provider.shutdown()
+
+
+def test_resolve_all_uses_a_single_rpc(provider, flagd_server):
+    context = EvaluationContext("user", {"plan": "free"})
+
+    snapshot = provider.resolve_all(context)
+
+    assert [call[0] for call in flagd_server.calls] == ["ResolveAll"]
+    assert flagd_server.calls[0][2] == {"targetingKey": "user", "plan": "free"}
+    assert set(snapshot.flags) == {"bool-flag", "int-flag", "object-flag"}
+
+
+def test_snapshot_serves_evaluations_within_its_scope(provider, flagd_server):
+    context = EvaluationContext("user", {"plan": "free"})
+
+    with provider.resolve_all(context):
+        boolean = provider.resolve_boolean_details("bool-flag", False, context)
+        integer = provider.resolve_integer_details("int-flag", 0, context)
+        obj = provider.resolve_object_details("object-flag", {}, context)
+
+    assert (boolean.value, boolean.variant, boolean.reason) == (True, "on", "STATIC")
+    assert integer.value == 3
+    assert isinstance(integer.value, int)
+    assert integer.reason == Reason.TARGETING_MATCH
+    assert obj.value == {"key": "value"}
+    assert len(flagd_server.calls) == 1
+
+    provider.resolve_boolean_details("bool-flag", False, context)
+    assert len(flagd_server.calls) == 2
+
+
+def test_snapshot_is_bypassed_for_other_contexts(provider, flagd_server):
+    with provider.resolve_all(EvaluationContext("user")):
+        provider.resolve_boolean_details("bool-flag", False, EvaluationContext("other"))
+
+    assert [call[0] for call in flagd_server.calls] == ["ResolveAll", "ResolveBoolean"]
+
+
+def test_snapshot_checks_flag_types(provider):
+    with provider.resolve_all(), pytest.raises(TypeMismatchError):
+        provider.resolve_string_details("bool-flag", "")
+
+
+def test_object_flags_are_returned_as_dicts(provider):
+    details = provider.resolve_object_details("object-flag", {})
+    assert details.value == {"key": "value"}
+
+
+def test_in_process_resolve_all(flagd_sync_server):
+    flagd_sync_server.send_configuration(
+        {
+            "flags": {
+                "bool-flag": {
+                    "state": "ENABLED",
+                    "variants": {"on": True, "off": False},
+                    "defaultVariant": "off",
+                    "targeting": {"if": [{"var": "beta"}, "on", None]},
+                },
+                "disabled-flag": {
+                    "state": "DISABLED",
+                    "variants": {"on": True},
+                    "defaultVariant": "on",
+                },
+            }
+        }
+    )
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS, port=flagd_sync_server.port
+    )
+    provider.initialize(EvaluationContext())
+    context = EvaluationContext("user", {"beta": True})
+
+    snapshot = provider.resolve_all(context)
+
+    assert set(snapshot.flags) == {"bool-flag"}
+    with snapshot:
+        assert provider.resolve_boolean_details("bool-flag", False, context).value
+    provider.shutdown()
@@ -0,0 +1,104 @@
+import json
+import os
+from concurrent import futures
+
+import grpc
+import pytest
+
+from openfeature.contrib.provider.flagd import FlagdProvider, ResolverType
+from openfeature.contrib.provider.flagd.resolvers.process.snapshot_file import (
+    read_snapshot,
+    write_snapshot,
+)
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import ParseError
+
+
+def test_round_trips_configuration(tmp_path):
+    path = str(tmp_path / "flags.snapshot")
+    configuration = json.dumps({"flags": {}, "note": "grüße"})
+
+    write_snapshot(path, configuration)
+
+    assert read_snapshot(path) == configuration
+    assert os.listdir(tmp_path) == ["flags.snapshot"]
+
+
+def test_returns_none_without_snapshot(tmp_path):
+    assert read_snapshot(str(tmp_path / "missing")) is None
+
+
+@pytest.mark.parametrize(
+    "corrupt",
+    [
+        lambda data: b"",
+        lambda data: b"garbage\n" + data,
+        lambda data: data.replace(b"flagd-snapshot 1", b"flagd-snapshot 2", 1),
+        lambda data: data[:-1],
+        lambda data: data[:-1] + b"X",
+    ],
+)
+def test_rejects_corrupt_snapshots(tmp_path, corrupt, flag_configuration):
+    path = str(tmp_path / "flags.snapshot")
+    write_snapshot(path, json.dumps(flag_configuration))
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(corrupt(data))
+
+    with pytest.raises(ParseError):
+        read_snapshot(path)
+
+
+def test_in_process_resolver_persists_configuration(
+    flagd_sync_server, tmp_path, flag_configuration
+):
+    path = str(tmp_path / "flags.snapshot")
+    flagd_sync_server.send_configuration(flag_configuration)
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS,
+        port=flagd_sync_server.port,
+        snapshot_path=path,
+    )
+    provider.initialize(EvaluationContext())
+    assert provider.resolve_boolean_details("flag", False).value is True
+    # written once the changes of snapshot_interval_ms were collected
+    assert not os.path.exists(path)
+
+    provider.shutdown()
+    assert json.loads(read_snapshot(path)) == flag_configuration
+
+
+def test_in_process_resolver_starts_from_snapshot(tmp_path, flag_configuration):
+    path = str(tmp_path / "flags.snapshot")
+    write_snapshot(path, json.dumps(flag_configuration))
+    # a port nothing listens on, flagd is unreachable
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    port = server.add_insecure_port("localhost:0")
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS, port=port, snapshot_path=path
+    )
+
+    provider.initialize(EvaluationContext())
+
+    assert provider.resolve_boolean_details("flag", False).value is True
+    provider.shutdown()
+
+
+def test_in_process_resolver_ignores_corrupt_snapshot(
+    flagd_sync_server, tmp_path, flag_configuration
+):
+    path = tmp_path / "flags.snapshot"
+    path.write_bytes(b"not a snapshot")
+    flagd_sync_server.send_configuration(flag_configuration)
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS,
+        port=flagd_sync_server.port,
+        snapshot_path=str(path),
+    )
+
+    provider.initialize(EvaluationContext())
+
+    assert provider.resolve_boolean_details("flag", False).value is True
+    provider.shutdown()
+    assert path.read_bytes().startswith(b"flagd-snapshot 1 ")
@@ -0,0 +1,136 @@
+import json
+import os
+
+import pytest
+
+from openfeature.contrib.provider.flagd import (
+    FlagdProvider,
+    ResolverType,
+    SyncProtocol,
+)
+from openfeature.contrib.provider.flagd.proto.sync.v1 import sync_service_pb2
+from openfeature.contrib.provider.flagd.resolvers import in_process
+from openfeature.contrib.provider.flagd.resolvers.process.snapshot_file import (
+    read_snapshot,
+    write_snapshot,
+)
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import FlagNotFoundError
+
+
+def flag(default_variant="on", targeting=None):
+    definition = {
+        "state": "ENABLED",
+        "variants": {"on": True, "off": False},
+        "defaultVariant": default_variant,
+    }
+    if targeting is not None:
+        definition["targeting"] = targeting
+    return definition
+
+
+ALL_FLAGS = {
+    "flags": {
+        "flag-a": flag(),
+        "flag-b": flag(targeting={"if": [{"var": "beta"}, "on", "off"]}),
+    }
+}
+
+
+@pytest.fixture()
+def provider(flagd_legacy_sync_server):
+    flagd_legacy_sync_server.send(sync_service_pb2.SYNC_STATE_ALL, ALL_FLAGS)
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS,
+        port=flagd_legacy_sync_server.port,
+        sync_protocol=SyncProtocol.SYNC_V1,
+    )
+    provider.initialize(EvaluationContext())
+    provider.changes = []
+    provider.resolver.emit_provider_configuration_changed = provider.changes.append
+    yield provider
+    provider.shutdown()
+
+
+def test_applies_added_and_updated_flags(provider, flagd_legacy_sync_server, wait_for):
+    untouched = provider.resolver.flag_store.get_flag("flag-b")
+
+    flagd_legacy_sync_server.send(
+        sync_service_pb2.SYNC_STATE_ADD, {"flags": {"flag-c": flag()}}
+    )
+    flagd_legacy_sync_server.send(
+        sync_service_pb2.SYNC_STATE_UPDATE, {"flags": {"flag-a": flag("off")}}
+    )
+    wait_for(lambda: len(provider.changes) == 2)
+
+    assert [change.flags_changed for change in provider.changes] == [
+        ["flag-c"],
+        ["flag-a"],
+    ]
+    assert provider.resolve_boolean_details("flag-a", True).value is False
+    assert provider.resolve_boolean_details("flag-c", False).value is True
+    # flags left out of a delta are neither replaced nor compiled again
+    assert provider.resolver.flag_store.get_flag("flag-b") is untouched
+
+
+def test_applies_deleted_flags(provider, flagd_legacy_sync_server, wait_for):
+    flagd_legacy_sync_server.send(
+        sync_service_pb2.SYNC_STATE_DELETE, {"flags": {"flag-a": {}}}
+    )
+    wait_for(lambda: provider.changes)
+
+    assert provider.changes[0].flags_changed == ["flag-a"]
+    with pytest.raises(FlagNotFoundError):
+        provider.resolve_boolean_details("flag-a", False)
+    assert provider.resolve_boolean_details("flag-b", True).value is False
+
+
+def test_replaces_all_flags_and_ignores_pings(
+    provider, flagd_legacy_sync_server, wait_for
+):
+    flagd_legacy_sync_server.send(sync_service_pb2.SYNC_STATE_PING)
+    flagd_legacy_sync_server.send(
+        sync_service_pb2.SYNC_STATE_ALL, {"flags": {"flag-a": flag()}}
+    )
+    wait_for(lambda: provider.changes)
+
+    assert provider.changes[0].flags_changed == ["flag-b"]
+    assert list(provider.resolver.flag_store.flags) == ["flag-a"]
+
+
+def test_snapshot_includes_deltas(
+    flagd_legacy_sync_server, tmp_path, monkeypatch, wait_for
+):
+    path = str(tmp_path / "flags.snapshot")
+    writes = []
+    monkeypatch.setattr(
+        in_process,
+        "write_snapshot",
+        lambda *args: writes.append(args) or write_snapshot(*args),
+    )
+    flagd_legacy_sync_server.send(sync_service_pb2.SYNC_STATE_ALL, ALL_FLAGS)
+    for key in ["flag-c", "flag-d", "flag-e"]:
+        flagd_legacy_sync_server.send(
+            sync_service_pb2.SYNC_STATE_ADD, {"flags": {key: flag()}}
+        )
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS,
+        port=flagd_legacy_sync_server.port,
+        sync_protocol=SyncProtocol.SYNC_V1,
+        snapshot_path=path,
+        snapshot_interval_ms=200,
+    )
+    provider.initialize(EvaluationContext())
+
+    wait_for(lambda: os.path.exists(path))
+    provider.shutdown()
+    # the configuration and its deltas are written at once
+    assert len(writes) == 1
+    assert json.loads(read_snapshot(path)) == {
+        "flags": {
+            **ALL_FLAGS["flags"],
+            "flag-c": flag(),
+            "flag-d": flag(),
+            "flag-e": flag(),
+        }
+    }
@@ -0,0 +1,153 @@
+import pytest
+
+from openfeature.contrib.provider.flagd.resolvers.process.custom_ops import (
+    murmurhash3_32,
+)
+from openfeature.contrib.provider.flagd.resolvers.process.targeting import (
+    compile_rule,
+    expand_refs,
+)
+from openfeature.exception import ParseError
+
+DATA = {
+    "targetingKey": "user-1",
+    "email": "user@example.com",
+    "age": 42,
+    "version": "1.4.2",
+    "tags": ["beta", "internal"],
+    "address": {"country": "NZ"},
+    "$flagd": {"flagKey": "flag", "timestamp": 1700000000},
+}
+
+
+@pytest.mark.parametrize(
+    ("logic", "expected"),
+    [
+        ({"var": "email"}, "user@example.com"),
+        ({"var": "address.country"}, "NZ"),
+        ({"var": "tags.1"}, "internal"),
+        ({"var": ["missing", "fallback"]}, "fallback"),
+        ({"var": {"cat": ["addr", "ess.country"]}}, "NZ"),
+        ({"missing": ["email", "name", "age"]}, ["name"]),
+        ({"missing_some": [1, ["name", "email"]]}, []),
+        ({"==": [{"var": "age"}, "42"]}, True),
+        ({"===": [{"var": "age"}, "42"]}, False),
+        ({"!=": [1, 2]}, True),
+        ({"!": [{"var": "tags"}]}, False),
+        ({"!!": [[]]}, False),
+        ({"<": [18, {"var": "age"}, 65]}, True),
+        ({">=": [{"var": "age"}, 43]}, False),
+        ({"and": [True, {"var": "age"}]}, 42),
+        ({"or": [False, 0, "x"]}, "x"),
+        ({"if": [{"<": [{"var": "age"}, 18]}, "minor", "adult"]}, "adult"),
+        ({"if": [False, "a", False, "b", "c"]}, "c"),
+        ({"in": ["beta", {"var": "tags"}]}, True),
+        ({"in": ["example", {"var": "email"}]}, True),
+        ({"cat": ["v", 1.0, True]}, "v1true"),
+        ({"substr": ["flagd", -2]}, "gd"),
+        ({"+": [1, "2", 3.5]}, 6.5),
+        ({"-": [5]}, -5),
+        ({"*": [2, 3]}, 6),
+        ({"/": [9, 2]}, 4.5),
+        ({"%": [9, 2]}, 1),
+        ({"max": [1, 3, 2]}, 3),
+        ({"merge": [[1], 2, [3, 4]]}, [1, 2, 3, 4]),
+        ({"map": [[1, 2], {"*": [{"var": ""}, 2]}]}, [2, 4]),
+        ({"filter": [[1, 2, 3], {">": [{"var": ""}, 1]}]}, [2, 3]),
+        (
+            {
+                "reduce": [
+                    [1, 2, 3],
+                    {"+": [{"var": "current"}, {"var": "accumulator"}]},
+                    0,
+                ]
+            },
+            6,
+        ),
+        ({"all": [{"var": "tags"}, {"!!": {"var": ""}}]}, True),
+        ({"some": [[], {"var": ""}]}, False),
+        ({"none": [[0], {"var": ""}]}, True),
+        ({"starts_with": [{"var": "email"}, "user@"]}, True),
+        ({"ends_with": [{"var": "email"}, "@example.org"]}, False),
+        ({"ends_with": [{"var": "age"}, "2"]}, False),
+    ],
+)
+def test_compiled_rules(logic, expected):
+    assert compile_rule(logic)(DATA) == expected
+
+
+@pytest.mark.parametrize(
+    ("operator", "version", "expected"),
+    [
+        ("=", "1.4.2", True),
+        ("!=", "1.4.2", False),
+        (">", "1.4.1", True),
+        ("<", "1.10.0", True),
+        ("<=", "v1.4.2", True),
+        (">", "1.4.2-rc.1", True),
+        ("^", "1.0.0", True),
+        ("~", "1.5.0", False),
+        ("=", "not-a-version", False),
+    ],
+)
+def test_sem_ver(operator, version, expected):
+    rule = compile_rule({"sem_ver": [{"var": "version"}, operator, version]})
+    assert rule(DATA) is expected
+
+
+def test_sem_ver_rejects_unknown_operator():
+    with pytest.raises(ParseError):
+        compile_rule({"sem_ver": ["1.0.0", "<>", "1.0.0"]})
+
+
+def test_murmurhash3_matches_reference_implementation():
+    assert murmurhash3_32(b"") == 0
+    assert murmurhash3_32(b"foo") == -156908512
+    assert murmurhash3_32(b"hello") == 613153351
+
+
+def test_fractional_is_deterministic_and_follows_weights():
+    rule = compile_rule({"fractional": [["red", 25], ["blue", 75]]})
+    assignments = [
+        rule({"targetingKey": f"user-{i}", "$flagd": {"flagKey": "flag"}})
+        for i in range(2000)
+    ]
+
+    assert assignments == [
+        rule({"targetingKey": f"user-{i}", "$flagd": {"flagKey": "flag"}})
+        for i in range(2000)
+    ]
+    assert 400 < assignments.count("red") < 600
+    assert set(assignments) == {"red", "blue"}
+
+
+def test_fractional_uses_custom_bucketing_key():
+    rule = compile_rule({"fractional": [{"var": "email"}, ["red", 50], ["blue", 50]]})
+    first = rule({"email": "a@example.com", "targetingKey": "1"})
+    assert first == rule({"email": "a@example.com", "targetingKey": "2"})
+
+
+def test_fractional_without_targeting_key_returns_none():
+    rule = compile_rule({"fractional": [["red", 50], ["blue", 50]]})
+    assert rule({"$flagd": {"flagKey": "flag"}}) is None
+
+
+def test_unknown_operation_is_rejected():
+    with pytest.raises(ParseError):
+        compile_rule({"unknown": [1]})
+
+
+def test_expand_refs_inlines_evaluators():
+    evaluators = {
+        "is_internal": {"ends_with": [{"var": "email"}, "@example.com"]},
+        "internal_beta": {"and": [{"$ref": "is_internal"}, True]},
+    }
+    logic = expand_refs({"if": [{"$ref": "internal_beta"}, "on", "off"]}, evaluators)
+
+    assert compile_rule(logic)(DATA) == "on"
+    with pytest.raises(ParseError):
+        expand_refs({"$ref": "missing"}, evaluators)
+    with pytest.raises(ParseError):
+        expand_refs({"$ref": "loop"}, {"loop": {"!": {"$ref": "loop"}}})
+    with pytest.raises(ParseError):
+        expand_refs({"$ref": ["is_internal"]}, evaluators)
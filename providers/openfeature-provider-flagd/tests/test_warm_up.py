@@ -0,0 +1,156 @@
+import time
+from concurrent import futures
+
+import grpc
+import pytest
+
+from openfeature import api
+from openfeature.contrib.provider.flagd import CacheType, FlagdProvider, ResolverType
+from openfeature.contrib.provider.flagd.config import Config
+from openfeature.contrib.provider.flagd.resolvers import GrpcResolver
+from openfeature.evaluation_context import EvaluationContext
+from openfeature.exception import ErrorCode, ProviderNotReadyError
+from openfeature.flag_evaluation import Reason
+
+
+def test_grpc_resolver_serves_defaults_until_warmed_up(
+    unstarted_flagd_server, wait_for
+):
+    unstarted_flagd_server.flags["flag"] = (True, "STATIC", "on")
+    ready, changed = [], []
+    resolver = GrpcResolver(
+        Config(port=unstarted_flagd_server.port, warm_up=True),
+        emit_provider_ready=ready.append,
+        emit_provider_configuration_changed=changed.append,
+    )
+    started = time.monotonic()
+    resolver.initialize(EvaluationContext())
+    assert time.monotonic() - started < 0.5
+    with pytest.raises(ProviderNotReadyError):
+        resolver.resolve_boolean_details("flag", False)
+
+    # flagd only becomes reachable after the provider was initialized
+    unstarted_flagd_server.start()
+    wait_for(lambda: changed, timeout=5.0)
+    assert changed[0].flags_changed == ["flag"]
+    assert resolver.resolve_boolean_details("flag", False).value is True
+    # the SDK reported the provider ready when initialize returned
+    assert ready == []
+    resolver.shutdown()
+
+
+@pytest.fixture()
+def warmed_up(flagd_server, wait_for):
+    def warm_up(**kwargs):
+        changed = []
+        provider = FlagdProvider(port=flagd_server.port, warm_up=True, **kwargs)
+        provider.resolver.emit_provider_configuration_changed = changed.append
+        provider.initialize(EvaluationContext())
+        wait_for(lambda: changed)
+        return provider, changed[0]
+
+    return warm_up
+
+
+def test_grpc_resolver_prefetches_flags_into_cache(flagd_server, warmed_up):
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    flagd_server.flags["count"] = (3, "STATIC", "three")
+    flagd_server.send_event("provider_ready")
+    provider, _ = warmed_up(cache_type=CacheType.LRU)
+
+    # flags are prefetched for the context the provider was initialized with
+    context = EvaluationContext()
+    details = provider.resolve_boolean_details("flag", False, context)
+    assert (details.value, details.reason) == (True, Reason.CACHED)
+    assert provider.resolve_integer_details("count", 0, context).value == 3
+    assert provider.resolve_float_details("count", 0.0, context).value == 3.0
+    assert [method for method, _, _ in flagd_server.calls] == ["ResolveAll"]
+    provider.shutdown()
+
+
+def test_grpc_resolver_prefetches_last_known_good_resolutions(flagd_server, warmed_up):
+    flagd_server.flags["flag"] = ("blue", "TARGETING_MATCH", "blue")
+    provider, _ = warmed_up(max_staleness_ms=60000)
+    flagd_server.delay = 1.0
+
+    started = time.monotonic()
+    details = provider.resolve_string_details("flag", "red", EvaluationContext())
+    assert (details.value, details.reason) == ("blue", Reason.CACHED)
+    assert time.monotonic() - started < 0.5
+    provider.shutdown()
+
+
+def test_grpc_resolver_connects_every_channel_of_the_pool(flagd_server, warmed_up):
+    provider, event = warmed_up(channel_pool_size=2)
+
+    assert event.flags_changed == []
+    assert [method for method, _, _ in flagd_server.calls] == ["ResolveAll"] * 2
+    provider.shutdown()
+
+
+def test_grpc_resolver_warms_up_with_flagd_lacking_resolve_all(flagd_server, warmed_up):
+    flagd_server.resolve_all = False
+    flagd_server.flags["flag"] = (True, "STATIC", "on")
+    provider, event = warmed_up()
+
+    assert event.flags_changed == []
+    assert provider.resolve_boolean_details("flag", False).value is True
+    provider.shutdown()
+
+
+def test_grpc_resolver_shuts_down_while_warming_up():
+    # a port nothing listens on, so the warm-up does not complete
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    port = server.add_insecure_port("localhost:0")
+    provider = FlagdProvider(
+        port=port, warm_up=True, cache_type=CacheType.LRU, channel_pool_size=2
+    )
+    provider.initialize(EvaluationContext())
+    time.sleep(0.1)
+
+    started = time.monotonic()
+    provider.shutdown()
+    assert time.monotonic() - started < 0.5
+
+
+def test_client_receives_default_value_while_warming_up():
+    # a port nothing listens on, so the warm-up does not complete
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=1))
+    port = server.add_insecure_port("localhost:0")
+    provider = FlagdProvider(port=port, warm_up=True, timeout=1)
+    api.set_provider(provider)
+
+    details = api.get_client().get_boolean_details("flag", False)
+    assert details.value is False
+    assert details.error_code == ErrorCode.PROVIDER_NOT_READY
+    provider.shutdown()
+
+
+def resolves(provider, flag_key):
+    try:
+        provider.resolve_boolean_details(flag_key, False)
+    except ProviderNotReadyError:
+        return False
+    return True
+
+
+def test_in_process_resolver_initializes_without_waiting(
+    flagd_sync_server, flag_configuration, wait_for
+):
+    provider = FlagdProvider(
+        resolver_type=ResolverType.IN_PROCESS,
+        port=flagd_sync_server.port,
+        warm_up=True,
+    )
+    events = []
+    provider.resolver.emit_provider_ready = events.append
+
+    provider.initialize(EvaluationContext())
+    with pytest.raises(ProviderNotReadyError):
+        provider.resolve_boolean_details("flag", False)
+
+    flagd_sync_server.send_configuration(flag_configuration)
+    wait_for(lambda: resolves(provider, "flag"), timeout=5.0)
+    assert provider.resolve_boolean_details("flag", False).value is True
+    assert events == []
+    provider.shutdown()
@@ -0,0 +1,42 @@
+import pytest
+from google.protobuf.struct_pb2 import Struct
+
+from openfeature.contrib.provider.flagd.proto.schema.v1 import schema_pb2
+from openfeature.contrib.provider.flagd.wire import (
+    encode_resolve_request,
+    encode_varint,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (0, b"\x00"),
+        (1, b"\x01"),
+        (127, b"\x7f"),
+        (128, b"\x80\x01"),
+        (300, b"\xac\x02"),
+        (2**21, b"\x80\x80\x80\x01"),
+    ],
+)
+def test_encode_varint(value, expected):
+    assert encode_varint(value) == expected
+
+
+@pytest.mark.parametrize("flag_key", ["", "flag", "ünïcödé-" * 40])
+@pytest.mark.parametrize(
+    "attributes", [{}, {"targetingKey": "user", "plan": "free", "seats": 3.5}]
+)
+def test_encoded_request_matches_protobuf(flag_key, attributes):
+    context = Struct()
+    context.update(attributes)
+
+    data = encode_resolve_request(
+        flag_key, context.SerializeToString(deterministic=True)
+    )
+
+    expected = schema_pb2.ResolveStringRequest(flag_key=flag_key, context=context)
+    assert data == expected.SerializeToString(deterministic=True)
+    assert schema_pb2.ResolveBooleanRequest.FromString(data) == (
+        schema_pb2.ResolveBooleanRequest(flag_key=flag_key, context=context)
+    )